@@ -1,4 +1,38 @@
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
+
+
+def _start_token_pruning():
+    from .services.token_prune_service import TokenPruneService
+    from .utils.background import ensure_periodic
+
+    ensure_periodic(
+        "token-prune", settings.TOKEN_PRUNING["SCHEDULE_INTERVAL"], TokenPruneService.run_scheduled)
+
+
+def _is_management_command() -> bool:
+    # runserver 를 뺀 manage.py 커맨드(migrate, shell, relay_outbox_events 등)에서는 스케줄러가 필요 없다.
+    program = os.path.basename(sys.argv[0]) if sys.argv else ''
+    return program in ('manage.py', 'django-admin') and sys.argv[1:2] != ['runserver']
+
+
+def _schedule_token_pruning():
+    try:
+        import uwsgi
+    except ImportError:
+        _start_token_pruning()
+        return
+
+    # 마스터에서 앱을 불러오면 fork 이후 스레드가 남지 않으므로 워커마다 fork 직후에 띄운다.
+    # (lazy-apps 면 이미 워커 안이므로 바로 띄운다)
+    if uwsgi.worker_id() > 0:
+        _start_token_pruning()
+    else:
+        from uwsgidecorators import postfork
+        postfork(_start_token_pruning)
 
 
 class AuthenticationConfig(AppConfig):
@@ -7,3 +41,7 @@ class AuthenticationConfig(AppConfig):
 
     def ready(self):
         import authentication.signals.user_profile_signal
+
+        # 프로세스마다 한 번만 스케줄러를 띄운다. (여러 워커 중 실제 정리는 Redis 잠금을 잡은 한 곳만)
+        if settings.TOKEN_PRUNING["SCHEDULE_INTERVAL"] > 0 and not _is_management_command():
+            _schedule_token_pruning()
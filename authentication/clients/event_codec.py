@@ -0,0 +1,219 @@
+import json
+import struct
+import threading
+from pathlib import Path
+from django.conf import settings
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+SCHEMA_DIR = Path(__file__).resolve().parent.parent / "schemas"
+
+FIELD_TYPES = {
+    "int": (int,),
+    "float": (int, float),
+    "string": (str,),
+    "bool": (bool,),
+    "map": (dict,),
+    "array": (list, tuple),
+}
+
+
+class SchemaError(ValueError):
+    pass
+
+
+class Schema:
+    """
+    schemas/{subject}/v{version}.json 한 파일.
+    fields 의 순서가 곧 바이너리 인코딩의 위치이므로, 새 버전은 끝에 필드를 추가만 할 수 있습니다.
+    """
+
+    def __init__(self, subject: str, version: int, schema_id: int, fields: list[dict]):
+        self.subject = subject
+        self.version = version
+        self.id = schema_id
+        self.fields = fields
+        self.field_names = [field["name"] for field in fields]
+
+    @property
+    def label(self) -> str:
+        return f"{self.subject}-v{self.version}"
+
+    @classmethod
+    def from_file(cls, path: Path) -> "Schema":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        for field in data["fields"]:
+            if field.get("type") not in FIELD_TYPES:
+                raise SchemaError(f"{path}: 알 수 없는 필드 타입 {field}")
+        return cls(data["subject"], data["version"], data["id"], data["fields"])
+
+    def to_row(self, value: dict) -> list:
+        unknown = value.keys() - set(self.field_names)
+        if unknown:
+            raise SchemaError(f"{self.label} 에 없는 필드: {sorted(unknown)}")
+
+        row = []
+        for field in self.fields:
+            item = value.get(field["name"], field.get("default"))
+            if item is None:
+                if not field.get("nullable") and "default" not in field:
+                    raise SchemaError(f"{self.label}.{field['name']} 는 null 일 수 없습니다.")
+            elif not isinstance(item, FIELD_TYPES[field["type"]]):
+                raise SchemaError(
+                    f"{self.label}.{field['name']} 타입 불일치: {type(item).__name__}")
+            row.append(item)
+        return row
+
+    def from_row(self, row: list) -> dict:
+        # 새 버전이 뒤에 붙인 필드는 무시하고, 이전 버전에 없는 필드는 기본값으로 채운다.
+        value = dict(zip(self.field_names, row))
+        for field in self.fields[len(row):]:
+            value[field["name"]] = field.get("default")
+        return value
+
+
+class SchemaRegistry:
+    """
+    저장소 안의 schemas/ 디렉터리를 읽는 파일 기반 스키마 레지스트리.
+    """
+
+    def __init__(self, directory: Path = SCHEMA_DIR):
+        self.by_id: dict[int, Schema] = {}
+        self.by_subject: dict[str, dict[int, Schema]] = {}
+        for path in sorted(directory.glob("*/v*.json")):
+            schema = Schema.from_file(path)
+            if schema.id in self.by_id:
+                raise SchemaError(f"{path}: 스키마 ID {schema.id} 중복")
+            self.by_id[schema.id] = schema
+            self.by_subject.setdefault(schema.subject, {})[schema.version] = schema
+
+    def get(self, schema_id: int) -> Schema:
+        try:
+            return self.by_id[schema_id]
+        except KeyError:
+            raise SchemaError(f"등록되지 않은 스키마 ID: {schema_id}")
+
+    def latest(self, subject: str) -> Schema | None:
+        versions = self.by_subject.get(subject)
+        return versions[max(versions)] if versions else None
+
+    @staticmethod
+    def compatibility_errors(old: Schema, new: Schema) -> list[str]:
+        """
+        new 가 old 로 인코딩된 이벤트를 읽을 수 있고(backward), old 가 new 를 읽을 수 있는지(forward) 확인합니다.
+        """
+        errors = []
+        if len(new.fields) < len(old.fields):
+            errors.append(f"{new.label}: 필드를 삭제할 수 없습니다.")
+        for position, (before, after) in enumerate(zip(old.fields, new.fields)):
+            if before["name"] != after["name"] or before["type"] != after["type"]:
+                errors.append(f"{new.label}: {position}번째 필드 변경 {before} -> {after}")
+            elif before.get("nullable") and not after.get("nullable"):
+                errors.append(f"{new.label}.{after['name']}: nullable 을 해제할 수 없습니다.")
+        for field in new.fields[len(old.fields):]:
+            if "default" not in field and not field.get("nullable"):
+                errors.append(f"{new.label}.{field['name']}: 추가 필드는 default 또는 nullable 이어야 합니다.")
+        return errors
+
+    def check_compatibility(self) -> list[str]:
+        errors = []
+        for subject, versions in self.by_subject.items():
+            ordered = [versions[version] for version in sorted(versions)]
+            for old, new in zip(ordered, ordered[1:]):
+                errors.extend(self.compatibility_errors(old, new))
+        return errors
+
+
+class JsonEventCodec:
+    name = "json"
+    content_type = "application/json"
+
+    @staticmethod
+    def encode(schema: Schema | None, value: dict) -> bytes:
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def decode(registry: SchemaRegistry, data: bytes) -> dict:
+        return json.loads(data)
+
+
+class MsgpackEventCodec:
+    """
+    매직 바이트(1B) + 스키마 ID(4B) + msgpack 배열(스키마 필드 순서).
+    필드 이름을 싣지 않으므로 JSON 보다 작고, 스키마 ID 로 어느 버전인지 알 수 있습니다.
+    """
+    name = "msgpack"
+    content_type = "application/vnd.textneck.event+msgpack"
+    MAGIC = 0
+    HEADER = struct.Struct("!BI")
+
+    @classmethod
+    def encode(cls, schema: Schema | None, value: dict) -> bytes:
+        if schema is None:
+            return JsonEventCodec.encode(schema, value)
+        return cls.HEADER.pack(cls.MAGIC, schema.id) + msgpack.packb(
+            schema.to_row(value), use_bin_type=True)
+
+    @classmethod
+    def decode(cls, registry: SchemaRegistry, data: bytes) -> dict:
+        magic, schema_id = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC:
+            raise SchemaError(f"알 수 없는 이벤트 포맷: {magic}")
+        row = msgpack.unpackb(data[cls.HEADER.size:], raw=False)
+        return registry.get(schema_id).from_row(row)
+
+
+EVENT_CODECS = {
+    JsonEventCodec.name: JsonEventCodec,
+    MsgpackEventCodec.name: MsgpackEventCodec,
+}
+
+_registry: SchemaRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> SchemaRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = SchemaRegistry()
+    return _registry
+
+
+def get_event_codec(name: str | None = None):
+    """
+    KAFKA_EVENT_CODEC 설정(json / msgpack)에 맞는 코덱을 반환합니다.
+    msgpack 이 설치되어 있지 않으면 json 으로 대체합니다.
+    """
+    name = name or getattr(settings, "KAFKA_EVENT_CODEC", MsgpackEventCodec.name)
+    if name == MsgpackEventCodec.name and msgpack is None:
+        return JsonEventCodec
+    return EVENT_CODECS.get(name, JsonEventCodec)
+
+
+def encode_event(subject: str | None, value: dict, headers: dict | None = None,
+                 codec=None) -> tuple[bytes, dict]:
+    """
+    subject 의 최신 스키마로 value 를 인코딩하고, content-type / schema / schema-id 헤더를 채워 반환합니다.
+    등록되지 않은 subject 는 JSON 으로 보냅니다.
+    """
+    schema = get_registry().latest(subject) if subject else None
+    codec = codec or get_event_codec()
+    if schema is None:
+        codec = JsonEventCodec
+
+    headers = dict(headers or {})
+    headers["content-type"] = codec.content_type
+    if schema is not None:
+        headers["schema"] = schema.label
+        headers["schema-id"] = schema.id
+    return codec.encode(schema, value), headers
+
+
+def decode_event(data: bytes, content_type: str | None) -> dict:
+    codec = MsgpackEventCodec if content_type == MsgpackEventCodec.content_type else JsonEventCodec
+    return codec.decode(get_registry(), data)
@@ -1,4 +1,3 @@
-import json
 import atexit
 import threading
 import logging
@@ -6,24 +5,51 @@ from typing import Optional, Dict, Any, Iterable, Tuple
 
 from confluent_kafka import Producer
 from django.conf import settings
+from prometheus_client import Counter, Histogram
+
+from .event_codec import encode_event
 
 logger = logging.getLogger("prod")
 
+kafka_messages = Counter(
+    "kafka_client_messages_total",
+    "KafkaClient 메시지 발행 결과 (delivered/failed)",
+    ["result"],
+)
+kafka_delivery_latency = Histogram(
+    "kafka_client_delivery_latency_seconds",
+    "produce 부터 브로커 확인(또는 실패)까지 걸린 시간",
+    ["result"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
 
 class KafkaClient:
+    """
+    프로세스별 confluent_kafka 프로듀서. 요청 경로에서는 브로커 I/O 를 하지 않으며,
+    이벤트는 outbox(relay_outbox_events) 나 send_batch(백필) 로만 발행합니다.
+    전달 결과는 메시지마다 로그를 남기지 않고 카운터와 지연 히스토그램으로 모읍니다. (실패만 로그)
+    """
     _producer: Optional[Producer] = None
     _lock = threading.Lock()
 
     @staticmethod
-    def _delivery(err, msg):
+    def record_delivery(err, msg) -> None:
+        """
+        delivery 콜백 결과를 카운터와 지연 히스토그램에 반영합니다.
+        """
+        result = "failed" if err else "delivered"
+        kafka_messages.labels(result=result).inc()
+        latency = msg.latency() if msg is not None else None
+        if latency is not None:
+            kafka_delivery_latency.labels(result=result).observe(latency)
+
+    @classmethod
+    def _delivery(cls, err, msg):
+        cls.record_delivery(err, msg)
         if err:
             logger.error("[KAFKA][ERROR] %s topic=%s",
                          err, msg.topic() if msg else None)
-        else:
-            logger.info(
-                "[KAFKA][OK] %s[%s]@%s key=%s",
-                msg.topic(), msg.partition(), msg.offset(), msg.key()
-            )
 
     @classmethod
     def get_producer(cls) -> Producer:
@@ -36,6 +62,8 @@ class KafkaClient:
                 if cls._producer is None:
                     conf = {
                         "bootstrap.servers": settings.KAFKA_BOOTSTRAP_SERVERS,
+                        # 재시도가 같은 파티션의 메시지 순서를 바꾸지 않도록 기본으로 켠다.
+                        "enable.idempotence": True,
                         **getattr(settings, "KAFKA_PRODUCER_CONFIG", {}),
                     }
                     cls._producer = Producer(conf)
@@ -43,44 +71,41 @@ class KafkaClient:
         return cls._producer
 
     @classmethod
-    def send(
+    def send_batch(
         cls,
         topic: str,
-        key: Optional[str],
-        value: Dict[str, Any],
+        messages: Iterable[Tuple[Any, Dict[str, Any]]],
         headers: Optional[Dict[str, Any]] = None,
-    ):
-        logger.debug("[KAFKA][SEND] topic=%s key=%s", topic, key)
-        if not getattr(settings, "KAFKA_ENABLED", True):
-            logger.debug("[KAFKA][SKIP] disabled. topic=%s key=%s", topic, key)
-            return
-
+        schema: Optional[str] = None,
+        timeout: float = 30.0,
+    ) -> int:
+        """
+        (key, value) 목록을 발행하고 브로커 확인까지 기다립니다. (백필처럼 전달 여부를 알아야 할 때)
+        확인받지 못한 메시지 수를 반환합니다.
+        """
         p = cls.get_producer()
-        hdrs: Optional[Iterable[Tuple[str, bytes]]] = None
-        if headers:
-            hdrs = [(k, (v if isinstance(v, bytes) else str(v).encode("utf-8")))
-                    for k, v in headers.items()]
-
-        payload = json.dumps(value, ensure_ascii=False).encode("utf-8")
-        k = key.encode("utf-8") if isinstance(key, str) else key
+        failed = []
 
-        try:
-            p.produce(
-                topic=topic,
-                key=k,
-                value=payload,
-                headers=hdrs,
-                on_delivery=cls._delivery,
-            )
-        except BufferError:
+        def on_delivery(err, msg):
+            cls._delivery(err, msg)
+            if err:
+                failed.append(msg)
 
-            p.poll(0.5)
-            p.produce(
-                topic=topic,
-                key=k,
-                value=payload,
-                headers=hdrs,
-                on_delivery=cls._delivery,
-            )
+        for key, value in messages:
+            payload, hdrs = encode_event(schema, value, headers)
+            k = key if key is None or isinstance(key, bytes) else str(key).encode("utf-8")
+            while True:
+                try:
+                    p.produce(
+                        topic=topic,
+                        key=k,
+                        value=payload,
+                        headers=[(name, str(v).encode("utf-8")) for name, v in hdrs.items()],
+                        on_delivery=on_delivery,
+                    )
+                    break
+                except BufferError:
+                    p.poll(0.1)
 
-        p.poll(0)
+        remaining = p.flush(timeout)
+        return len(failed) + remaining
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+from django.utils import timezone
+from datetime import timedelta
+
+from ...models import MediaBlob
+from ...services.media_blob_service import MediaBlobService
+
+
+class Command(BaseCommand):
+    help = "참조가 없어진 프로필 이미지(와 변형)를 유예 시간이 지난 뒤 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-seconds', type=int, default=3600,
+                            help="참조가 0 이 된 뒤 삭제까지 기다릴 시간(초)")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true',
+                            help="삭제 대상 수만 출력합니다.")
+
+    def handle(self, *args, grace_seconds, batch_size, dry_run, **options):
+        if dry_run:
+            cutoff = timezone.now() - timedelta(seconds=grace_seconds)
+            candidates = MediaBlob.objects.filter(ref_count=0, unreferenced_at__lte=cutoff)
+            stats = candidates.aggregate(size=Sum('size'))
+            self.stdout.write(
+                f"candidates={candidates.count()} bytes={stats['size'] or 0}")
+            return
+
+        removed = MediaBlobService.sweep(grace_seconds=grace_seconds, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"removed={removed}"))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from ...models import UserProfile
+from ...services.avatar_service import AvatarIngestionService
+
+
+class Command(BaseCommand):
+    help = "워커 재시작 등으로 반영되지 못한 소셜 프로필 이미지를 다시 수집합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=500,
+                            help="한 번에 처리할 최대 프로필 수")
+
+    def handle(self, *args, limit, **options):
+        pending = list(UserProfile.objects.exclude(pending_picture_url__isnull=True).exclude(
+            pending_picture_url='').order_by('id').values_list('user_id', 'pending_picture_url')[:limit])
+
+        ingested = 0
+        for user_id, url in pending:
+            if AvatarIngestionService.ingest(user_id, url):
+                ingested += 1
+        left = UserProfile.objects.exclude(pending_picture_url__isnull=True).exclude(
+            pending_picture_url='').count()
+        self.stdout.write(self.style.SUCCESS(
+            f"ingested={ingested} failed={len(pending) - ingested} pending={left}"))
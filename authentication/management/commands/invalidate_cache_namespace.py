@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...utils.cache import CacheAside
+from ...utils.cache_keys import CacheNamespace
+
+
+class Command(BaseCommand):
+    help = "캐시 네임스페이스의 세대를 올려 해당 네임스페이스의 모든 캐시 항목을 무효화합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('namespaces', nargs='+',
+                            help=f"무효화할 네임스페이스 ({', '.join(CacheNamespace.registry)})")
+
+    def handle(self, *args, namespaces, **options):
+        for name in namespaces:
+            namespace = CacheNamespace.registry.get(name)
+            if namespace is None:
+                raise CommandError(f"알 수 없는 캐시 네임스페이스: {name}")
+            generation = CacheAside.invalidate_namespace(namespace)
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: v{namespace.version} g{generation}"))
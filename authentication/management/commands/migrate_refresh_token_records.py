@@ -0,0 +1,89 @@
+import jwt
+import logging
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django_redis import get_redis_connection
+
+from ...utils.token_store import RefreshTokenStore
+
+logger = logging.getLogger('prod')
+
+
+class Command(BaseCommand):
+    help = "Redis 에 JWT 원문으로 저장된 기존 리프레시 토큰 키를 압축 레코드(hash)로 변환합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, batch_size, dry_run, **options):
+        client = get_redis_connection('default')
+        prefix = cache.make_key('refresh_token:')
+        stats = {'scanned': 0, 'converted': 0, 'skipped': 0, 'failed': 0}
+
+        # 일회성 마이그레이션이므로 SCAN 을 사용한다. 요청 경로에서는 사용하지 않는다.
+        batch = []
+        for key in client.scan_iter(match=f"{prefix}*", count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                self._convert_batch(client, prefix, batch, dry_run, stats)
+                batch = []
+        if batch:
+            self._convert_batch(client, prefix, batch, dry_run, stats)
+
+        logger.info(f"리프레시 토큰 레코드 마이그레이션 완료: {stats}")
+        self.stdout.write(self.style.SUCCESS(
+            f"scanned={stats['scanned']} converted={stats['converted']} "
+            f"skipped={stats['skipped']} failed={stats['failed']}"
+            f"{' (dry-run)' if dry_run else ''}"))
+
+    def _convert_batch(self, client, prefix, keys, dry_run, stats):
+        stats['scanned'] += len(keys)
+
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            pipe.type(key)
+        types = pipe.execute()
+
+        legacy_keys = [key for key, key_type in zip(keys, types)
+                       if key_type in (b'string', 'string')]
+        stats['skipped'] += len(keys) - len(legacy_keys)
+        if not legacy_keys:
+            return
+
+        pipe = client.pipeline(transaction=False)
+        for key in legacy_keys:
+            pipe.get(key)
+        values = pipe.execute()
+
+        for key, raw_value in zip(legacy_keys, values):
+            if raw_value is None:
+                stats['skipped'] += 1
+                continue
+            try:
+                name = key.decode() if isinstance(key, bytes) else key
+                user_id, jti = name[len(prefix):].split(':', 1)
+                refresh_token = self._decode_value(raw_value)
+                claims = jwt.decode(refresh_token, options={'verify_signature': False})
+                if dry_run:
+                    stats['converted'] += 1
+                    continue
+                if RefreshTokenStore.convert_legacy(
+                        user_id, jti, raw_value, refresh_token,
+                        int(claims['iat']), int(claims['exp'])):
+                    stats['converted'] += 1
+                else:
+                    stats['skipped'] += 1
+            except Exception as e:
+                stats['failed'] += 1
+                logger.error(f"리프레시 토큰 레코드 변환 실패 ({key}): {e}")
+
+    @staticmethod
+    def _decode_value(raw_value: bytes) -> str:
+        # cache.set 으로 저장된 값은 django-redis 직렬화(pickle)를 거쳤고,
+        # RefreshTokenStore 도입 직후 저장된 값은 토큰 원문 그대로다.
+        try:
+            value = cache.client.decode(raw_value)
+        except Exception:
+            value = raw_value
+        return value.decode('utf-8') if isinstance(value, bytes) else str(value)
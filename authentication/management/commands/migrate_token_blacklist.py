@@ -0,0 +1,69 @@
+import logging
+from datetime import timezone as dt_timezone
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ...utils.token_blacklist import TokenBlacklist
+
+logger = logging.getLogger('prod')
+
+OUTSTANDING_TABLE = "token_blacklist_outstandingtoken"
+BLACKLISTED_TABLE = "token_blacklist_blacklistedtoken"
+
+
+class Command(BaseCommand):
+    help = (
+        "simplejwt token_blacklist 테이블의 아직 만료되지 않은 블랙리스트 JTI 를 Redis(TokenBlacklist)로 옮깁니다. "
+        "앱이 INSTALLED_APPS 에서 빠졌으므로 모델 대신 SQL 로 읽습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, batch_size, dry_run, **options):
+        tables = set(connection.introspection.table_names())
+        if not {OUTSTANDING_TABLE, BLACKLISTED_TABLE} <= tables:
+            self.stdout.write("token_blacklist 테이블이 없습니다. 옮길 항목이 없습니다.")
+            return
+
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        stats = {'read': 0, 'migrated': 0}
+        last_id = 0
+        while True:
+            # 만료된 토큰은 옮길 필요가 없다. o.id 기준 keyset 으로 나눠 읽는다.
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT o.id, o.jti, o.expires_at FROM {OUTSTANDING_TABLE} o "
+                    f"JOIN {BLACKLISTED_TABLE} b ON b.token_id = o.id "
+                    f"WHERE o.id > %s AND o.expires_at > %s "
+                    f"ORDER BY o.id LIMIT %s",
+                    [last_id, now, batch_size],
+                )
+                rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            stats['read'] += len(rows)
+
+            entries = [(jti, int(self._to_epoch(expires_at))) for _, jti, expires_at in rows]
+            if dry_run:
+                stats['migrated'] += len(entries)
+            else:
+                stats['migrated'] += TokenBlacklist.add_many(entries)
+
+        logger.info(f"토큰 블랙리스트 Redis 이전 완료: {stats}")
+        self.stdout.write(self.style.SUCCESS(
+            f"read={stats['read']} migrated={stats['migrated']}"
+            f"{' (dry-run)' if dry_run else ''}"))
+
+    @staticmethod
+    def _to_epoch(value) -> float:
+        # sqlite 는 문자열, PostgreSQL 은 datetime 을 돌려준다.
+        if isinstance(value, str):
+            value = parse_datetime(value)
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value, dt_timezone.utc)
+        return value.timestamp()
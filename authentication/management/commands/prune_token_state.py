@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from ...services.token_prune_service import TokenPruneService
+
+
+class Command(BaseCommand):
+    help = "만료된 token_blacklist 행과 삭제된 유저의 리프레시 토큰 Redis 키를 나눠서 지웁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=None)
+        parser.add_argument('--sleep', type=float, default=None,
+                            help="chunk 사이 대기 시간(초)")
+        parser.add_argument('--scan-count', type=int, default=None)
+        parser.add_argument('--skip-tables', action='store_true')
+        parser.add_argument('--skip-redis', action='store_true')
+
+    def handle(self, *args, chunk_size, sleep, scan_count, skip_tables, skip_redis, **options):
+        stats = {}
+        if not skip_tables:
+            stats['outstanding_token'] = TokenPruneService.prune_legacy_tables(
+                chunk_size=chunk_size, sleep=sleep, progress=self.stdout.write)
+        if not skip_redis:
+            stats['redis_key'] = TokenPruneService.sweep_orphaned_keys(
+                scan_count=scan_count, sleep=sleep, progress=self.stdout.write)
+
+        self.stdout.write(self.style.SUCCESS(
+            " ".join(f"{target}={count}" for target, count in stats.items())))
@@ -0,0 +1,45 @@
+import time
+import logging
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...clients.kafka_client import KafkaClient
+from ...services.outbox_service import OutboxService
+
+logger = logging.getLogger('prod')
+
+
+class Command(BaseCommand):
+    help = "outbox 에 쌓인 이벤트를 id 순서대로 Kafka 에 발행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--flush-timeout', type=float, default=10.0)
+        parser.add_argument('--lease-seconds', type=float, default=300.0,
+                            help="발행 중인 이벤트를 다른 릴레이가 집어 가지 않는 시간(초). 배치 발행 시간보다 길어야 합니다.")
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help="outbox 가 비었을 때 다음 확인까지 대기할 시간(초)")
+        parser.add_argument('--once', action='store_true',
+                            help="outbox 를 한 번 비우고 종료합니다.")
+
+    def handle(self, *args, batch_size, flush_timeout, lease_seconds, interval, once, **options):
+        # 재시도된 메시지가 같은 키의 뒤 메시지를 앞지르지 않도록 멱등 프로듀서가 필요하다.
+        if not getattr(settings, "KAFKA_PRODUCER_CONFIG", {}).get("enable.idempotence", True):
+            raise CommandError("outbox 릴레이에는 KAFKA_PRODUCER_CONFIG['enable.idempotence'] = True 가 필요합니다.")
+        producer = KafkaClient.get_producer()
+        total_sent = total_failed = 0
+
+        while True:
+            sent, failed = OutboxService.relay_batch(
+                producer, batch_size=batch_size, flush_timeout=flush_timeout,
+                lease_seconds=lease_seconds)
+            total_sent += sent
+            total_failed += failed
+
+            if sent == 0 or failed:
+                if once:
+                    break
+                time.sleep(interval)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"sent={total_sent} failed={total_failed}"))
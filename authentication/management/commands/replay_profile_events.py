@@ -0,0 +1,102 @@
+import json
+import time
+import base64
+import logging
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...clients.kafka_client import KafkaClient
+from ...models import UserProfile
+from ...serializers.user_profile_serializer import UserProfileSerializer
+
+logger = logging.getLogger('prod')
+
+
+def encode_resume_token(last_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"after": last_id}).encode()).decode()
+
+
+def decode_resume_token(token: str) -> int:
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(token.encode()))["after"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise CommandError(f"잘못된 resume 토큰: {token}") from e
+
+
+class Command(BaseCommand):
+    help = (
+        "모든 UserProfile 을 id 순서대로 Kafka 에 다시 발행합니다. (새 컨슈머 온보딩용)\n"
+        "id 기반 keyset 페이지네이션으로 메모리를 일정하게 유지하며, "
+        "중단되면 마지막으로 출력된 resume 토큰으로 이어서 실행할 수 있습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--rate', type=float, default=0,
+                            help="초당 최대 발행 수 (0 이면 제한 없음)")
+        parser.add_argument('--topic', default=None,
+                            help="기본값: KAFKA_DEFAULT_TOPIC")
+        parser.add_argument('--resume', default=None,
+                            help="이전 실행이 출력한 resume 토큰")
+        parser.add_argument('--state-file', default=None,
+                            help="배치마다 resume 토큰을 기록할 파일. 존재하면 그 토큰부터 이어서 실행합니다.")
+        parser.add_argument('--flush-timeout', type=float, default=30.0)
+
+    def handle(self, *args, batch_size, rate, topic, resume, state_file, flush_timeout, **options):
+        topic = topic or settings.KAFKA_DEFAULT_TOPIC
+        if resume is None and state_file:
+            try:
+                with open(state_file, encoding='utf-8') as f:
+                    resume = f.read().strip() or None
+            except FileNotFoundError:
+                pass
+        last_id = decode_resume_token(resume) if resume else 0
+
+        total = UserProfile.objects.filter(id__gt=last_id).count()
+        self.stdout.write(f"replay 시작: topic={topic} after={last_id} 대상={total}")
+
+        sent = 0
+        started = time.monotonic()
+        while True:
+            # OFFSET 없이 마지막 id 이후만 읽는다. user 는 JOIN 으로 함께 가져와 N+1 을 피한다.
+            page = (UserProfile.objects.select_related('user')
+                    .filter(id__gt=last_id).order_by('id')[:batch_size])
+            messages = []
+            page_last_id = last_id
+            for profile in page.iterator(chunk_size=batch_size):
+                messages.append((profile.user_id, UserProfileSerializer(profile).data))
+                page_last_id = profile.id
+            if not messages:
+                break
+
+            failed = KafkaClient.send_batch(
+                topic, messages, headers={"replay": "1"},
+                schema="user-profile", timeout=flush_timeout)
+            if failed:
+                raise CommandError(
+                    f"{failed}건 발행 실패. --resume {encode_resume_token(last_id)} 로 다시 실행하세요.")
+
+            last_id = page_last_id
+            sent += len(messages)
+            token = encode_resume_token(last_id)
+            if state_file:
+                with open(state_file, 'w', encoding='utf-8') as f:
+                    f.write(token)
+
+            elapsed = time.monotonic() - started
+            if rate:
+                # 평균 발행 속도가 rate 를 넘지 않도록 다음 배치 전에 쉰다.
+                delay = sent / rate - elapsed
+                if delay > 0:
+                    time.sleep(delay)
+                    elapsed += delay
+
+            total = max(total, sent)
+            per_second = sent / elapsed if elapsed else 0
+            eta = (total - sent) / per_second if per_second else 0
+            self.stdout.write(
+                f"{sent}/{total} ({sent / total:.1%}) {per_second:.0f}/s "
+                f"eta={eta:.0f}s resume={token}")
+
+        logger.info(f"프로필 replay 완료: {sent}건, 마지막 id={last_id}")
+        self.stdout.write(self.style.SUCCESS(f"sent={sent} resume={encode_resume_token(last_id)}"))
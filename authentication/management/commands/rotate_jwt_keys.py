@@ -0,0 +1,83 @@
+import os
+import time
+import secrets
+import tempfile
+
+import orjson
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...utils.jwt_keys import SUPPORTED_ALGORITHMS, generate_private_key, private_key_pem
+
+
+class Command(BaseCommand):
+    help = (
+        "JWT keyring 에 새 서명 키를 추가합니다. 새 키는 PUBLISH_AHEAD 동안 JWKS 에만 공개된 뒤 서명에 쓰이고, "
+        "이전 키는 그때 발급된 토큰이 모두 만료될 때까지 검증에만 쓰입니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default=None,
+                            help="keyring 파일 (기본값: JWT_KEYRING['FILE'])")
+        parser.add_argument('--algorithm', choices=SUPPORTED_ALGORITHMS, default='RS256')
+        parser.add_argument('--publish-ahead', type=int, default=None,
+                            help="서명에 쓰기 전 JWKS 에 미리 공개할 시간(초)")
+        parser.add_argument('--prune', action='store_true',
+                            help="검증 기간이 끝난 키를 keyring 과 디스크에서 지웁니다.")
+
+    def handle(self, *args, file, algorithm, publish_ahead, prune, **options):
+        path = file or settings.JWT_KEYRING.get('FILE')
+        if not path:
+            raise CommandError("JWT_KEYRING_FILE 또는 --file 이 필요합니다.")
+        base_dir = os.path.dirname(os.path.abspath(path))
+        os.makedirs(base_dir, exist_ok=True)
+
+        keys = []
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                keys = orjson.loads(f.read()).get('keys', [])
+
+        now = int(time.time())
+        if publish_ahead is None:
+            publish_ahead = int(settings.JWT_KEYRING['PUBLISH_AHEAD'].total_seconds())
+        # 처음 만드는 키는 공개를 기다릴 다운스트림 캐시가 없으므로 바로 쓴다.
+        active_from = now + publish_ahead if keys else now
+
+        # 이전 키로 마지막에 서명된 토큰이 만료될 때까지 검증 키로 남긴다.
+        lifetime = settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'] + settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME']
+        verify_until = active_from + int(lifetime.total_seconds())
+        for entry in keys:
+            if entry.get('private_key') and entry.get('verify_until') is None:
+                entry['verify_until'] = verify_until
+
+        kid = f"{time.strftime('%Y%m%d', time.gmtime(active_from))}-{secrets.token_hex(4)}"
+        key_file = f"{kid}.pem"
+        fd = os.open(os.path.join(base_dir, key_file), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(private_key_pem(generate_private_key(algorithm)))
+        keys.append({
+            'kid': kid,
+            'alg': algorithm,
+            'private_key': key_file,
+            'active_from': active_from,
+            'verify_until': None,
+        })
+
+        if prune:
+            expired = [entry for entry in keys
+                       if entry.get('verify_until') is not None and entry['verify_until'] <= now]
+            for entry in expired:
+                key_path = os.path.join(base_dir, entry.get('private_key') or entry.get('public_key'))
+                if os.path.exists(key_path):
+                    os.remove(key_path)
+                self.stdout.write(f"pruned kid={entry['kid']}")
+            keys = [entry for entry in keys if entry not in expired]
+
+        # 다른 프로세스가 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체한다.
+        fd, tmp_path = tempfile.mkstemp(dir=base_dir, prefix='.keyring-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps({'keys': keys}, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, path)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"kid={kid} alg={algorithm} active_from={active_from} keys={len(keys)}"))
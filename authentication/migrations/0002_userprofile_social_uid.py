@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:00
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_social_uid(apps, schema_editor):
+    UserProfile = apps.get_model('authentication', 'UserProfile')
+    SocialAccount = apps.get_model('socialaccount', 'SocialAccount')
+
+    first_uid = SocialAccount.objects.filter(
+        user=OuterRef('user')).order_by('pk').values('uid')[:1]
+    UserProfile.objects.update(social_uid=Subquery(first_uid))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+        ('socialaccount', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='social_uid',
+            field=models.CharField(blank=True, max_length=191, null=True),
+        ),
+        migrations.RunPython(backfill_social_uid, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0008_outboxevent_failed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='pending_picture_url',
+            field=models.URLField(blank=True, max_length=1024, null=True),
+        ),
+    ]
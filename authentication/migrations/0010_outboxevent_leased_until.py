@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0009_userprofile_pending_picture_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxevent',
+            name='leased_until',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -1,4 +1,6 @@
+import uuid
 from django.db import models
+from django.utils import timezone
 
 
 class UserProfile(models.Model):
@@ -10,6 +12,51 @@ class UserProfile(models.Model):
     email = models.EmailField(blank=True, null=True)
     profile_picture = models.ImageField(
         upload_to='profile_pictures/', blank=True, null=True)
+    # {크기: {형식: 저장 경로}} - ProfilePictureVariantService 가 백그라운드에서 채운다.
+    picture_variants = models.JSONField(default=dict, blank=True)
+    # 아직 가져오지 못한 소셜 프로필 이미지 URL - AvatarIngestionService 가 반영하면 비운다.
+    pending_picture_url = models.URLField(max_length=1024, blank=True, null=True)
+    social_uid = models.CharField(max_length=191, blank=True, null=True)
 
     def __str__(self):
         return f"{self.user.username}'s Profile"
+
+
+class OutboxEvent(models.Model):
+    """
+    Kafka 로 발행할 이벤트. 도메인 변경과 같은 트랜잭션에서 기록하고,
+    relay_outbox_events 커맨드가 id 순서대로 발행한 뒤 삭제합니다.
+    available_at 이전에는 발행하지 않으므로, 그 사이에 같은 키의 변경을 합칠 수 있습니다.
+    """
+    event_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    topic = models.CharField(max_length=255)
+    key = models.CharField(max_length=255, blank=True, null=True)
+    payload = models.JSONField()
+    headers = models.JSONField(default=dict, blank=True)
+    schema = models.CharField(max_length=64, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField(default=timezone.now, db_index=True)
+    # 스키마 인코딩에 실패해 발행할 수 없는 이벤트. 릴레이가 건너뛰며, 원인을 고친 뒤 failed_at 을 비우면 다시 발행된다.
+    failed_at = models.DateTimeField(blank=True, null=True, db_index=True)
+    last_error = models.TextField(blank=True, default='')
+    # 릴레이가 발행 중인 이벤트. 이 시각까지는 다른 릴레이가 집어 가지 않는다. (릴레이가 죽으면 만료 후 다시 발행)
+    leased_until = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.topic}:{self.key} ({self.event_id})"
+
+
+class MediaBlob(models.Model):
+    """
+    내용 해시(SHA-256)로 주소가 정해지는 미디어 파일. 같은 이미지는 한 번만 저장하고 참조 수를 셉니다.
+    참조가 0 이 된 파일은 gc_media_blobs 커맨드가 유예 시간 뒤에 모아서 지웁니다.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    digest = models.CharField(max_length=64, blank=True, null=True, unique=True)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    unreferenced_at = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.name} (refs={self.ref_count})"
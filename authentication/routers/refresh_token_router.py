@@ -7,4 +7,10 @@ urlpatterns = [
     path('revoke/', views.RefreshTokenRevokeView.as_view(),
          name='refresh_token_revoke'),
 
+    path('revoke-all/', views.RefreshTokenRevokeAllView.as_view(),
+         name='refresh_token_revoke_all'),
+
+    path('sessions/', views.RefreshTokenSessionListView.as_view(),
+         name='refresh_token_sessions'),
+
 ]
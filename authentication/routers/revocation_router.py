@@ -0,0 +1,7 @@
+from django.urls import path
+from ..views.revocation_view import RevocationFilterView
+
+
+urlpatterns = [
+    path('filter/', RevocationFilterView.as_view(), name='revocation_filter'),
+]
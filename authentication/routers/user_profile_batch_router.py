@@ -0,0 +1,7 @@
+from django.urls import path
+from ..views.user_profile_view import UserProfileBatchView
+
+
+urlpatterns = [
+    path('', UserProfileBatchView.as_view(), name='user_profile_batch'),
+]
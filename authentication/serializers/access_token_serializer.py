@@ -2,12 +2,17 @@
 
 import logging
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+from ..utils.token_store import FAMILY_CLAIM
+from ..utils.tokens import RefreshToken
 
 
 logger = logging.getLogger('prod')
 
 
 class AccessTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RefreshToken
+
     @classmethod
     def get_token(cls, user):
         logger.info(f"Generating tokens for user: {user.username}")
@@ -15,5 +20,6 @@ class AccessTokenObtainPairSerializer(TokenObtainPairSerializer):
         token = super().get_token(user)
 
         token['email'] = user.email
+        token[FAMILY_CLAIM] = token[api_settings.JTI_CLAIM]
 
         return token
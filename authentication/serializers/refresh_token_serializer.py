@@ -1,14 +1,20 @@
 
+from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework import serializers
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from ..utils.token_store import FAMILY_CLAIM, RefreshTokenStore
+from ..utils.tokens import RefreshToken
 
 class CookieTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RefreshToken
 
     refresh = serializers.CharField(required=False, allow_null=True)
 
     default_error_messages = {
         'no_token': ('쿠키에서 유효한 refresh 토큰을 찾을 수 없습니다.'),
+        'no_active_account': ('주어진 토큰에 해당하는 활성 계정이 없습니다.'),
     }
 
     def validate(self, attrs):
@@ -23,7 +29,49 @@ class CookieTokenRefreshSerializer(TokenRefreshSerializer):
 
             raise ValidationError(self.error_messages['no_token'], 'no_token')
 
-        
-        attrs['refresh'] = refresh_token_from_cookie
+        # 토큰은 요청당 한 번만 파싱하고, 회전 처리에 필요한 클레임은 self.rotation 에 남겨둔다.
+        refresh = self.token_class(refresh_token_from_cookie)
 
-        return super().validate(attrs)
\ No newline at end of file
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM, None)
+        if user_id:
+            User = get_user_model()
+            try:
+                user = User.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except User.DoesNotExist:
+                # 탈퇴 등으로 삭제된 유저의 토큰은 401 로 거절한다.
+                user = None
+            if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+                raise AuthenticationFailed(
+                    self.error_messages['no_active_account'],
+                    'no_active_account',
+                )
+
+        old_jti = refresh[api_settings.JTI_CLAIM]
+        family = refresh.get(FAMILY_CLAIM, old_jti)
+        refresh[FAMILY_CLAIM] = family
+
+        data = {'access': str(refresh.access_token)}
+        self.rotation = None
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            # 이전 토큰의 블랙리스트 등록은 Redis 회전이 성공(ROTATED)한 뒤에 한다.
+            # (동시에 갱신하는 다른 탭이 블랙리스트에 먼저 걸려 재사용으로 처리되지 않도록)
+            old_exp = refresh['exp']
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+
+            data['refresh'] = str(refresh)
+            self.rotation = {
+                'user_id': user_id,
+                'old_jti': old_jti,
+                'new_jti': refresh[api_settings.JTI_CLAIM],
+                'family': family,
+                'old_digest': RefreshTokenStore.token_digest(refresh_token_from_cookie),
+                'old_exp': old_exp,
+                'device': request.META.get('HTTP_USER_AGENT'),
+            }
+
+        return data
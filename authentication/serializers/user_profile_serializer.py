@@ -1,13 +1,50 @@
+from urllib.parse import urljoin
+
+from django.conf import settings
 from rest_framework import serializers
 from ..models import UserProfile
-from ..services.user_profile_service import UserProfileService
+
+
+def public_media_url(url: str) -> str:
+    """
+    요청 없이(캐시용으로) 직렬화할 때의 미디어 URL. MEDIA_SERVING["PUBLIC_BASE_URL"] 이 있으면 절대 URL 로 만듭니다.
+    """
+    base = settings.MEDIA_SERVING.get("PUBLIC_BASE_URL")
+    return urljoin(base, url) if base else url
+
+
+class PictureVariantsField(serializers.Field):
+    """
+    picture_variants 의 저장 경로를 URL 로 바꿔 {크기: {형식: URL}} 로 내려줍니다. 아직 없으면 null.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, profile):
+        if not profile.picture_variants:
+            return None
+        storage = profile.profile_picture.storage
+        request = self.context.get('request')
+
+        def url(path):
+            value = storage.url(path)
+            return request.build_absolute_uri(value) if request is not None else public_media_url(value)
+
+        return {
+            size: {name: url(path) for name, path in formats.items()}
+            for size, formats in profile.picture_variants.items()
+        }
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     email = serializers.EmailField(source='user.email', read_only=True)
 
-    uid = serializers.SerializerMethodField()
+    uid = serializers.CharField(source='social_uid', read_only=True)
+    profile_picture_variants = PictureVariantsField()
 
     class Meta:
         model = UserProfile
@@ -19,14 +56,41 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'bio',
             'location',
             'profile_picture',
-            'uid'
+            'uid',
+            'profile_picture_variants',
         ]
         read_only_fields = [
             'id',
             'username',
             'email',
-            'uid'
+            'uid',
+            'profile_picture_variants',
         ]
 
-    def get_uid(self, obj: UserProfile) -> str | None:
-        return UserProfileService.get_user_profile_data(obj)
+
+class PublicImageField(serializers.ImageField):
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return public_media_url(value.url)
+
+
+class UserProfileSummarySerializer(serializers.ModelSerializer):
+    """
+    다른 서비스에 공개하는 프로필 요약 (표시 이름/아바타).
+    여러 호출자가 같은 캐시 값을 받으므로 요청 Host 와 무관한 URL 을 내려줍니다.
+    """
+    user_id = serializers.IntegerField(read_only=True)
+    profile_picture = PublicImageField(read_only=True)
+    profile_picture_variants = PictureVariantsField()
+
+    class Meta:
+        model = UserProfile
+        fields = [
+            'user_id',
+            'name',
+            'profile_picture',
+            'profile_picture_variants',
+        ]
+        read_only_fields = fields
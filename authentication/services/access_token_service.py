@@ -1,8 +1,12 @@
-from django.core.cache import cache
 from django.conf import settings
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenBackendError
+from rest_framework_simplejwt.settings import api_settings
 from django.contrib.auth import get_user_model
 from ..serializers.access_token_serializer import AccessTokenObtainPairSerializer
+from ..utils.token_store import RefreshTokenStore, FAMILY_CLAIM
+from ..utils.revocation_filter import RevocationFilter, family_entry
+from ..utils.token_blacklist import TokenBlacklist
+from ..utils.tokens import token_backend
 import logging
 
 
@@ -10,9 +14,16 @@ logger = logging.getLogger('prod')
 User = get_user_model()
 
 
+class RefreshTokenRaceError(Exception):
+    """
+    다른 요청(탭)이 방금 회전한 리프레시 토큰으로 다시 갱신을 요청한 경우.
+    패밀리는 그대로 두므로 클라이언트는 새 쿠키로 다시 요청하면 됩니다.
+    """
+
+
 class SocialAuthService:
     @staticmethod
-    def obtain_jwt_for_social_user(user):
+    def obtain_jwt_for_social_user(user, device: str | None = None):
 
         refresh = AccessTokenObtainPairSerializer.get_token(user)
         access_token = str(refresh.access_token)
@@ -26,8 +37,8 @@ class SocialAuthService:
         ttl_seconds = int(
             settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds())
         jti = refresh['jti']
-        cache_key = f"refresh_token:{user.id}:{jti}"
-        cache.set(cache_key, refresh_token, timeout=ttl_seconds)
+        RefreshTokenStore.save(
+            user.id, jti, refresh[FAMILY_CLAIM], refresh_token, ttl_seconds, device=device)
         logger.info(
             f"Cached refresh token for user {user.id}, JTI {jti}, TTL {ttl_seconds}s")
 
@@ -45,53 +56,48 @@ class SocialAuthService:
 
 class TokenRefreshService:
     @staticmethod
-    def manage_refreshed_tokens_in_cache_and_cookies(old_refresh_token_cookie: str, new_refresh_token: str) -> dict:
-        try:
-            old_refresh_token_obj = RefreshToken(
-                old_refresh_token_cookie, verify=False)
-            logger.debug(
-                f"✅🎭🖼🎨 토큰 파싱 성공 - payload: {old_refresh_token_obj.payload}")
-        except Exception as e:
-            logger.error(f"❌🎭🖼🎨 리프레시 토큰 파싱 중 오류 발생: {str(e)}", exc_info=True)
+    def manage_refreshed_tokens_in_cache_and_cookies(rotation: dict, new_refresh_token: str) -> dict:
+        """
+        시리얼라이저가 이미 파싱해 둔 클레임(rotation)으로 Redis 회전을 한 번에 처리합니다.
+        이미 회전된 토큰이 재사용되면 패밀리 전체를 무효화하고 InvalidToken 을 발생시킵니다.
+        회전 직후(유예 시간 안)의 동시 갱신이면 RefreshTokenRaceError 를 발생시킵니다.
+        """
+        user_id = rotation.get('user_id')
+        old_refresh_token_jti = rotation.get('old_jti')
+        new_jti = rotation.get('new_jti')
+        family = rotation.get('family')
+
+        if not (user_id and old_refresh_token_jti and new_jti):
+            logger.error(
+                f"리프레시 토큰 회전 정보 누락: 유저 ID {user_id}, 이전 JTI {old_refresh_token_jti}, 새 JTI {new_jti}")
+            raise ValueError("토큰 회전 정보를 확인할 수 없습니다.")
 
-        old_refresh_token_jti = None
-        user_id = None
+        ttl_seconds = int(
+            settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds())
+        result = RefreshTokenStore.rotate(
+            user_id, old_refresh_token_jti, new_jti, family, new_refresh_token, ttl_seconds,
+            old_digest=rotation.get('old_digest'), device=rotation.get('device'))
 
-        try:
-            old_refresh_token_obj = RefreshToken(
-                old_refresh_token_cookie, verify=False)
-            old_refresh_token_jti = old_refresh_token_obj['jti']
-            user_id = old_refresh_token_obj.get(
-                settings.SIMPLE_JWT['USER_ID_CLAIM'])
-            logger.debug(
-                f"오래된 리프레시 토큰 파싱됨: 유저 ID {user_id}, JTI {old_refresh_token_jti}")
-        except Exception as e:
-            logger.error(f"오래된 리프레시 토큰(쿠키)에서 JTI 또는 사용자 ID 추출 오류: {e}")
-            raise ValueError("오래된 토큰 처리 중 오류가 발생했습니다.")
-
-        if user_id and old_refresh_token_jti:
-            old_redis_key = f"refresh_token:{user_id}:{old_refresh_token_jti}"
-            cache.delete(old_redis_key)
-            logger.info(f"✅ Redis에서 이전 리프레시 토큰 삭제 완료! 키: {old_redis_key}")
-        else:
+        if result == RefreshTokenStore.REUSED:
+            logger.warning(
+                f"🚨 회전된 리프레시 토큰 재사용 감지! 유저 ID {user_id}, JTI {old_refresh_token_jti}, 패밀리 {family} 무효화")
+            # 탈취되었을 수 있는 패밀리의 액세스 토큰도 만료 전에 거부되도록 필터에 올린다.
+            RevocationFilter.revoke(family_entry(family))
+            raise InvalidToken("이미 사용된 리프레시 토큰입니다. 다시 로그인해주세요.")
+        if result == RefreshTokenStore.RACED:
+            logger.info(
+                f"동시 갱신 요청: 유저 ID {user_id}, JTI {old_refresh_token_jti} 는 방금 회전됨 (패밀리 유지)")
+            raise RefreshTokenRaceError("리프레시 토큰이 방금 갱신되었습니다. 다시 시도해주세요.")
+        if result == RefreshTokenStore.MISSING:
             logger.warning(
-                "이전 리프레시 토큰을 Redis에서 삭제하기 위한 사용자 ID 또는 JTI를 확인할 수 없음.")
+                f"Redis에 없는 리프레시 토큰으로 갱신 시도: 유저 ID {user_id}, JTI {old_refresh_token_jti}")
+            raise InvalidToken("리프레시 토큰을 찾을 수 없거나 이미 무효화되었습니다.")
 
-        new_jti = None
-        try:
-            new_refresh_token_obj = RefreshToken(new_refresh_token)
-            new_jti = new_refresh_token_obj['jti']
-            logger.debug(f"새 리프레시 토큰 파싱됨: JTI {new_jti}")
-        except Exception as e:
-            logger.error(f"새 리프레시 토큰에서 JTI 추출 오류: {e}")
-            raise ValueError("새 토큰 처리 중 오류가 발생했습니다.")
+        if api_settings.BLACKLIST_AFTER_ROTATION and rotation.get('old_exp'):
+            TokenBlacklist.add(old_refresh_token_jti, rotation['old_exp'])
 
-        ttl_seconds = int(
-            settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds())
-        new_redis_key = f"refresh_token:{user_id}:{new_jti}"
-        cache.set(new_redis_key, new_refresh_token, timeout=ttl_seconds)
         logger.info(
-            f"✅ Redis에 사용자 {user_id}의 새 리프레시 토큰 저장 완료! 키: {new_redis_key}, JTI: {new_jti}")
+            f"✅ Redis 리프레시 토큰 회전 완료! 유저 ID {user_id}, {old_refresh_token_jti} -> {new_jti}")
 
         cookie_settings = {
             'key': 'refresh_token',
@@ -103,3 +109,34 @@ class TokenRefreshService:
         }
         logger.info("새 리프레시 토큰을 위한 쿠키 설정 준비 완료.")
         return cookie_settings
+
+    @staticmethod
+    def detect_refresh_token_reuse(refresh_token_value: str | None) -> bool:
+        """
+        검증에 실패한 리프레시 토큰이 이미 회전된 토큰이라면 해당 패밀리를 무효화합니다.
+        서명/만료 검증은 그대로 수행하고 블랙리스트 확인만 건너뜁니다.
+        회전 직후(유예 시간 안)라면 무효화하지 않고 RefreshTokenRaceError 를 발생시킵니다.
+        """
+        if not refresh_token_value:
+            return False
+        try:
+            payload = token_backend.decode(refresh_token_value, verify=True)
+        except TokenBackendError:
+            return False
+
+        user_id = payload.get(api_settings.USER_ID_CLAIM)
+        jti = payload.get(api_settings.JTI_CLAIM)
+        if not (user_id and jti):
+            return False
+
+        family = payload.get(FAMILY_CLAIM, jti)
+        result = RefreshTokenStore.revoke_family_if_rotated(user_id, jti, family)
+        if result == RefreshTokenStore.RACED:
+            logger.info(f"동시 갱신 요청: 유저 ID {user_id}, JTI {jti} 는 방금 회전됨 (패밀리 유지)")
+            raise RefreshTokenRaceError("리프레시 토큰이 방금 갱신되었습니다. 다시 시도해주세요.")
+        if result == RefreshTokenStore.REUSED:
+            logger.warning(
+                f"🚨 회전된 리프레시 토큰 재사용 감지! 유저 ID {user_id}, JTI {jti}, 패밀리 {family} 무효화")
+            RevocationFilter.revoke(family_entry(family))
+            return True
+        return False
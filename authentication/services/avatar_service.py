@@ -0,0 +1,186 @@
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from django.conf import settings
+from django.db import transaction
+
+from ..models import UserProfile
+from ..utils.cache import CacheAside
+from ..utils.cache_keys import USER_PROFILE, USER_PROFILE_SUMMARY
+from ..utils.background import run_after_commit
+from ..utils.images import sniff_image_type
+from .profile_event_service import ProfileEventService
+from .picture_variant_service import ProfilePictureVariantService
+from .media_blob_service import MediaBlobService
+
+logger = logging.getLogger('prod')
+
+
+class AvatarDownloadError(Exception):
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        # 네트워크/서버 오류처럼 나중에 다시 시도할 만한 실패인지
+        self.retryable = retryable
+
+
+class AvatarIngestionService:
+    """
+    소셜 프로필 이미지를 요청 스레드 밖에서 내려받아 프로필에 반영합니다.
+    트랜잭션 커밋 후 프로세스별 스레드 풀에서 실행되며, HTTP 세션(커넥션 풀)을 재사용합니다.
+    가져올 URL 은 UserProfile.pending_picture_url 에 남겨 두므로, 워커가 재시작되어 작업이 사라져도
+    다음 로그인이나 ingest_pending_avatars 커맨드가 다시 실행합니다.
+    """
+    _session: requests.Session | None = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _settings() -> dict:
+        return {
+            "CONNECT_TIMEOUT": 3.0,
+            "READ_TIMEOUT": 5.0,
+            "MAX_BYTES": 5 * 1024 * 1024,
+            "RETRIES": 3,
+            "BACKOFF": 0.5,
+            **getattr(settings, "AVATAR_INGESTION", {}),
+        }
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        if cls._session is None:
+            with cls._lock:
+                if cls._session is None:
+                    conf = cls._settings()
+                    retry = Retry(
+                        total=conf["RETRIES"],
+                        backoff_factor=conf["BACKOFF"],
+                        status_forcelist=(429, 500, 502, 503, 504),
+                        allowed_methods=frozenset(["GET"]),
+                    )
+                    adapter = HTTPAdapter(
+                        pool_connections=4,
+                        pool_maxsize=getattr(settings, "BACKGROUND_WORKERS", 2),
+                        max_retries=retry)
+                    session = requests.Session()
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    cls._session = session
+        return cls._session
+
+    @classmethod
+    def schedule(cls, user_id: int, url: str) -> None:
+        """
+        현재 트랜잭션이 커밋되면 백그라운드에서 ingest 를 실행합니다.
+        (pending_picture_url 은 호출하는 쪽이 같은 트랜잭션에서 기록한다)
+        """
+        run_after_commit(cls.ingest, user_id, url)
+
+    @classmethod
+    def requeue_pending(cls, user_id: int) -> bool:
+        """
+        아직 반영되지 않은 이미지가 있으면 다시 예약합니다.
+        """
+        url = UserProfile.objects.filter(user_id=user_id).values_list(
+            'pending_picture_url', flat=True).first()
+        if not url:
+            return False
+        logger.info(f"대기 중인 프로필 이미지 수집 재예약: 유저 ID={user_id}")
+        cls.schedule(user_id, url)
+        return True
+
+    @staticmethod
+    def _is_pending(user_id: int, url: str) -> bool:
+        return UserProfile.objects.filter(user_id=user_id, pending_picture_url=url).exists()
+
+    @staticmethod
+    def _clear_pending(user_id: int, url: str) -> None:
+        UserProfile.objects.filter(user_id=user_id, pending_picture_url=url).update(
+            pending_picture_url=None)
+
+    @classmethod
+    def download(cls, url: str) -> tuple[bytes, str]:
+        """
+        이미지를 스트리밍으로 받아 (내용, 확장자) 를 반환합니다.
+        MAX_BYTES 를 넘거나 이미지가 아니면 AvatarDownloadError 를 던집니다.
+        """
+        conf = cls._settings()
+        max_bytes = conf["MAX_BYTES"]
+        try:
+            with cls.get_session().get(
+                url, stream=True, timeout=(conf["CONNECT_TIMEOUT"], conf["READ_TIMEOUT"])
+            ) as response:
+                if response.status_code >= 400:
+                    raise AvatarDownloadError(
+                        f"다운로드 실패: HTTP {response.status_code}",
+                        retryable=response.status_code >= 500 or response.status_code == 429)
+                content_type = response.headers.get("Content-Type", "")
+                if content_type and not content_type.startswith("image/"):
+                    raise AvatarDownloadError(f"이미지가 아닌 응답: {content_type}")
+                content_length = response.headers.get("Content-Length")
+                if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+                    raise AvatarDownloadError(f"이미지 크기 초과: {content_length} bytes")
+
+                chunks = []
+                received = 0
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    received += len(chunk)
+                    if received > max_bytes:
+                        raise AvatarDownloadError(f"이미지 크기 초과: {received}+ bytes")
+                    chunks.append(chunk)
+        except requests.exceptions.RequestException as e:
+            raise AvatarDownloadError(f"다운로드 실패: {e}", retryable=True) from e
+
+        data = b"".join(chunks)
+        # Content-Type 헤더는 믿지 않고 실제 바이트로 형식을 판별한다.
+        ext = sniff_image_type(data[:16])
+        if ext is None:
+            raise AvatarDownloadError("지원하지 않는 이미지 형식")
+        return data, ext
+
+    @classmethod
+    def ingest(cls, user_id: int, url: str) -> bool:
+        """
+        pending_picture_url 이 url 이면 내려받아 프로필에 반영하고 표시를 지웁니다.
+        다시 시도할 만한 실패는 표시를 남겨 두고 False 를 반환합니다.
+        """
+        if not cls._is_pending(user_id, url):
+            # 이미 반영되었거나, 그 사이 사용자가 직접 이미지를 올렸다.
+            return False
+        try:
+            data, ext = cls.download(url)
+        except AvatarDownloadError as e:
+            logger.error(f"프로필 이미지 수집 실패 (유저 ID={user_id}, 재시도={e.retryable}): {e}")
+            if not e.retryable:
+                cls._clear_pending(user_id, url)
+            return False
+
+        # 행 잠금을 잡은 채로 파일을 쓰지 않도록 먼저 저장한다. (반영되지 않으면 gc_media_blobs 가 지운다)
+        name = MediaBlobService.store(data, ext)
+
+        with transaction.atomic():
+            profile = UserProfile.objects.select_for_update().filter(
+                user_id=user_id).first()
+            if profile is None:
+                logger.warning(f"프로필 이미지 수집 중 프로필 없음: 유저 ID={user_id}")
+                return False
+            if profile.pending_picture_url != url:
+                return False
+            before = ProfileEventService.snapshot(profile)
+            old_name = profile.profile_picture.name or None
+            MediaBlobService.acquire(name)
+            profile.profile_picture.name = name
+            MediaBlobService.release(old_name)
+            profile.picture_variants = {}
+            profile.pending_picture_url = None
+            profile.save(update_fields=["profile_picture", "picture_variants", "pending_picture_url"])
+            ProfileEventService.profile_updated(profile, before)
+            ProfilePictureVariantService.schedule(
+                profile.id, profile.profile_picture.name)
+        logger.info(f"프로필 이미지 저장됨: 유저 ID={user_id}, {profile.profile_picture.name}")
+
+        CacheAside.delete(USER_PROFILE.key(user_id))
+        CacheAside.delete(USER_PROFILE_SUMMARY.key(user_id))
+        return True
@@ -0,0 +1,131 @@
+import re
+import hashlib
+import logging
+from datetime import timedelta
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import MediaBlob, UserProfile
+from ..utils.images import VARIANT_FORMATS, VARIANT_SIZES, sniff_image_type, variant_name
+
+logger = logging.getLogger('prod')
+
+
+class MediaBlobService:
+    """
+    프로필 이미지를 내용 해시 경로(profile_pictures/{해시 앞 2자리}/{해시}.{확장자})에 저장하고 참조 수를 관리합니다.
+    요청 경로에서는 파일을 지우지 않고 참조 수만 내리며, 실제 삭제는 sweep() 이 맡습니다.
+    """
+    BLOB_DIR = "profile_pictures"
+    VARIANT_DIR = "profile_pictures/variants"
+    # 내용이 바뀌면 이름도 바뀌는 경로 (원본과 그 변형)
+    CONTENT_ADDRESSED = re.compile(
+        r"^profile_pictures/(?:[0-9a-f]{2}/[0-9a-f]{64}|variants/[0-9a-f]{64}_\d+)\.\w+$")
+
+    @staticmethod
+    def storage():
+        return UserProfile._meta.get_field('profile_picture').storage
+
+    @classmethod
+    def store(cls, data: bytes, ext: str | None = None) -> str:
+        """
+        내용을 저장(이미 있으면 재사용)하고 저장 이름을 반환합니다.
+        파일 쓰기가 DB 트랜잭션을 붙잡지 않도록 트랜잭션 밖에서 호출하고, 쓰기로 했으면 트랜잭션 안에서 acquire() 합니다.
+        acquire() 되지 않은 항목(롤백 등)은 참조 수 0 으로 남아 sweep() 이 정리합니다.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        ext = sniff_image_type(data[:16]) or (ext or "bin").lower()
+
+        # 항목을 먼저 등록(또는 삭제 대기 시각을 미뤄 sweep 이 지우지 못하게)한 뒤 파일을 확인한다.
+        # 형식을 판별하지 못한 같은 내용이 다른 확장자로 올라와도 기존 이름을 쓴다.
+        with transaction.atomic():
+            blob, created = MediaBlob.objects.select_for_update().get_or_create(
+                digest=digest, defaults={
+                    'name': f"{cls.BLOB_DIR}/{digest[:2]}/{digest}.{ext}",
+                    'size': len(data), 'ref_count': 0, 'unreferenced_at': timezone.now()})
+            if not created and blob.ref_count == 0:
+                blob.unreferenced_at = timezone.now()
+                blob.save(update_fields=['unreferenced_at'])
+        name = blob.name
+
+        storage = cls.storage()
+        if not storage.exists(name):
+            saved = storage.save(name, ContentFile(data))
+            if saved != name:
+                # 동시에 같은 내용이 저장되었다. 먼저 저장된 파일을 쓴다.
+                storage.delete(saved)
+        return name
+
+    @classmethod
+    def store_upload(cls, upload) -> str:
+        ext = upload.name.rsplit('.', 1)[-1] if '.' in upload.name else None
+        upload.seek(0)
+        return cls.store(upload.read(), ext)
+
+    @staticmethod
+    def acquire(name: str) -> None:
+        """
+        store() 로 저장한 항목의 참조 수를 1 올립니다. 참조를 기록하는 트랜잭션 안에서 호출합니다.
+        """
+        updated = MediaBlob.objects.filter(name=name).update(
+            ref_count=F('ref_count') + 1, unreferenced_at=None)
+        if not updated:
+            logger.error(f"참조할 미디어 항목 없음: {name}")
+
+    @staticmethod
+    def release(name: str | None) -> None:
+        """
+        참조 수를 1 내립니다. 0 이 되면 삭제 대기로 표시합니다. (파일은 건드리지 않음)
+        내용 주소 이전에 저장된 파일은 참조 수 0 인 항목으로 등록해 같은 방식으로 정리합니다.
+        """
+        if not name:
+            return
+        now = timezone.now()
+        updated = MediaBlob.objects.filter(name=name, ref_count__gt=0).update(
+            ref_count=F('ref_count') - 1)
+        if updated:
+            MediaBlob.objects.filter(name=name, ref_count=0).update(unreferenced_at=now)
+        else:
+            MediaBlob.objects.get_or_create(
+                name=name, defaults={'ref_count': 0, 'unreferenced_at': now})
+
+    @classmethod
+    def is_content_addressed(cls, name: str) -> bool:
+        return cls.CONTENT_ADDRESSED.match(name) is not None
+
+    @classmethod
+    def variant_names(cls, name: str) -> list[str]:
+        return [variant_name(cls.VARIANT_DIR, name, size, ext)
+                for size in VARIANT_SIZES for ext, _ in VARIANT_FORMATS.values()]
+
+    @classmethod
+    def sweep(cls, grace_seconds: int = 3600, batch_size: int = 500) -> int:
+        """
+        grace_seconds 이상 참조되지 않은 파일(과 변형)을 batch_size 개씩 지우고, 지운 항목 수를 반환합니다.
+        """
+        cutoff = timezone.now() - timedelta(seconds=grace_seconds)
+        storage = cls.storage()
+        removed = 0
+        last_id = 0
+        while True:
+            with transaction.atomic():
+                # 행을 잠근 채로 파일을 지운다. 그 사이 같은 내용을 store() 하면 잠금이 풀린 뒤 새로 저장한다.
+                blobs = list(MediaBlob.objects.select_for_update(skip_locked=True).filter(
+                    id__gt=last_id, ref_count=0, unreferenced_at__lte=cutoff,
+                ).order_by('id')[:batch_size])
+                if not blobs:
+                    break
+                last_id = blobs[-1].id
+
+                for blob in blobs:
+                    for path in [blob.name, *cls.variant_names(blob.name)]:
+                        try:
+                            storage.delete(path)
+                        except Exception as e:
+                            logger.error(f"미디어 파일 삭제 실패 ({path}): {e}")
+                MediaBlob.objects.filter(id__in=[blob.id for blob in blobs]).delete()
+            removed += len(blobs)
+        logger.info(f"미디어 GC: {removed}개 삭제")
+        return removed
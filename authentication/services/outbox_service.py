@@ -0,0 +1,165 @@
+import logging
+from collections import deque
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from ..models import OutboxEvent
+from ..clients.event_codec import SchemaError, encode_event
+from ..clients.kafka_client import KafkaClient
+
+logger = logging.getLogger('prod')
+
+
+class OutboxService:
+
+    @staticmethod
+    def enqueue(topic: str, key, payload: dict, headers: dict | None = None,
+                schema: str | None = None, delay_seconds: float = 0) -> OutboxEvent:
+        """
+        이벤트를 outbox 에 기록합니다. 호출하는 쪽의 트랜잭션 안에서 불러야
+        도메인 변경이 롤백될 때 이벤트도 함께 사라집니다.
+        schema 는 schemas/ 에 등록된 subject 로, 발행 시점의 최신 버전으로 인코딩됩니다.
+        delay_seconds 동안은 발행하지 않습니다. (그 사이 pending() 으로 찾아 합칠 수 있음)
+        """
+        return OutboxEvent.objects.create(
+            topic=topic,
+            key=str(key) if key is not None else None,
+            payload=payload,
+            headers=headers or {},
+            schema=schema,
+            available_at=timezone.now() + timedelta(seconds=delay_seconds),
+        )
+
+    @staticmethod
+    def pending(key, schema: str | None = None):
+        """
+        아직 발행 대기 중(available_at 이 미래)인 같은 키의 이벤트. 릴레이가 집어 갈 수 없는 행들이다.
+        """
+        return OutboxEvent.objects.filter(
+            key=str(key), schema=schema, available_at__gt=timezone.now()
+        ).order_by('id')
+
+    @staticmethod
+    def release_pending(key) -> int:
+        """
+        같은 키의 대기 중 이벤트를 즉시 발행 가능하게 합니다. 뒤에 바로 발행할 이벤트보다 먼저 나가도록 할 때 씁니다.
+        """
+        return OutboxEvent.objects.filter(
+            key=str(key), available_at__gt=timezone.now()
+        ).update(available_at=timezone.now())
+
+    @staticmethod
+    def _group_by_key(events: list[OutboxEvent]) -> list[deque]:
+        """
+        id 순서를 유지한 채 같은 키끼리 묶습니다. 키가 없는 이벤트는 순서 제약이 없으므로 각자 한 묶음입니다.
+        """
+        groups: dict = {}
+        for event in events:
+            group = (event.key,) if event.key is not None else (None, event.id)
+            groups.setdefault(group, deque()).append(event)
+        return list(groups.values())
+
+    @staticmethod
+    def claim(batch_size: int, lease_seconds: float) -> list[OutboxEvent]:
+        """
+        발행할 이벤트를 id 순서로 batch_size 개 골라 lease_seconds 동안 빌립니다. (짧은 트랜잭션)
+        다른 릴레이가 빌려 간 이벤트와 같은 키의 이벤트는 순서를 지키기 위해 고르지 않습니다.
+        """
+        now = timezone.now()
+        leased_keys = OutboxEvent.objects.filter(
+            leased_until__gt=now, key__isnull=False).values('key')
+        with transaction.atomic():
+            events = list(
+                OutboxEvent.objects.select_for_update(skip_locked=True)
+                .filter(available_at__lte=now, failed_at__isnull=True)
+                .filter(Q(leased_until__isnull=True) | Q(leased_until__lte=now))
+                .exclude(key__in=leased_keys)
+                .order_by('id')[:batch_size]
+            )
+            OutboxEvent.objects.filter(id__in=[event.id for event in events]).update(
+                leased_until=now + timedelta(seconds=lease_seconds))
+        return events
+
+    @staticmethod
+    def relay_batch(producer, batch_size: int = 500, flush_timeout: float = 10.0,
+                    lease_seconds: float = 300.0) -> tuple[int, int]:
+        """
+        가장 오래된 이벤트부터 batch_size 개를 발행하고, 브로커가 확인한 이벤트만 삭제합니다.
+        (발행 수, 실패 수) 를 반환합니다. 실패한 이벤트는 남아 다음 배치에서 다시 발행됩니다. (at-least-once)
+        event-id 헤더로 소비자가 중복을 걸러낼 수 있습니다.
+
+        이벤트는 claim() 으로 먼저 빌리고, 발행/flush 는 트랜잭션 밖에서 합니다. (브로커가 느려도 행 잠금을 잡고 있지 않음)
+        결과는 다시 짧은 트랜잭션으로 반영합니다.
+
+        같은 키의 이벤트는 앞 이벤트가 확인된 뒤에만 보냅니다. (키마다 n 번째 이벤트를 모아 발행하고 flush)
+        앞 이벤트가 실패/미확인이거나 프로듀서 큐가 가득 차면, 그 키의 뒤 이벤트는 이번 배치에서 보내지 않습니다.
+
+        스키마 인코딩에 실패한 이벤트는 failed_at/last_error 를 기록해 따로 두고(실패 수에 포함) 나머지를 계속 발행합니다.
+        """
+        events = OutboxService.claim(batch_size, lease_seconds)
+        if not events:
+            return 0, 0
+
+        delivered = []
+        failed = []
+        parked = {}
+
+        def on_delivery(event_id):
+            def callback(err, msg):
+                KafkaClient.record_delivery(err, msg)
+                (failed if err else delivered).append(event_id)
+                if err:
+                    logger.error(f"outbox 이벤트 발행 실패 ({event_id}): {err}")
+            return callback
+
+        groups = OutboxService._group_by_key(events)
+        buffer_full = False
+        while groups and not buffer_full:
+            wave = [group.popleft() for group in groups]
+            for event in wave:
+                try:
+                    value, headers = encode_event(
+                        event.schema, event.payload,
+                        {**event.headers, 'event-id': str(event.event_id)})
+                except SchemaError as e:
+                    # 다시 시도해도 실패할 이벤트이므로 배치를 멈추지 않고 따로 둔다.
+                    logger.error(f"outbox 이벤트 인코딩 실패, 발행 보류 ({event.id}, {event.schema}): {e}")
+                    parked[event.id] = str(e)
+                    continue
+                try:
+                    producer.produce(
+                        topic=event.topic,
+                        key=event.key.encode('utf-8') if event.key is not None else None,
+                        value=value,
+                        headers=[(k, str(v).encode('utf-8')) for k, v in headers.items()],
+                        on_delivery=on_delivery(event.id),
+                    )
+                except BufferError:
+                    # 로컬 큐가 가득 차면 이미 넣은 메시지만 보내고 남은 이벤트는 다음 배치로 넘긴다.
+                    logger.warning("outbox 발행 중 프로듀서 큐가 가득 참, 배치를 나눔")
+                    buffer_full = True
+                    break
+
+            remaining = producer.flush(flush_timeout)
+            if remaining:
+                logger.warning(f"outbox flush 시간 초과, 미확인 메시지 {remaining}건")
+
+            # 이번 이벤트가 확인된(또는 보류된) 키만 다음 이벤트를 보낸다.
+            confirmed = set(delivered) | set(parked)
+            groups = [group for group, event in zip(groups, wave)
+                      if group and event.id in confirmed]
+
+        with transaction.atomic():
+            OutboxEvent.objects.filter(id__in=delivered).delete()
+            now = timezone.now()
+            for event_id, error in parked.items():
+                OutboxEvent.objects.filter(id=event_id).update(
+                    failed_at=now, last_error=error, leased_until=None)
+            # 확인받지 못했거나 보내지 않은 이벤트는 바로 다음 배치에서 다시 집어 가게 한다.
+            OutboxEvent.objects.filter(id__in=[event.id for event in events]).exclude(
+                id__in=delivered).update(leased_until=None)
+
+        logger.info(
+            f"outbox 이벤트 발행: 성공 {len(delivered)}건, 실패 {len(failed)}건, 보류 {len(parked)}건")
+        return len(delivered), len(failed) + len(parked)
@@ -0,0 +1,62 @@
+import logging
+from django.core.files.base import ContentFile
+
+from ..models import UserProfile
+from ..utils.background import run_after_commit
+from ..utils.cache import CacheAside
+from ..utils.cache_keys import USER_PROFILE, USER_PROFILE_SUMMARY
+from ..utils.images import generate_variants, variant_name
+from .media_blob_service import MediaBlobService
+
+logger = logging.getLogger('prod')
+
+
+class ProfilePictureVariantService:
+    """
+    프로필 이미지의 크기별 WebP/JPEG 변형을 요청 밖에서 만들어 picture_variants 에 기록합니다.
+    변형 경로는 원본 이름에서 정해지므로, 같은 원본(내용 주소)을 쓰는 프로필끼리 공유하고
+    원본과 함께 MediaBlobService.sweep() 에서 지워집니다.
+    """
+
+    @classmethod
+    def schedule(cls, profile_id: int, picture_name: str | None) -> None:
+        """
+        현재 트랜잭션이 커밋되면 새 이미지의 변형을 만듭니다.
+        """
+        if picture_name:
+            run_after_commit(cls.generate, profile_id, picture_name)
+
+    @classmethod
+    def generate(cls, profile_id: int, picture_name: str) -> bool:
+        profile = UserProfile.objects.filter(pk=profile_id).first()
+        # 그 사이 이미지가 다시 바뀌었다면 새 작업이 처리한다.
+        if profile is None or profile.profile_picture.name != picture_name:
+            return False
+
+        storage = profile.profile_picture.storage
+        try:
+            with profile.profile_picture.open('rb') as source:
+                variants = generate_variants(source)
+        except Exception as e:
+            logger.error(f"프로필 이미지 변형 생성 실패 ({picture_name}): {e}")
+            return False
+
+        saved = {}
+        for size, formats in variants.items():
+            for name, (ext, data) in formats.items():
+                path = variant_name(MediaBlobService.VARIANT_DIR, picture_name, size, ext)
+                if not storage.exists(path):
+                    stored = storage.save(path, ContentFile(data))
+                    if stored != path:
+                        storage.delete(stored)
+                saved.setdefault(str(size), {})[name] = path
+
+        updated = UserProfile.objects.filter(
+            pk=profile_id, profile_picture=picture_name).update(picture_variants=saved)
+        if not updated:
+            return False
+
+        logger.info(f"프로필 이미지 변형 생성: 프로필 ID={profile_id}, {picture_name}")
+        CacheAside.delete(USER_PROFILE.key(profile.user_id))
+        CacheAside.delete(USER_PROFILE_SUMMARY.key(profile.user_id))
+        return True
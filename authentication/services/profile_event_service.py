@@ -0,0 +1,96 @@
+import logging
+from django.conf import settings
+from django.utils import timezone
+from .outbox_service import OutboxService
+
+logger = logging.getLogger('prod')
+
+PROFILE_CHANGE_SCHEMA = "user-profile-change"
+TRACKED_FIELDS = ('name', 'bio', 'location', 'email', 'profile_picture')
+
+UPDATED = "updated"
+DELETED = "deleted"
+
+
+class ProfileEventService:
+    """
+    프로필 변경/삭제 이벤트를 outbox 에 기록합니다. (키: user_id)
+    같은 유저의 연속 수정은 PROFILE_EVENT_DEBOUNCE_SECONDS 동안 하나의 이벤트로 합칩니다.
+    호출하는 쪽의 트랜잭션 안에서 불러야 합니다.
+    """
+
+    @staticmethod
+    def snapshot(profile) -> dict:
+        values = {}
+        for field in TRACKED_FIELDS:
+            value = getattr(profile, field)
+            if field == 'profile_picture':
+                value = value.name or None
+            values[field] = value
+        return values
+
+    @staticmethod
+    def diff(before: dict, after: dict) -> dict:
+        return {
+            field: {'old': before.get(field), 'new': after.get(field)}
+            for field in TRACKED_FIELDS
+            if before.get(field) != after.get(field)
+        }
+
+    @classmethod
+    def profile_updated(cls, profile, before: dict) -> None:
+        changes = cls.diff(before, cls.snapshot(profile))
+        if not changes:
+            return
+
+        user_id = profile.user_id
+        occurred_at = timezone.now().isoformat()
+        pending = OutboxService.pending(
+            user_id, PROFILE_CHANGE_SCHEMA).select_for_update().first()
+
+        if pending is None:
+            OutboxService.enqueue(
+                topic=settings.KAFKA_DEFAULT_TOPIC,
+                key=user_id,
+                payload={
+                    'user_id': user_id,
+                    'type': UPDATED,
+                    'changes': changes,
+                    'occurred_at': occurred_at,
+                },
+                schema=PROFILE_CHANGE_SCHEMA,
+                delay_seconds=getattr(settings, 'PROFILE_EVENT_DEBOUNCE_SECONDS', 5),
+            )
+            return
+
+        # 대기 중인 이벤트에 합친다. 필드별로 처음 old 와 마지막 new 를 남기고, 원래대로 돌아온 필드는 뺀다.
+        merged = pending.payload['changes']
+        for field, change in changes.items():
+            merged.setdefault(field, {'old': change['old']})['new'] = change['new']
+        merged = {field: change for field, change in merged.items()
+                  if change['old'] != change['new']}
+
+        if not merged:
+            pending.delete()
+            logger.info(f"프로필 변경 이벤트 상쇄됨: 유저 ID={user_id}")
+            return
+
+        pending.payload.update(changes=merged, occurred_at=occurred_at)
+        pending.save(update_fields=['payload'])
+        logger.info(f"프로필 변경 이벤트 병합: 유저 ID={user_id}, 필드={list(merged)}")
+
+    @staticmethod
+    def profile_deleted(user_id: int) -> None:
+        # 대기 중인 변경 이벤트가 삭제 이벤트보다 먼저 발행되도록 바로 풀어 준다.
+        OutboxService.release_pending(user_id)
+        OutboxService.enqueue(
+            topic=settings.KAFKA_DEFAULT_TOPIC,
+            key=user_id,
+            payload={
+                'user_id': user_id,
+                'type': DELETED,
+                'changes': None,
+                'occurred_at': timezone.now().isoformat(),
+            },
+            schema=PROFILE_CHANGE_SCHEMA,
+        )
@@ -1,7 +1,9 @@
 import logging
-from django.core.cache import cache
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.settings import api_settings
+from ..utils.token_store import FAMILY_CLAIM, RefreshTokenStore
+from ..utils.revocation_filter import RevocationFilter, family_entry, user_entry
+from ..utils.token_blacklist import TokenBlacklist
+from ..utils.tokens import RefreshToken
 
 logger = logging.getLogger('prod')
 
@@ -23,9 +25,13 @@ class RevokeTokenService:
                     f"요청 유저 ID {request_user_id} 와 토큰 유저 ID {token_user_id} 가 불일치합니다.")
                 raise ValueError("토큰과 사용자 정보가 일치하지 않습니다.")
 
-            redis_key = f"refresh_token:{request_user_id}:{jti}"
+            redis_key = RefreshTokenStore.token_key(request_user_id, jti)
 
-            deleted_count = cache.delete(redis_key)
+            deleted_count = RefreshTokenStore.revoke(request_user_id, jti)
+            # 서명이 유효한 동안 다시 쓰이지 않도록 남은 수명만큼 블랙리스트에 둔다.
+            TokenBlacklist.add(jti, token['exp'])
+            # 이 세션에서 이미 발급된 액세스 토큰도 만료 전에 거부되도록 패밀리를 필터에 올린다.
+            RevocationFilter.revoke(family_entry(token.get(FAMILY_CLAIM, jti)))
 
             if deleted_count == 0:
                 logger.warning(
@@ -43,3 +49,37 @@ class RevokeTokenService:
             logger.error(
                 f"리프레시 토큰 무효화 중 예상치 못한 오류 발생 (사용자 {request_user_id}): {e}", exc_info=True)
             raise ValueError(f"토큰 무효화 중 오류가 발생했습니다: {e}")
+
+    @staticmethod
+    def revoke_all_refresh_tokens(request_user_id: int) -> int:
+        """
+        유저 세션 인덱스를 이용해 해당 유저의 모든 리프레시 토큰을 무효화합니다.
+        무효화된 토큰 개수를 반환합니다.
+        """
+        active = RefreshTokenStore.active_jtis(request_user_id)
+        revoked_count = RefreshTokenStore.revoke_all(request_user_id)
+        TokenBlacklist.add_many(active)
+        # 전체 로그아웃/계정 삭제: 지금까지 발급된 이 유저의 액세스 토큰을 모두 거부한다.
+        RevocationFilter.revoke(user_entry(request_user_id))
+        logger.info(
+            f"사용자 {request_user_id}의 리프레시 토큰 {revoked_count}개 전체 무효화 완료.")
+        return revoked_count
+
+
+class RefreshTokenSessionService:
+    @staticmethod
+    def list_sessions(request_user_id: int, current_refresh_token: str | None = None) -> list[dict]:
+        current_jti = None
+        if current_refresh_token:
+            try:
+                current_jti = RefreshToken(
+                    current_refresh_token, verify=False)[api_settings.JTI_CLAIM]
+            except Exception as e:
+                logger.warning(f"현재 리프레시 토큰 JTI 확인 실패 (사용자 {request_user_id}): {e}")
+
+        sessions = RefreshTokenStore.list_sessions(request_user_id)
+        for session in sessions:
+            session['current'] = session['jti'] == current_jti
+
+        logger.info(f"사용자 {request_user_id}의 활성 세션 {len(sessions)}개 조회")
+        return sessions
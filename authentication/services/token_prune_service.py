@@ -0,0 +1,178 @@
+import time
+import logging
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+from django_redis import get_redis_connection
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger('prod')
+User = get_user_model()
+
+token_prune_deleted = Counter(
+    "token_prune_deleted_total",
+    "만료/고아 토큰 상태 정리로 지운 행/키 수",
+    ["target"],
+)
+token_prune_scanned = Counter(
+    "token_prune_scanned_total",
+    "토큰 상태 정리 중 확인한 행/키 수",
+    ["target"],
+)
+token_prune_duration = Histogram(
+    "token_prune_duration_seconds",
+    "토큰 상태 정리 한 번에 걸린 시간",
+    ["target"],
+)
+
+OUTSTANDING_TABLE = "token_blacklist_outstandingtoken"
+BLACKLISTED_TABLE = "token_blacklist_blacklistedtoken"
+
+# RefreshTokenStore 가 `{prefix}{user_id}:...` 로 만드는 키
+REDIS_KEY_PREFIXES = (
+    "refresh_token:",
+    "refresh_token_rotated:",
+    "refresh_token_family:",
+    "refresh_sessions:",
+)
+
+
+class TokenPruneService:
+    """
+    만료된 simplejwt token_blacklist 행과, 삭제된 유저의 리프레시 토큰 Redis 키를 조금씩 나눠 지웁니다.
+    한 번에 큰 DELETE 를 실행하지 않도록 id 순서(keyset)로 chunk_size 개씩 지우고 chunk 사이에 sleep 초 쉽니다.
+    """
+
+    @staticmethod
+    def options() -> dict:
+        return settings.TOKEN_PRUNING
+
+    @staticmethod
+    def legacy_tables_exist() -> bool:
+        return {OUTSTANDING_TABLE, BLACKLISTED_TABLE} <= set(connection.introspection.table_names())
+
+    @classmethod
+    def prune_legacy_tables(cls, chunk_size: int | None = None, sleep: float | None = None,
+                            progress=None) -> int:
+        """
+        만료된 OutstandingToken 과 그 BlacklistedToken 행을 지우고, 지운 OutstandingToken 수를 반환합니다.
+        token_blacklist 테이블이 없으면(이미 정리됨) 아무것도 하지 않습니다.
+        """
+        options = cls.options()
+        chunk_size = chunk_size or options["CHUNK_SIZE"]
+        sleep = options["CHUNK_SLEEP"] if sleep is None else sleep
+        if not cls.legacy_tables_exist():
+            return 0
+
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        deleted = 0
+        last_id = 0
+        with token_prune_duration.labels("outstanding_token").time():
+            while True:
+                with transaction.atomic():
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            f"SELECT id FROM {OUTSTANDING_TABLE} "
+                            f"WHERE id > %s AND expires_at < %s ORDER BY id LIMIT %s",
+                            [last_id, now, chunk_size],
+                        )
+                        ids = [row[0] for row in cursor.fetchall()]
+                        if not ids:
+                            break
+                        last_id = ids[-1]
+                        placeholders = ", ".join(["%s"] * len(ids))
+                        cursor.execute(
+                            f"DELETE FROM {BLACKLISTED_TABLE} WHERE token_id IN ({placeholders})", ids)
+                        blacklisted = cursor.rowcount
+                        cursor.execute(
+                            f"DELETE FROM {OUTSTANDING_TABLE} WHERE id IN ({placeholders})", ids)
+                        outstanding = cursor.rowcount
+
+                deleted += outstanding
+                token_prune_scanned.labels("outstanding_token").inc(len(ids))
+                token_prune_deleted.labels("outstanding_token").inc(outstanding)
+                token_prune_deleted.labels("blacklisted_token").inc(blacklisted)
+                if progress:
+                    progress(f"outstanding_token deleted={deleted} last_id={last_id}")
+                if len(ids) < chunk_size:
+                    break
+                time.sleep(sleep)
+        return deleted
+
+    @staticmethod
+    def _user_id(name: str, prefix: str) -> int | None:
+        user_id = name[len(prefix):].split(":", 1)[0]
+        return int(user_id) if user_id.isdigit() else None
+
+    @classmethod
+    def sweep_orphaned_keys(cls, scan_count: int | None = None, sleep: float | None = None,
+                            progress=None) -> int:
+        """
+        SCAN 으로 리프레시 토큰 관련 키를 훑어, 유저가 더 이상 없는 키를 파이프라인으로 지웁니다.
+        """
+        options = cls.options()
+        scan_count = scan_count or options["SCAN_COUNT"]
+        sleep = options["CHUNK_SLEEP"] if sleep is None else sleep
+        client = get_redis_connection("default")
+
+        deleted = 0
+        with token_prune_duration.labels("redis_key").time():
+            for raw_prefix in REDIS_KEY_PREFIXES:
+                prefix = cache.make_key(raw_prefix)
+                batch = []
+                for key in client.scan_iter(match=f"{prefix}*", count=scan_count):
+                    batch.append(key)
+                    if len(batch) >= scan_count:
+                        deleted += cls._delete_orphans(client, prefix, batch)
+                        batch = []
+                        if progress:
+                            progress(f"redis_key prefix={raw_prefix} deleted={deleted}")
+                        time.sleep(sleep)
+                if batch:
+                    deleted += cls._delete_orphans(client, prefix, batch)
+        return deleted
+
+    @classmethod
+    def _delete_orphans(cls, client, prefix: str, keys: list) -> int:
+        token_prune_scanned.labels("redis_key").inc(len(keys))
+        owners = {}
+        for key in keys:
+            name = key.decode() if isinstance(key, bytes) else key
+            user_id = cls._user_id(name, prefix)
+            if user_id is not None:
+                owners[key] = user_id
+
+        existing = set(User.objects.filter(
+            id__in=set(owners.values())).values_list("id", flat=True))
+        orphans = [key for key, user_id in owners.items() if user_id not in existing]
+        if not orphans:
+            return 0
+
+        pipe = client.pipeline(transaction=False)
+        for key in orphans:
+            pipe.delete(key)
+        deleted = sum(pipe.execute())
+        token_prune_deleted.labels("redis_key").inc(deleted)
+        return deleted
+
+    @classmethod
+    def run(cls, progress=None) -> dict:
+        stats = {
+            "outstanding_token": cls.prune_legacy_tables(progress=progress),
+            "redis_key": cls.sweep_orphaned_keys(progress=progress),
+        }
+        logger.info(f"토큰 상태 정리 완료: {stats}")
+        return stats
+
+    @classmethod
+    def run_scheduled(cls) -> dict | None:
+        """
+        여러 프로세스의 스케줄러 중 한 곳에서만 실행되도록 Redis 잠금(SET NX)을 잡고 실행합니다.
+        """
+        interval = int(cls.options()["SCHEDULE_INTERVAL"])
+        lock_key = cache.make_key("token_prune:lock")
+        if not get_redis_connection("default").set(lock_key, 1, nx=True, ex=max(interval - 1, 1)):
+            return None
+        return cls.run()
@@ -1,7 +1,11 @@
 
-import os
 import logging
 from ..models import UserProfile
+from .profile_event_service import ProfileEventService
+from .picture_variant_service import ProfilePictureVariantService
+from .media_blob_service import MediaBlobService
+from ..utils.cache import CacheAside
+from ..utils.cache_keys import USER_PROFILE
 from allauth.socialaccount.models import SocialAccount
 
 from django.contrib.auth import get_user_model
@@ -14,18 +18,24 @@ User = get_user_model()
 class UserProfileService:
 
     @staticmethod
-    def get_user_profile_data(profile_instance: UserProfile):
+    def sync_social_uid(user, uid: str | None = None) -> None:
+        """
+        소셜 계정 uid 를 UserProfile.social_uid 에 반영합니다.
+        uid 를 주지 않으면 유저에 연결된 첫 번째 소셜 계정에서 다시 계산합니다. 값이 같으면 아무것도 하지 않습니다.
+        """
+        if uid is None:
+            uid = SocialAccount.objects.filter(
+                user=user).order_by('pk').values_list('uid', flat=True).first()
+        # social_account_updated 는 소셜 로그인마다 오므로, 바뀌지 않았으면 쓰지도 캐시를 지우지도 않는다.
+        current = UserProfile.objects.filter(user=user).values_list('social_uid', flat=True)[:1]
+        if not current or current[0] == uid:
+            return
+        updated = UserProfile.objects.filter(user=user).update(social_uid=uid)
+        # 캐시된 /profile/me/ 응답(과 그 ETag)에 이전 uid 가 남지 않도록 커밋 후 지운다.
+        user_id = user.id
+        transaction.on_commit(lambda: CacheAside.delete(USER_PROFILE.key(user_id)))
         logger.info(
-            f"프로필 데이터 조회 서비스: 프로필 ID={profile_instance.id}, 유저 ID={profile_instance.user.id}"
-        )
-        social = SocialAccount.objects.filter(
-            user=profile_instance.user).first()
-        if social:
-            return social.uid
-        logger.warning(
-            f"유저 {profile_instance.user.id}에 연결된 소셜 계정 없음 (프로필 ID={profile_instance.id})"
-        )
-        return None
+            f"프로필 소셜 uid 동기화: 유저 ID={user.id}, uid={uid}, 갱신={updated}")
 
     @staticmethod
     def update_user_profile(
@@ -37,21 +47,30 @@ class UserProfileService:
         )
 
         new_file = validated_data.get('profile_picture')
-        old_file = profile_instance.profile_picture
-
-        if new_file and old_file and old_file.name != new_file.name:
-            try:
-                path = old_file.path
-                if os.path.isfile(path):
-                    os.remove(path)
-                    logger.info(f"기존 프로필 이미지 삭제됨: {path}")
-            except Exception as e:
-                logger.error(f"기존 이미지 삭제 실패: {e}")
+        old_name = profile_instance.profile_picture.name or None
 
+        before = ProfileEventService.snapshot(profile_instance)
         for attr, val in validated_data.items():
-            setattr(profile_instance, attr, val)
+            if attr != 'profile_picture':
+                setattr(profile_instance, attr, val)
+
+        # 파일은 트랜잭션 밖에서 쓴다. 롤백되면 참조 없는 항목으로 남아 gc_media_blobs 가 지운다.
+        new_name = MediaBlobService.store_upload(new_file) if new_file else None
 
-        profile_instance.save()
+        with transaction.atomic():
+            if new_file:
+                # 같은 내용은 한 번만 저장하고, 이전 파일은 참조만 내린다. (삭제는 gc_media_blobs)
+                MediaBlobService.acquire(new_name)
+                profile_instance.profile_picture.name = new_name
+                profile_instance.picture_variants = {}
+                # 직접 올린 이미지를 아직 수집되지 않은 소셜 이미지가 덮어쓰지 않게 한다.
+                profile_instance.pending_picture_url = None
+                MediaBlobService.release(old_name)
+            profile_instance.save()
+            ProfileEventService.profile_updated(profile_instance, before)
+            if new_file:
+                ProfilePictureVariantService.schedule(
+                    profile_instance.id, profile_instance.profile_picture.name)
         return profile_instance
 
     @staticmethod
@@ -61,17 +80,9 @@ class UserProfileService:
         )
 
         with transaction.atomic():
-
-            try:
-                path = profile_instance.profile_picture.path
-                if os.path.isfile(path):
-                    os.remove(path)
-                    logger.info(f"프로필 이미지 파일 삭제됨: {path}")
-            except Exception as e:
-                logger.error(f"프로필 이미지 삭제 중 오류: {e}")
-            finally:
-
-                User.objects.filter(id=user_id).delete()
+            MediaBlobService.release(profile_instance.profile_picture.name)
+            User.objects.filter(id=user_id).delete()
+            ProfileEventService.profile_deleted(user_id)
 
             logger.info(
                 f" 프로필/유저 삭제 완료 - 프로필 ID={profile_instance.id}, 유저 ID={user_id}")
@@ -1,12 +1,20 @@
-import requests
-from django.core.files import File
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from allauth.account.signals import user_signed_up, user_logged_in
+from allauth.socialaccount.signals import (
+    social_account_added,
+    social_account_updated,
+    social_account_removed,
+)
 from ..models import UserProfile
 from ..serializers.user_profile_serializer import UserProfileSerializer
-from ..clients.kafka_client import KafkaClient
+from ..services.user_profile_service import UserProfileService
+from ..services.outbox_service import OutboxService
+from ..services.avatar_service import AvatarIngestionService
+from ..utils.cache import CacheAside
+from ..utils.cache_keys import USER_PROFILE_SUMMARY
 from django.conf import settings
 import logging
 
@@ -34,6 +42,7 @@ def populate_user_profile_on_signup(request, user, **kwargs):
     if social_login:
         logger.info(f"소셜 로그인 정보 감지: 프로필 업데이트 시도")
         extra_data = social_login.account.extra_data
+        profile.social_uid = social_login.account.uid
 
         social_image_url = None
         for profile_image_key in ['picture', 'profile_image', 'image_url']:
@@ -43,22 +52,8 @@ def populate_user_profile_on_signup(request, user, **kwargs):
                 break
 
         if social_image_url:
-            logger.info(f"소셜 프로필 이미지 URL 발견: {social_image_url}")
-            try:
-                response = requests.get(social_image_url, stream=True)
-                response.raise_for_status()
-
-                file_name_part = social_image_url.split('/')[-1].split('?')[0]
-                file_name = f"{user.id}_{file_name_part}"
-                if not '.' in file_name_part:
-                    file_name += '.jpg'
-
-                profile.profile_picture.save(file_name, File(response.raw))
-                logger.info(f"프로필 이미지 성공적으로 저장됨: {file_name}")
-            except requests.exceptions.RequestException as req_e:
-                logger.error(f"프로필 이미지 다운로드 실패 (네트워크/HTTP 오류): {req_e}")
-            except Exception as e:
-                logger.error(f"프로필 이미지 저장 중 예상치 못한 오류 발생: {e}")
+            # URL 은 프로필에 남겨 두어 작업이 유실되어도 다음 로그인 때 다시 예약된다.
+            profile.pending_picture_url = social_image_url
         else:
             logger.info("소셜 프로필 이미지 URL 찾을 수 없음.")
 
@@ -72,17 +67,48 @@ def populate_user_profile_on_signup(request, user, **kwargs):
             profile.email = social_email
             logger.debug(f"소셜 이메일로 프로필 이메일 업데이트됨: {profile.email}")
 
-    profile.save()
-    serializer = UserProfileSerializer(instance=profile)
+    # 프로필 저장과 이벤트 기록을 한 트랜잭션으로 묶고, 발행은 relay_outbox_events 가 맡는다.
+    with transaction.atomic():
+        profile.save()
+        serializer = UserProfileSerializer(instance=profile)
 
-    data = serializer.data
+        data = serializer.data
 
-    topic = settings.KAFKA_DEFAULT_TOPIC
-    key = data.get("user_id")
-    headers = {
-        "content-type": "application/json",
-        "schema": "user-profile-v1",
-    }
+        topic = settings.KAFKA_DEFAULT_TOPIC
+        key = user.id
+
+        OutboxService.enqueue(
+            topic=topic, key=key, payload=data, schema="user-profile")
+        if profile.pending_picture_url:
+            # 다운로드는 가입 요청을 붙잡지 않도록 커밋 후 백그라운드에서 한다.
+            # (user_signed_up 은 트랜잭션 밖에서 오므로 저장보다 먼저 예약하면 곧바로 실행된다)
+            logger.info(f"소셜 프로필 이미지 수집 예약: {profile.pending_picture_url}")
+            AvatarIngestionService.schedule(user.id, profile.pending_picture_url)
+        # 가입 중에 채운 이름이 일괄 조회 캐시에 반영되도록 커밋 후 요약을 지운다.
+        transaction.on_commit(lambda: CacheAside.delete(USER_PROFILE_SUMMARY.key(user.id)))
 
-    KafkaClient.send(topic=topic, key=key, value=data, headers=headers)
     logger.info(f"UserProfile 저장 완료: 유저 ID {user.id}")
+
+
+@receiver(user_logged_in)
+def requeue_pending_avatar_on_login(request, user, **kwargs):
+    AvatarIngestionService.requeue_pending(user.id)
+
+
+@receiver(social_account_added)
+@receiver(social_account_updated)
+def sync_social_uid_on_social_account_change(request, sociallogin, **kwargs):
+    UserProfileService.sync_social_uid(sociallogin.user)
+
+
+@receiver(social_account_removed)
+def sync_social_uid_on_social_account_removed(request, socialaccount, **kwargs):
+    UserProfileService.sync_social_uid(socialaccount.user)
+
+
+@receiver(post_save, sender=UserProfile)
+def clear_profile_summary_on_create(sender, instance, created, **kwargs):
+    # 일괄 조회가 "프로필 없음" 을 잠시 캐시해 두었을 수 있으므로 새 프로필이 생기면 지운다.
+    if created:
+        user_id = instance.user_id
+        transaction.on_commit(lambda: CacheAside.delete(USER_PROFILE_SUMMARY.key(user_id)))
@@ -0,0 +1,189 @@
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from ..models import OutboxEvent, UserProfile
+from ..services.avatar_service import AvatarDownloadError, AvatarIngestionService
+from ..signals.user_profile_signal import populate_user_profile_on_signup
+from .fake_redis import FakeRedisMixin
+
+User = get_user_model()
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 200
+
+
+class AvatarHandler(BaseHTTPRequestHandler):
+    """
+    소셜 CDN 대신 쓰는 로컬 HTTP 서버.
+    """
+    flaky_calls = 0
+
+    def do_GET(self):
+        if self.path == "/avatar.png":
+            self.reply(200, "image/png", PNG)
+        elif self.path == "/large.png":
+            self.reply(200, "image/png", PNG * 20)
+        elif self.path == "/unsized.png":
+            # Content-Length 없이 연결을 닫을 때까지 보낸다.
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.end_headers()
+            self.wfile.write(PNG * 20)
+        elif self.path == "/page":
+            self.reply(200, "text/html", b"<html></html>")
+        elif self.path == "/fake.png":
+            self.reply(200, "image/png", b"not really an image")
+        elif self.path == "/flaky.png":
+            AvatarHandler.flaky_calls += 1
+            if AvatarHandler.flaky_calls == 1:
+                self.reply(503, "text/plain", b"busy")
+            else:
+                self.reply(200, "image/png", PNG)
+        else:
+            self.reply(404, "text/plain", b"")
+
+    def reply(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(
+    KAFKA_DEFAULT_TOPIC="user-profile",
+    AVATAR_INGESTION={"MAX_BYTES": 1024, "RETRIES": 2, "BACKOFF": 0,
+                      "CONNECT_TIMEOUT": 1, "READ_TIMEOUT": 1},
+)
+class AvatarIngestionTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), AvatarHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.media_root = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        AvatarIngestionService._session = None
+        AvatarHandler.flaky_calls = 0
+
+    def test_download_sniffs_image_type(self):
+        data, ext = AvatarIngestionService.download(f"{self.base_url}/avatar.png")
+        self.assertEqual((data, ext), (PNG, "png"))
+
+    def test_download_rejects_oversized_and_non_images(self):
+        for path in ("/large.png", "/unsized.png", "/page", "/fake.png", "/missing.png"):
+            with self.subTest(path=path), self.assertRaises(AvatarDownloadError):
+                AvatarIngestionService.download(f"{self.base_url}{path}")
+
+    def test_download_retries_server_errors(self):
+        data, _ = AvatarIngestionService.download(f"{self.base_url}/flaky.png")
+        self.assertEqual(data, PNG)
+        self.assertEqual(AvatarHandler.flaky_calls, 2)
+
+    @mock.patch("authentication.services.avatar_service.CacheAside")
+    def test_ingest_updates_profile(self, cache_aside):
+        user = User.objects.create(username="alice")
+        url = f"{self.base_url}/avatar.png"
+        UserProfile.objects.create(user=user, pending_picture_url=url)
+
+        with self.settings(MEDIA_ROOT=self.media_root):
+            self.assertTrue(AvatarIngestionService.ingest(user.id, url))
+            # 이미 반영된 URL 은 다시 내려받지 않는다.
+            self.assertFalse(AvatarIngestionService.ingest(user.id, url))
+
+            profile = UserProfile.objects.get(user=user)
+            self.assertIsNone(profile.pending_picture_url)
+            self.assertTrue(profile.profile_picture.name.endswith(".png"))
+            with profile.profile_picture.open("rb") as f:
+                self.assertEqual(f.read(), PNG)
+        self.assertEqual(OutboxEvent.objects.get().payload["type"], "updated")
+        self.assertEqual(cache_aside.delete.call_count, 2)
+
+    def test_schedule_runs_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            AvatarIngestionService.schedule(1, f"{self.base_url}/avatar.png")
+        self.assertEqual(len(callbacks), 1)
+
+    def test_failed_ingest_keeps_only_retryable_urls_pending(self):
+        user = User.objects.create(username="bob")
+        unreachable = "http://127.0.0.1:9/avatar.png"
+        UserProfile.objects.create(user=user, pending_picture_url=unreachable)
+        self.assertFalse(AvatarIngestionService.ingest(user.id, unreachable))
+        self.assertEqual(UserProfile.objects.get(user=user).pending_picture_url, unreachable)
+
+        page = f"{self.base_url}/page"
+        UserProfile.objects.filter(user=user).update(pending_picture_url=page)
+        self.assertFalse(AvatarIngestionService.ingest(user.id, page))
+        self.assertIsNone(UserProfile.objects.get(user=user).pending_picture_url)
+
+    def test_pending_url_is_requeued_on_login(self):
+        user = User.objects.create(username="carol")
+        UserProfile.objects.create(user=user)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertFalse(AvatarIngestionService.requeue_pending(user.id))
+        self.assertEqual(callbacks, [])
+
+        UserProfile.objects.filter(user=user).update(
+            pending_picture_url=f"{self.base_url}/avatar.png")
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertTrue(AvatarIngestionService.requeue_pending(user.id))
+        self.assertEqual(len(callbacks), 1)
+
+    @mock.patch("authentication.services.avatar_service.CacheAside")
+    def test_command_drains_pending_urls(self, cache_aside):
+        for name in ("dave", "erin"):
+            user = User.objects.create(username=name)
+            UserProfile.objects.create(user=user, pending_picture_url=f"{self.base_url}/avatar.png")
+
+        out = io.StringIO()
+        with self.settings(MEDIA_ROOT=self.media_root):
+            call_command("ingest_pending_avatars", stdout=out)
+        self.assertIn("ingested=2 failed=0 pending=0", out.getvalue())
+
+
+class InlineExecutor:
+
+    def submit(self, func, *args):
+        func(*args)
+
+
+@override_settings(KAFKA_DEFAULT_TOPIC="user-profile")
+class AvatarSignupScheduleTest(FakeRedisMixin, TransactionTestCase):
+
+    def test_ingestion_runs_after_the_pending_url_is_saved(self):
+        # user_signed_up 은 트랜잭션 밖에서 오므로 on_commit 이 바로 실행될 수 있다.
+        user = User.objects.create(username="frank", email="frank@example.com")
+        social_login = mock.Mock()
+        social_login.account.uid = "social-frank"
+        social_login.account.extra_data = {"picture": "https://cdn.example.com/frank.png"}
+        seen = []
+
+        def ingest(user_id, url):
+            seen.append(UserProfile.objects.get(user_id=user_id).pending_picture_url)
+
+        with mock.patch.object(AvatarIngestionService, "ingest", side_effect=ingest), \
+                mock.patch("authentication.utils.background.get_executor", return_value=InlineExecutor()):
+            populate_user_profile_on_signup(request=None, user=user, sociallogin=social_login)
+
+        self.assertEqual(seen, ["https://cdn.example.com/frank.png"])
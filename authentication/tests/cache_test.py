@@ -0,0 +1,222 @@
+import io
+import time
+import uuid
+import threading
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from ..utils.cache import NEGATIVE, CacheAside, CachedValue, LocalCache
+from ..utils.cache_keys import CacheNamespace
+from ..utils.codecs import JsonCodec, MsgpackCodec
+from .fake_redis import FakeRedisMixin
+
+
+class CacheAsideSingleFlightTest(FakeRedisMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.calls = 0
+        self.calls_lock = threading.Lock()
+
+    def loader(self, value="fresh", delay=0.0):
+        def load():
+            with self.calls_lock:
+                self.calls += 1
+            time.sleep(delay)
+            return {"value": value}
+        return load
+
+    def test_loader_runs_once_under_concurrency(self):
+        loader = self.loader(delay=0.2)
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(CacheAside.get_or_compute("single-flight", loader))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [{"value": "fresh"}] * 8)
+        self.assertFalse(self.redis.exists(CacheAside._lock_key("single-flight")))
+
+    def test_waiter_computes_after_lock_expires(self):
+        # 락을 잡은 요청이 값을 쓰지 못하고 죽은 경우: 락이 만료되면 대기하던 요청이 직접 계산한다.
+        self.redis.set(CacheAside._lock_key("orphaned"), "dead-holder", px=200)
+        started = time.monotonic()
+
+        self.assertEqual(CacheAside.get_or_compute("orphaned", self.loader()), {"value": "fresh"})
+        self.assertEqual(self.calls, 1)
+        self.assertLess(time.monotonic() - started, CacheAside.LOCK_WAIT_TIMEOUT)
+        self.assertEqual(CacheAside.get("orphaned"), {"value": "fresh"})
+
+    def test_waiter_computes_after_wait_timeout(self):
+        self.redis.set(CacheAside._lock_key("stuck"), "slow-holder", ex=60)
+        with mock.patch.object(CacheAside, "LOCK_WAIT_TIMEOUT", 0.2):
+            self.assertEqual(CacheAside.get_or_compute("stuck", self.loader()), {"value": "fresh"})
+        self.assertEqual(self.calls, 1)
+
+    def test_early_refresh_near_expiry(self):
+        CacheAside.set("xfetch", {"value": "stale"}, timeout=60, delta=30.0)
+
+        # 만료까지 멀면 갱신하지 않는다.
+        with mock.patch("authentication.utils.cache.random.random", return_value=0.5):
+            self.assertEqual(CacheAside.get_or_compute("xfetch", self.loader()), {"value": "stale"})
+        self.assertEqual(self.calls, 0)
+
+        # -log(1 - r) 가 커지는 r 에서는 만료 전이라도 한 요청이 미리 갱신한다.
+        with mock.patch("authentication.utils.cache.random.random", return_value=0.999999):
+            self.redis.set(CacheAside._lock_key("xfetch"), "other", ex=60)
+            self.assertEqual(CacheAside.get_or_compute("xfetch", self.loader()), {"value": "stale"})
+            self.assertEqual(self.calls, 0)
+
+            self.redis.delete(CacheAside._lock_key("xfetch"))
+            self.assertEqual(CacheAside.get_or_compute("xfetch", self.loader()), {"value": "fresh"})
+        self.assertEqual(self.calls, 1)
+
+
+class CacheAsideLocalTierTest(FakeRedisMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # 테스트마다 채널을 달리해 이전 테스트의 구독 스레드와 섞이지 않게 한다.
+        self.channel = f"cache-aside:invalidate:{uuid.uuid4().hex}"
+        settings = self.settings(CACHE_ASIDE_L1={"ENABLED": True, "MAX_ENTRIES": 2, "TTL": 30,
+                                                 "CHANNEL": self.channel})
+        settings.enable()
+        self.addCleanup(settings.disable)
+        CacheAside._local = None
+        self.addCleanup(setattr, CacheAside, "_local", None)
+        self.local = CacheAside.get_local()
+        self.wait_until(lambda: self.redis.pubsub_numsub(self.channel)[0][1] == 1)
+
+    def wait_until(self, condition, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail("조건을 기다리다 시간 초과")
+            time.sleep(0.01)
+
+    def test_l1_serves_reads_without_redis(self):
+        CacheAside.set("profile:1", {"name": "alice"})
+        before = CacheAside.stats()
+
+        self.redis.delete(CacheAside._redis_key("profile:1"))
+        self.assertEqual(CacheAside.get("profile:1"), {"name": "alice"})
+        self.assertIsNone(CacheAside.get("profile:2"))
+
+        after = CacheAside.stats()
+        self.assertEqual(after["l1_hits"] - before["l1_hits"], 1)
+        self.assertEqual(after["l1_misses"] - before["l1_misses"], 1)
+        self.assertEqual(after["l2_misses"] - before["l2_misses"], 1)
+
+    def test_l2_hit_fills_l1(self):
+        CacheAside.set("profile:1", {"name": "alice"})
+        self.local.clear()
+
+        self.assertEqual(CacheAside.get("profile:1"), {"name": "alice"})
+        self.assertTrue(self.local.get("profile:1")[0])
+
+    def test_invalidation_from_another_process_evicts_l1(self):
+        CacheAside.set("profile:1", {"name": "alice"})
+        CacheAside.set("profile:2", {"name": "bob"})
+
+        # 다른 워커가 L2 값을 바꾸고 무효화를 보낸다. (자기 자신이 보낸 무효화는 무시한다)
+        self.redis.set(CacheAside._redis_key("profile:1"), CacheAside._pack(
+            CacheAside._encode({"name": "alice2"}), 0.0, time.time() + 60))
+        self.redis.publish(self.channel, f"{CacheAside._origin}:profile:2")
+        self.redis.publish(self.channel, "other-worker:profile:1")
+        self.wait_until(lambda: not self.local.get("profile:1")[0])
+        self.assertTrue(self.local.get("profile:2")[0])
+
+        self.assertEqual(CacheAside.get("profile:1"), {"name": "alice2"})
+
+    def test_local_cache_is_bounded_and_expires(self):
+        local = LocalCache(max_entries=2, ttl=30)
+        for key in ("a", "b", "c"):
+            local.set(key, key)
+        self.assertEqual(len(local), 2)
+        self.assertFalse(local.get("a")[0])
+
+        with mock.patch("authentication.utils.cache.time.monotonic", return_value=time.monotonic() + 31):
+            self.assertEqual(local.get("b"), (False, None))
+
+
+class CacheFrameTest(SimpleTestCase):
+
+    def test_frames_round_trip_for_each_codec(self):
+        for codec in (JsonCodec, MsgpackCodec):
+            with self.subTest(codec=codec.name):
+                cached = CachedValue(codec.dumps({"name": "alice", "tags": [1, 2]}), codec)
+                frame = CacheAside._pack(cached, 1.5, 1234.0)
+
+                value, delta, expires_at = CacheAside._unpack(frame)
+                self.assertEqual((delta, expires_at), (1.5, 1234.0))
+                self.assertEqual(value.body, cached.body)
+                self.assertEqual(value.etag, cached.etag)
+                self.assertEqual(value.content_type, codec.content_type)
+                self.assertEqual(value.decode(), {"name": "alice", "tags": [1, 2]})
+
+        value, _, _ = CacheAside._unpack(CacheAside._pack(NEGATIVE, 0.0, 1.0))
+        self.assertTrue(value.is_negative)
+
+    def test_corrupt_frame_is_a_miss(self):
+        frame = CacheAside._pack(CachedValue(JsonCodec.dumps({"name": "alice"}), JsonCodec), 0.0, 1.0)
+
+        self.assertIsNone(CacheAside._unpack(frame[:-1] + b"X")[0])
+        self.assertIsNone(CacheAside._unpack(frame[:-1])[0])
+        self.assertIsNone(CacheAside._unpack(frame[:10])[0])
+
+
+class CacheNamespaceTest(FakeRedisMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.namespace = self.register(CacheNamespace("test_ns", version=1))
+
+    def register(self, namespace):
+        self.addCleanup(CacheNamespace.registry.pop, namespace.name, None)
+        return namespace
+
+    def test_version_bump_misses_old_keys(self):
+        CacheAside.set(self.namespace.key(1), {"shape": "old"})
+        self.assertEqual(CacheAside.get(self.namespace.key(1)), {"shape": "old"})
+
+        bumped = self.register(CacheNamespace("test_ns", version=2))
+        self.assertEqual(bumped.key(1), "test_ns:v2:g0:1")
+        self.assertIsNone(CacheAside.get(bumped.key(1)))
+
+    def test_invalidate_all_misses_every_key_in_the_namespace(self):
+        other = self.register(CacheNamespace("other_ns", version=1))
+        for entity_id in (1, 2):
+            CacheAside.set(self.namespace.key(entity_id), {"id": entity_id})
+        CacheAside.set(other.key(1), {"id": 1})
+
+        out = io.StringIO()
+        call_command("invalidate_cache_namespace", "test_ns", stdout=out)
+        self.assertIn("test_ns: v1 g1", out.getvalue())
+
+        self.assertEqual(self.namespace.key(1), "test_ns:v1:g1:1")
+        self.assertIsNone(CacheAside.get(self.namespace.key(1)))
+        self.assertIsNone(CacheAside.get(self.namespace.key(2)))
+        self.assertEqual(CacheAside.get(other.key(1)), {"id": 1})
+
+    def test_generation_is_cached_until_forgotten(self):
+        self.assertEqual(self.namespace.generation(), 0)
+        # 다른 프로세스가 세대를 올려도 잠시 동안은 들고 있는 값을 쓴다.
+        self.redis.incr(self.namespace.generation_key)
+        self.assertEqual(self.namespace.generation(), 0)
+
+        self.namespace.forget_generation()
+        self.assertEqual(self.namespace.generation(), 1)
+
+    def test_unknown_namespace_is_rejected(self):
+        with self.assertRaises(CommandError):
+            call_command("invalidate_cache_namespace", "missing", stdout=io.StringIO())
@@ -0,0 +1,82 @@
+from django.test import SimpleTestCase
+
+from ..clients.event_codec import (
+    JsonEventCodec,
+    MsgpackEventCodec,
+    Schema,
+    SchemaError,
+    SchemaRegistry,
+    decode_event,
+    encode_event,
+    get_registry,
+)
+from ..serializers.user_profile_serializer import UserProfileSerializer
+
+PROFILE = {
+    "id": 7,
+    "username": "alice",
+    "email": "alice@example.com",
+    "name": "앨리스",
+    "bio": None,
+    "location": "Seoul",
+    "profile_picture": None,
+    "uid": "1234567890",
+    "profile_picture_variants": {"64": {"webp": "/media/auth/a_64.webp", "jpeg": "/media/auth/a_64.jpg"}},
+}
+
+V1_FIELDS = [
+    {"name": "id", "type": "int"},
+    {"name": "name", "type": "string", "nullable": True},
+]
+
+
+class SchemaRegistryTest(SimpleTestCase):
+
+    def test_registered_schemas_are_compatible(self):
+        self.assertEqual(get_registry().check_compatibility(), [])
+
+    def test_user_profile_schema_matches_serializer(self):
+        schema = get_registry().latest("user-profile")
+        self.assertEqual(schema.field_names, list(
+            UserProfileSerializer.Meta.fields))
+
+    def test_incompatible_changes_are_reported(self):
+        old = Schema("s", 1, 100, V1_FIELDS)
+        removed = Schema("s", 2, 101, V1_FIELDS[:1])
+        retyped = Schema("s", 2, 102, [V1_FIELDS[0], {"name": "name", "type": "int"}])
+        required = Schema("s", 2, 103, V1_FIELDS + [{"name": "age", "type": "int"}])
+        appended = Schema("s", 2, 104, V1_FIELDS + [{"name": "age", "type": "int", "default": 0}])
+
+        for new in (removed, retyped, required):
+            self.assertTrue(SchemaRegistry.compatibility_errors(old, new), new.fields)
+        self.assertEqual(SchemaRegistry.compatibility_errors(old, appended), [])
+
+
+class EventCodecTest(SimpleTestCase):
+
+    def test_msgpack_round_trip(self):
+        data, headers = encode_event("user-profile", PROFILE, codec=MsgpackEventCodec)
+
+        self.assertEqual(headers["schema"], "user-profile-v2")
+        self.assertEqual(headers["content-type"], MsgpackEventCodec.content_type)
+        self.assertEqual(decode_event(data, headers["content-type"]), PROFILE)
+        self.assertLess(len(data), len(JsonEventCodec.encode(None, PROFILE)))
+
+    def test_unknown_subject_falls_back_to_json(self):
+        data, headers = encode_event("unknown", {"a": 1}, codec=MsgpackEventCodec)
+        self.assertEqual(headers["content-type"], JsonEventCodec.content_type)
+        self.assertEqual(decode_event(data, headers["content-type"]), {"a": 1})
+
+    def test_encode_rejects_fields_missing_from_schema(self):
+        schema = get_registry().latest("user-profile")
+        with self.assertRaises(SchemaError):
+            MsgpackEventCodec.encode(schema, {**PROFILE, "extra": 1})
+
+    def test_old_and_new_versions_read_each_other(self):
+        v1 = Schema("s", 1, 100, V1_FIELDS)
+        v2 = Schema("s", 2, 101, V1_FIELDS + [{"name": "age", "type": "int", "default": 0}])
+
+        self.assertEqual(v2.from_row(v1.to_row({"id": 1, "name": "a"})),
+                         {"id": 1, "name": "a", "age": 0})
+        self.assertEqual(v1.from_row(v2.to_row({"id": 1, "name": "a", "age": 3})),
+                         {"id": 1, "name": "a"})
@@ -0,0 +1,38 @@
+import fakeredis
+from django_redis import get_redis_connection
+
+from ..utils.cache_keys import CacheNamespace
+
+# 테스트 전체가 하나의 서버를 공유하고, 테스트마다 비운다.
+# (RefreshTokenStore 등이 클래스에 보관하는 Lua 스크립트가 처음 연결에 묶여 있어도 같은 서버를 보도록)
+FAKE_REDIS_SERVER = fakeredis.FakeServer()
+
+FAKE_REDIS_CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": "redis://fakeredis:6379/0",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "CONNECTION_POOL_KWARGS": {
+                "connection_class": fakeredis.FakeRedisConnection,
+                "server": FAKE_REDIS_SERVER,
+            },
+        },
+    }
+}
+
+
+class FakeRedisMixin:
+    """
+    기본 캐시/get_redis_connection 을 fakeredis(Lua 지원)로 바꿉니다.
+    """
+
+    def setUp(self):
+        super().setUp()
+        settings = self.settings(CACHES=FAKE_REDIS_CACHES)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.redis = get_redis_connection("default")
+        self.redis.flushall()
+        for namespace in CacheNamespace.registry.values():
+            namespace.forget_generation()
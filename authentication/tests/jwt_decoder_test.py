@@ -0,0 +1,69 @@
+import time
+from unittest import mock
+
+import jwt
+from django.test import SimpleTestCase, RequestFactory
+
+from ..utils.jwt_decoder import JWTVerifier, extract_uid_from_token
+from ..utils.jwt_keys import Keyring
+
+SECRET = "test-secret-key-test-secret-key-0123"
+
+
+def make_token(exp_in=300, **claims):
+    return jwt.encode({"uid": "42", "exp": int(time.time()) + exp_in, **claims},
+                      SECRET, algorithm="HS256")
+
+
+class JWTVerifierTest(SimpleTestCase):
+
+    def test_verified_tokens_are_cached_until_exp(self):
+        verifier = JWTVerifier(SECRET)
+        token = make_token()
+
+        with mock.patch.object(verifier._jwt, "decode", wraps=verifier._jwt.decode) as decode:
+            self.assertEqual(verifier.verify(token)["uid"], "42")
+            self.assertEqual(verifier.verify(token)["uid"], "42")
+            self.assertEqual(decode.call_count, 1)
+
+            # exp 가 지난 항목은 버리고 다시 디코딩한다.
+            with mock.patch("authentication.utils.jwt_decoder.time.time",
+                            return_value=time.time() + 301):
+                verifier.verify(token)
+            self.assertEqual(decode.call_count, 2)
+
+    def test_lru_is_bounded(self):
+        verifier = JWTVerifier(SECRET, max_entries=2)
+        for i in range(5):
+            verifier.verify(make_token(user_id=i))
+        self.assertEqual(len(verifier._cache), 2)
+
+    def test_audience_and_issuer_are_checked(self):
+        verifier = JWTVerifier(SECRET, audience="textneck", issuer="auth")
+        verifier.verify(make_token(aud="textneck", iss="auth"))
+
+        for claims in ({"aud": "other", "iss": "auth"}, {"aud": "textneck", "iss": "other"}):
+            with self.assertRaises(jwt.InvalidTokenError):
+                verifier.verify(make_token(**claims))
+
+    def test_extract_uid_from_token(self):
+        factory = RequestFactory()
+        with self.settings(SIMPLE_JWT={"SIGNING_KEY": SECRET, "ALGORITHM": "HS256"}):
+            request = factory.get("/", HTTP_AUTHORIZATION=f"Bearer {make_token()}")
+            self.assertEqual(extract_uid_from_token(request), "42")
+
+            request = factory.get("/", HTTP_AUTHORIZATION="Bearer not-a-token")
+            self.assertIsNone(extract_uid_from_token(request))
+
+    def test_unknown_kid_is_an_invalid_token(self):
+        token = jwt.encode({"uid": "42", "exp": int(time.time()) + 300}, SECRET,
+                           algorithm="HS256", headers={"kid": "retired"})
+        verifier = JWTVerifier(SECRET, keyring=lambda: Keyring([]))
+        with self.assertRaises(jwt.InvalidTokenError):
+            verifier.verify(token)
+        with self.assertRaises(jwt.InvalidTokenError):
+            JWTVerifier(None).verify(make_token())
+
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        with mock.patch("authentication.utils.jwt_decoder.get_verifier", return_value=verifier):
+            self.assertIsNone(extract_uid_from_token(request))
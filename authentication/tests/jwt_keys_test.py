@@ -0,0 +1,74 @@
+import io
+import os
+import shutil
+import tempfile
+
+import jwt
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework_simplejwt.exceptions import TokenError
+
+from ..utils.jwt_decoder import JWTVerifier
+from ..utils.jwt_keys import get_keyring
+from ..utils.tokens import AccessToken, RefreshToken
+
+User = get_user_model()
+
+
+class KeyringTest(TestCase):
+
+    def setUp(self):
+        self.key_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.key_dir, ignore_errors=True)
+        self.path = os.path.join(self.key_dir, "keyring.json")
+        settings = self.settings(JWT_KEYRING={
+            "FILE": self.path, "RELOAD_INTERVAL": 0, "PUBLISH_AHEAD": None,
+            "ACCEPT_UNKEYED": False, "JWKS_MAX_AGE": 600,
+        })
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.user = User.objects.create(username="alice")
+
+    def rotate(self, algorithm="RS256", publish_ahead=3600):
+        call_command("rotate_jwt_keys", algorithm=algorithm, publish_ahead=publish_ahead,
+                     stdout=io.StringIO())
+
+    def test_tokens_are_signed_with_kid_and_verified_by_kid(self):
+        self.rotate("EdDSA")
+        refresh = RefreshToken.for_user(self.user)
+        access = str(refresh.access_token)
+
+        header = jwt.get_unverified_header(access)
+        self.assertEqual(header["alg"], "EdDSA")
+        self.assertEqual(header["kid"], get_keyring().signing_key().kid)
+        self.assertEqual(AccessToken(access)["user_id"], str(self.user.id))
+        self.assertEqual(JWTVerifier.from_settings().verify(access)["user_id"], str(self.user.id))
+
+        unknown = jwt.encode({"user_id": "1"}, "x" * 32, algorithm="HS256", headers={"kid": "nope"})
+        with self.assertRaises(TokenError):
+            AccessToken(unknown)
+
+    def test_rotation_publishes_ahead_and_keeps_old_key_for_verification(self):
+        self.rotate()
+        old_token = str(RefreshToken.for_user(self.user).access_token)
+        old_kid = get_keyring().signing_key().kid
+
+        self.rotate()
+        keyring = get_keyring()
+        new_key = keyring.keys[-1]
+        self.assertEqual(keyring.signing_key().kid, old_kid)
+        self.assertEqual(keyring.signing_key(now=new_key.active_from).kid, new_key.kid)
+        self.assertEqual(AccessToken(old_token)["user_id"], str(self.user.id))
+
+        response = self.client.get("/.well-known/jwks.json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({key["kid"] for key in response.json()["keys"]}, {old_kid, new_key.kid})
+        self.assertIn("max-age=600", response["Cache-Control"])
+
+        response = self.client.get("/.well-known/jwks.json", headers={"If-None-Match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    def test_jwks_is_not_found_without_keyring(self):
+        with self.settings(JWT_KEYRING={"FILE": None}):
+            self.assertEqual(self.client.get("/.well-known/jwks.json").status_code, 404)
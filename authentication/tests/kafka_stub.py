@@ -0,0 +1,54 @@
+class StubMessage:
+    def __init__(self, topic, key, value, headers):
+        self._topic = topic
+        self._key = key
+        self._value = value
+        self._headers = headers
+
+    def topic(self):
+        return self._topic
+
+    def key(self):
+        return self._key
+
+    def value(self):
+        return self._value
+
+    def headers(self):
+        return self._headers
+
+    def latency(self):
+        return 0.02
+
+
+class StubProducer:
+    """
+    confluent_kafka.Producer 대신 쓰는 로컬 프로듀서. flush 시점에 delivery 콜백을 호출합니다.
+    """
+
+    def __init__(self, fail_keys=(), capacity=None, on_flush=None):
+        self.fail_keys = set(fail_keys)
+        self.capacity = capacity
+        self.on_flush = on_flush
+        self.pending = []
+        self.messages = []
+        self.flushes = 0
+
+    def produce(self, topic, key=None, value=None, headers=None, on_delivery=None):
+        if self.capacity is not None and len(self.pending) >= self.capacity:
+            raise BufferError("Local: Queue full")
+        self.pending.append(
+            (StubMessage(topic, key, value, headers), on_delivery))
+
+    def flush(self, timeout=None):
+        self.flushes += 1
+        if self.on_flush is not None:
+            self.on_flush()
+        for msg, on_delivery in self.pending:
+            if msg.key() in self.fail_keys:
+                on_delivery("broker unavailable", msg)
+            else:
+                self.messages.append(msg)
+                on_delivery(None, msg)
+        self.pending = []
+        return 0
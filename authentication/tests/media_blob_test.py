@@ -0,0 +1,107 @@
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from django.test import TestCase
+
+from ..models import MediaBlob, UserProfile
+from ..services.media_blob_service import MediaBlobService
+from ..services.user_profile_service import UserProfileService
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+
+
+class MediaBlobServiceTest(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = self.settings(MEDIA_ROOT=self.media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.storage = MediaBlobService.storage()
+
+    def expire(self, name):
+        MediaBlob.objects.filter(name=name).update(
+            unreferenced_at=timezone.now() - timedelta(hours=2))
+
+    def store(self, data, ext=None):
+        name = MediaBlobService.store(data, ext)
+        MediaBlobService.acquire(name)
+        return name
+
+    def test_identical_content_is_stored_once(self):
+        first = self.store(PNG, "jpg")
+        second = self.store(PNG)
+
+        self.assertEqual(first, second)
+        self.assertTrue(first.endswith(".png"))
+        self.assertEqual(MediaBlob.objects.get(name=first).ref_count, 2)
+        self.assertTrue(self.storage.exists(first))
+
+    def test_unsniffed_content_keeps_first_extension(self):
+        bitmap = b"BM" + b"\x00" * 32
+        first = self.store(bitmap, "bmp")
+        second = self.store(bitmap, "dib")
+
+        self.assertEqual(first, second)
+        self.assertTrue(first.endswith(".bmp"))
+        self.assertEqual(MediaBlob.objects.get().ref_count, 2)
+
+    def test_blob_of_rolled_back_update_is_collected(self):
+        profile = UserProfile.objects.create(user=get_user_model().objects.create(username="rollback"))
+        upload = SimpleUploadedFile("avatar.png", PNG, content_type="image/png")
+
+        with mock.patch("authentication.services.user_profile_service.ProfileEventService"
+                        ".profile_updated", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                UserProfileService.update_user_profile(profile, {"profile_picture": upload})
+
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob.ref_count, 0)
+        self.assertTrue(self.storage.exists(blob.name))
+        self.expire(blob.name)
+        self.assertEqual(MediaBlobService.sweep(), 1)
+        self.assertFalse(self.storage.exists(blob.name))
+
+    def test_unreferenced_blob_and_variants_are_swept(self):
+        name = self.store(PNG)
+        variant = MediaBlobService.variant_names(name)[0]
+        self.storage.save(variant, ContentFile(b"v"))
+
+        MediaBlobService.release(name)
+        self.assertEqual(MediaBlobService.sweep(), 0)  # 유예 시간 안
+
+        self.expire(name)
+        self.assertEqual(MediaBlobService.sweep(), 1)
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(self.storage.exists(variant))
+        self.assertFalse(MediaBlob.objects.exists())
+
+    def test_rereferenced_blob_is_kept(self):
+        name = self.store(PNG)
+        MediaBlobService.release(name)
+        self.expire(name)
+        # 다시 저장하면 acquire() 전에도 유예 시간이 새로 시작된다.
+        MediaBlobService.store(PNG)
+
+        self.assertEqual(MediaBlobService.sweep(), 0)
+        self.assertTrue(self.storage.exists(name))
+
+    def test_legacy_file_is_collected(self):
+        name = self.storage.save("profile_pictures/1_avatar.jpg", ContentFile(b"x"))
+        MediaBlobService.release(name)
+        self.expire(name)
+
+        call_command("gc_media_blobs", "--dry-run", stdout=io.StringIO())
+        self.assertTrue(self.storage.exists(name))
+        call_command("gc_media_blobs", stdout=io.StringIO())
+        self.assertFalse(self.storage.exists(name))
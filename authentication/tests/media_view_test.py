@@ -0,0 +1,71 @@
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.test import TestCase
+
+from ..services.media_blob_service import MediaBlobService
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(32))
+
+
+class MediaViewTest(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = self.settings(MEDIA_ROOT=self.media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.name = MediaBlobService.store(PNG)
+        self.url = f"/media/auth/{self.name}"
+
+    def test_content_addressed_file_is_immutable(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), PNG)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+        response = self.client.get(self.url, headers={"If-None-Match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    def test_legacy_file_uses_short_cache(self):
+        name = MediaBlobService.storage().save("profile_pictures/1_avatar.png", ContentFile(PNG))
+        response = self.client.get(f"/media/auth/{name}")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("immutable", response["Cache-Control"])
+        response = self.client.get(
+            f"/media/auth/{name}", headers={"If-Modified-Since": response["Last-Modified"]})
+        self.assertEqual(response.status_code, 304)
+
+    def test_range_requests(self):
+        response = self.client.get(self.url, headers={"Range": "bytes=8-11"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), PNG[8:12])
+        self.assertEqual(response["Content-Range"], f"bytes 8-11/{len(PNG)}")
+
+        response = self.client.get(self.url, headers={"Range": "bytes=-4"})
+        self.assertEqual(b"".join(response.streaming_content), PNG[-4:])
+
+        response = self.client.get(self.url, headers={"Range": "bytes=8-", "If-Range": '"stale"'})
+        self.assertEqual(response.status_code, 200)
+        response.close()
+
+        response = self.client.get(self.url, headers={"Range": f"bytes={len(PNG)}-"})
+        self.assertEqual(response.status_code, 416)
+
+    def test_sendfile_handoff(self):
+        with self.settings(MEDIA_SERVING={
+            "SENDFILE": "nginx", "INTERNAL_URL": "/internal/", "ALLOWED_PREFIXES": ("profile_pictures/",), "MAX_AGE": 0,
+        }):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Accel-Redirect"], f"/internal/{self.name}")
+        self.assertEqual(response.content, b"")
+
+    def test_paths_outside_allowed_prefixes_are_not_served(self):
+        for path in ("../etc/passwd", "profile_pictures/../../secret", "other/file.png", "profile_pictures/none.png"):
+            self.assertEqual(self.client.get(f"/media/auth/{path}").status_code, 404, path)
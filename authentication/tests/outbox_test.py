@@ -0,0 +1,161 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from prometheus_client import REGISTRY
+
+from ..models import OutboxEvent, UserProfile
+from ..services.outbox_service import OutboxService
+from ..signals.user_profile_signal import populate_user_profile_on_signup
+from .kafka_stub import StubProducer
+
+User = get_user_model()
+
+
+@override_settings(KAFKA_DEFAULT_TOPIC="user-profile")
+class OutboxTest(TestCase):
+
+    def test_signup_writes_outbox_event_with_profile(self):
+        user = User.objects.create(
+            username="alice", first_name="Alice", last_name="Kim")
+
+        populate_user_profile_on_signup(request=None, user=user)
+
+        event = OutboxEvent.objects.get()
+        self.assertEqual(event.topic, "user-profile")
+        self.assertEqual(event.key, str(user.id))
+        self.assertEqual(event.schema, "user-profile")
+        self.assertEqual(event.payload["name"], "KimAlice")
+        self.assertTrue(UserProfile.objects.filter(user=user).exists())
+
+    def test_rolled_back_transaction_leaves_no_event(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                OutboxService.enqueue("user-profile", 1, {"id": 1})
+                raise RuntimeError
+
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_relay_publishes_in_order_and_deletes_delivered(self):
+        events = [OutboxService.enqueue("user-profile", user_id, {"id": user_id})
+                  for user_id in (3, 1, 2)]
+        producer = StubProducer()
+
+        sent, failed = OutboxService.relay_batch(producer, batch_size=2)
+
+        self.assertEqual((sent, failed), (2, 0))
+        self.assertEqual([msg.key() for msg in producer.messages], [b"3", b"1"])
+        self.assertEqual(
+            dict(producer.messages[0].headers())["event-id"],
+            str(events[0].event_id).encode("utf-8"))
+        self.assertEqual(
+            list(OutboxEvent.objects.values_list("key", flat=True)), ["2"])
+
+    def test_relay_keeps_undelivered_events_for_retry(self):
+        OutboxService.enqueue("user-profile", 1, {"id": 1})
+        OutboxService.enqueue("user-profile", 2, {"id": 2})
+
+        sent, failed = OutboxService.relay_batch(
+            StubProducer(fail_keys={b"2"}))
+        self.assertEqual((sent, failed), (1, 1))
+        self.assertEqual(
+            list(OutboxEvent.objects.values_list("key", flat=True)), ["2"])
+
+        producer = StubProducer()
+        OutboxService.relay_batch(producer)
+        self.assertEqual([msg.key() for msg in producer.messages], [b"2"])
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_failed_event_holds_back_later_events_for_its_key(self):
+        OutboxService.enqueue("user-profile", 1, {"id": 1, "event": "updated"})
+        OutboxService.enqueue("user-profile", 2, {"id": 2})
+        OutboxService.enqueue("user-profile", 1, {"id": 1, "event": "deleted"})
+
+        producer = StubProducer(fail_keys={b"1"})
+        self.assertEqual(OutboxService.relay_batch(producer), (1, 1))
+        # 같은 키의 삭제 이벤트가 실패한 수정 이벤트를 앞지르지 않는다.
+        self.assertEqual([msg.key() for msg in producer.messages], [b"2"])
+        self.assertEqual(OutboxEvent.objects.filter(key="1").count(), 2)
+
+        producer = StubProducer()
+        self.assertEqual(OutboxService.relay_batch(producer), (2, 0))
+        self.assertEqual([msg.key() for msg in producer.messages], [b"1", b"1"])
+        self.assertEqual(producer.flushes, 2)
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_buffer_full_stops_the_batch(self):
+        for user_id in (1, 2, 3):
+            OutboxService.enqueue("user-profile", user_id, {"id": user_id})
+
+        producer = StubProducer(capacity=2)
+        self.assertEqual(OutboxService.relay_batch(producer), (2, 0))
+        self.assertEqual(list(OutboxEvent.objects.values_list("key", flat=True)), ["3"])
+
+    @override_settings(KAFKA_PRODUCER_CONFIG={"enable.idempotence": False})
+    def test_relay_requires_idempotent_producer(self):
+        with self.assertRaises(CommandError):
+            call_command("relay_outbox_events", once=True)
+
+    def test_unencodable_event_is_parked_and_the_rest_delivered(self):
+        OutboxService.enqueue("user-profile", 1, {"id": 1, "username": "alice"}, schema="user-profile")
+        bad = OutboxService.enqueue(
+            "user-profile", 2, {"id": 2, "username": "bob", "unknown": True}, schema="user-profile")
+
+        producer = StubProducer()
+        self.assertEqual(OutboxService.relay_batch(producer), (1, 1))
+        self.assertEqual([msg.key() for msg in producer.messages], [b"1"])
+
+        bad.refresh_from_db()
+        self.assertIsNotNone(bad.failed_at)
+        self.assertIn("unknown", bad.last_error)
+
+        # 보류된 이벤트는 다시 집어 가지 않는다.
+        producer = StubProducer()
+        self.assertEqual(OutboxService.relay_batch(producer), (0, 0))
+        self.assertEqual(producer.messages, [])
+        self.assertEqual(list(OutboxEvent.objects.values_list("id", flat=True)), [bad.id])
+
+    def test_delivery_reports_feed_counters_and_latency_histogram(self):
+        def sample(name, result):
+            return REGISTRY.get_sample_value(name, {"result": result}) or 0
+
+        before = (sample("kafka_client_messages_total", "delivered"),
+                  sample("kafka_client_messages_total", "failed"),
+                  sample("kafka_client_delivery_latency_seconds_count", "delivered"))
+        OutboxService.enqueue("user-profile", 1, {"id": 1})
+        OutboxService.enqueue("user-profile", 2, {"id": 2})
+
+        OutboxService.relay_batch(StubProducer(fail_keys={b"2"}))
+        self.assertEqual(sample("kafka_client_messages_total", "delivered"), before[0] + 1)
+        self.assertEqual(sample("kafka_client_messages_total", "failed"), before[1] + 1)
+        self.assertEqual(sample("kafka_client_delivery_latency_seconds_count", "delivered"), before[2] + 1)
+
+    def test_events_are_leased_while_publishing(self):
+        OutboxService.enqueue("user-profile", 1, {"id": 1})
+        OutboxService.enqueue("user-profile", 2, {"id": 2})
+        claimed_meanwhile = []
+
+        def concurrent_relay():
+            # flush 중에 다른 릴레이가 돌아도 같은 이벤트(와 같은 키의 새 이벤트)를 집어 가지 않는다.
+            OutboxService.enqueue("user-profile", 1, {"id": 1, "event": "later"})
+            claimed_meanwhile.extend(OutboxService.claim(10, 60))
+
+        producer = StubProducer(fail_keys={b"2"}, on_flush=concurrent_relay)
+        self.assertEqual(OutboxService.relay_batch(producer, batch_size=2), (1, 1))
+        self.assertEqual(claimed_meanwhile, [])
+
+        # 실패한 이벤트는 임대가 풀려 바로 다시 발행된다.
+        self.assertFalse(OutboxEvent.objects.filter(leased_until__isnull=False).exists())
+        self.assertEqual([event.key for event in OutboxService.claim(10, 60)], ["2", "1"])
+
+    def test_expired_lease_is_reclaimed(self):
+        event = OutboxService.enqueue("user-profile", 1, {"id": 1})
+        self.assertEqual(OutboxService.claim(10, 60), [event])
+        self.assertEqual(OutboxService.claim(10, 60), [])
+
+        OutboxEvent.objects.update(leased_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(OutboxService.relay_batch(StubProducer()), (1, 0))
+        self.assertFalse(OutboxEvent.objects.exists())
@@ -0,0 +1,78 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase
+
+from ..models import UserProfile
+from ..serializers.user_profile_serializer import UserProfileSerializer
+from ..services.picture_variant_service import ProfilePictureVariantService
+from ..utils.images import VARIANT_SIZES, generate_variants
+
+User = get_user_model()
+
+
+def make_jpeg(size=(400, 300)) -> bytes:
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"  # Make
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(buffer, "JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+class GenerateVariantsTest(SimpleTestCase):
+
+    def test_variants_are_square_and_stripped(self):
+        variants = generate_variants(io.BytesIO(make_jpeg()))
+
+        self.assertEqual(sorted(variants), list(VARIANT_SIZES))
+        for size, formats in variants.items():
+            self.assertEqual(set(formats), {"webp", "jpeg"})
+            for ext, data in formats.values():
+                with Image.open(io.BytesIO(data)) as image:
+                    self.assertEqual(image.size, (size, size))
+                    self.assertFalse(image.getexif())
+
+    def test_small_images_are_not_upscaled(self):
+        variants = generate_variants(io.BytesIO(make_jpeg((50, 80))))
+        self.assertEqual(sorted(variants), [32])
+
+
+@mock.patch("authentication.services.picture_variant_service.CacheAside")
+class ProfilePictureVariantServiceTest(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings = self.settings(MEDIA_ROOT=self.media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.profile = UserProfile.objects.create(
+            user=User.objects.create(username="alice"))
+        self.profile.profile_picture.save("1_avatar.jpg", ContentFile(make_jpeg()))
+
+    def test_generate_records_variants(self, cache_aside):
+        name = self.profile.profile_picture.name
+        self.assertTrue(ProfilePictureVariantService.generate(self.profile.id, name))
+
+        self.profile.refresh_from_db()
+        data = UserProfileSerializer(self.profile).data
+        self.assertEqual(set(data["profile_picture_variants"]), {str(s) for s in VARIANT_SIZES})
+        self.assertTrue(data["profile_picture_variants"]["64"]["webp"].endswith(".webp"))
+        for formats in self.profile.picture_variants.values():
+            for path in formats.values():
+                self.assertTrue(self.profile.profile_picture.storage.exists(path))
+        self.assertEqual(cache_aside.delete.call_count, 2)
+
+    def test_generate_skips_replaced_picture(self, cache_aside):
+        self.assertFalse(ProfilePictureVariantService.generate(
+            self.profile.id, "profile_pictures/other.jpg"))
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.picture_variants, {})
+        cache_aside.delete.assert_not_called()
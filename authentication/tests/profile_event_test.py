@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..models import OutboxEvent, UserProfile
+from ..services.outbox_service import OutboxService
+from ..services.user_profile_service import UserProfileService
+from .outbox_test import StubProducer
+
+User = get_user_model()
+
+
+@override_settings(KAFKA_DEFAULT_TOPIC="user-profile", PROFILE_EVENT_DEBOUNCE_SECONDS=60)
+class ProfileEventTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(username="alice")
+        self.profile = UserProfile.objects.create(
+            user=self.user, name="Alice", location="Seoul")
+
+    def update(self, **data):
+        UserProfileService.update_user_profile(self.profile, data)
+
+    def release(self):
+        OutboxEvent.objects.update(available_at=timezone.now())
+
+    def test_burst_of_updates_is_coalesced_into_one_event(self):
+        self.update(name="Alice Kim")
+        self.update(name="Alice Lee", location="Busan")
+        self.update(location="Busan")
+
+        self.assertEqual(OutboxService.relay_batch(StubProducer()), (0, 0))
+
+        event = OutboxEvent.objects.get()
+        self.assertEqual(event.key, str(self.user.id))
+        self.assertEqual(event.payload["type"], "updated")
+        self.assertEqual(event.payload["changes"], {
+            "name": {"old": "Alice", "new": "Alice Lee"},
+            "location": {"old": "Seoul", "new": "Busan"},
+        })
+
+        self.release()
+        self.assertEqual(OutboxService.relay_batch(StubProducer()), (1, 0))
+
+    def test_reverted_update_emits_nothing(self):
+        self.update(name="Bob")
+        self.update(name="Alice")
+
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_delete_is_published_after_pending_update(self):
+        self.update(name="Bob")
+        UserProfileService.delete_user_profile(self.profile, self.user.id)
+
+        producer = StubProducer()
+        self.assertEqual(OutboxService.relay_batch(producer), (2, 0))
+        self.assertEqual(
+            [dict(msg.headers())["schema"] for msg in producer.messages],
+            [b"user-profile-change-v1", b"user-profile-change-v1"])
+        self.assertFalse(OutboxEvent.objects.exists())
@@ -0,0 +1,30 @@
+import io
+import uuid
+import datetime
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from ..utils.renderers import ORJSONParser, ORJSONRenderer
+
+
+class ORJSONRendererTest(SimpleTestCase):
+
+    def test_output_matches_drf_json_renderer(self):
+        data = {
+            "created_at": datetime.datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            "naive": datetime.datetime(2026, 10, 18, 9, 30, 15, 123456),
+            "date": datetime.date(2026, 10, 18),
+            "time": datetime.time(9, 30, 15, 500000),
+            "duration": datetime.timedelta(minutes=5),
+            "amount": Decimal("12.30"),
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "name": "코기 ",
+            "nested": [{"n": 1, "ok": True, "none": None}],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_parser_round_trips_rendered_output(self):
+        body = ORJSONRenderer().render({"name": "alice", "n": [1, 2]})
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), {"name": "alice", "n": [1, 2]})
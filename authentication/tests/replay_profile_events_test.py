@@ -0,0 +1,79 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from ..management.commands.replay_profile_events import decode_resume_token, encode_resume_token
+from ..models import UserProfile
+from .kafka_stub import StubProducer
+
+User = get_user_model()
+
+
+@override_settings(KAFKA_DEFAULT_TOPIC="user-profile")
+class ReplayProfileEventsTest(TestCase):
+
+    def setUp(self):
+        self.profiles = [
+            UserProfile.objects.create(user=User.objects.create(username=f"user{i}"), name=f"user{i}")
+            for i in range(5)]
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        self.state_file = os.path.join(tmp_dir, "replay.state")
+
+    def replay(self, producer, *args):
+        out = io.StringIO()
+        with mock.patch("authentication.clients.kafka_client.KafkaClient.get_producer",
+                        return_value=producer):
+            call_command("replay_profile_events", "--batch-size", "2", *args, stdout=out)
+        return out.getvalue()
+
+    def sent_user_ids(self, producer):
+        return [int(msg.key()) for msg in producer.messages]
+
+    def test_pages_through_all_profiles_in_id_order(self):
+        producer = StubProducer()
+        out = self.replay(producer)
+
+        self.assertEqual(self.sent_user_ids(producer), [profile.user_id for profile in self.profiles])
+        self.assertEqual(producer.flushes, 3)
+        self.assertEqual(dict(producer.messages[0].headers())["replay"], b"1")
+        self.assertIn(f"sent=5 resume={encode_resume_token(self.profiles[-1].id)}", out)
+
+    def test_resume_token_and_state_file_continue_after_last_page(self):
+        self.assertEqual(decode_resume_token(encode_resume_token(42)), 42)
+        with self.assertRaises(CommandError):
+            decode_resume_token("not-a-token")
+
+        producer = StubProducer()
+        self.replay(producer, "--resume", encode_resume_token(self.profiles[1].id))
+        self.assertEqual(self.sent_user_ids(producer), [profile.user_id for profile in self.profiles[2:]])
+
+        self.replay(StubProducer(), "--state-file", self.state_file)
+        with open(self.state_file) as f:
+            self.assertEqual(decode_resume_token(f.read()), self.profiles[-1].id)
+
+        # 상태 파일이 있으면 거기서 이어가므로 다시 보낼 것이 없다.
+        producer = StubProducer()
+        self.assertIn("sent=0", self.replay(producer, "--state-file", self.state_file))
+        self.assertEqual(producer.messages, [])
+
+    def test_failed_batch_reports_token_of_previous_page(self):
+        # 두 번째 페이지(3, 4번째 프로필)가 실패한다.
+        producer = StubProducer(fail_keys={str(self.profiles[3].user_id).encode()})
+        with self.assertRaises(CommandError) as raised:
+            self.replay(producer, "--state-file", self.state_file)
+
+        previous_page = encode_resume_token(self.profiles[1].id)
+        self.assertIn(f"--resume {previous_page}", str(raised.exception))
+        with open(self.state_file) as f:
+            self.assertEqual(f.read(), previous_page)
+
+        producer = StubProducer()
+        self.replay(producer, "--resume", previous_page)
+        self.assertEqual(self.sent_user_ids(producer), [profile.user_id for profile in self.profiles[2:]])
@@ -0,0 +1,93 @@
+import struct
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..utils.revocation_filter import RevocationFilter, family_entry, user_entry
+
+BITS, HASHES = 1024, 4
+
+
+def bitmap(*entries) -> bytes:
+    data = bytearray(BITS // 8)
+    for entry in entries:
+        for position in RevocationFilter.positions(entry, BITS, HASHES):
+            data[position >> 3] |= 1 << (7 - (position & 7))
+    return bytes(data)
+
+
+class RevocationFilterTest(SimpleTestCase):
+
+    def setUp(self):
+        settings = self.settings(REVOCATION_FILTER={
+            "BITS": BITS, "HASHES": HASHES, "BUCKET_SECONDS": 300, "REFRESH_INTERVAL": 0})
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.filter = RevocationFilter()
+
+    def test_only_filter_hits_are_confirmed_in_redis(self):
+        fetch = mock.patch.object(
+            RevocationFilter, "_fetch", return_value=(10, {10: (1, bitmap(family_entry("fam-1")))}))
+        revoked_at = mock.patch.object(RevocationFilter, "revoked_at", return_value=[1000])
+        with fetch, revoked_at as exact:
+            self.assertFalse(self.filter.is_revoked(7, "fam-2", issued_at=900))
+            exact.assert_not_called()
+
+            self.assertTrue(self.filter.is_revoked(7, "fam-1", issued_at=900))
+            self.assertTrue(self.filter.is_revoked(7, "fam-1", issued_at=999))
+            # 무효화와 같은 초, 또는 그 이후에 발급된 토큰은 통과
+            self.assertFalse(self.filter.is_revoked(7, "fam-1", issued_at=1000))
+            self.assertFalse(self.filter.is_revoked(7, "fam-1", issued_at=1001))
+            self.assertEqual(exact.call_args.args[0], [family_entry("fam-1")])
+
+    def test_old_buckets_are_dropped_and_unchanged_buckets_kept(self):
+        with mock.patch.object(RevocationFilter, "_fetch", return_value=(10, {
+                9: (1, bitmap(user_entry(1))), 10: (1, bitmap(user_entry(2)))})):
+            self.filter.refresh()
+        with mock.patch.object(RevocationFilter, "_fetch", return_value=(11, {})) as fetch:
+            self.filter.refresh()
+        self.assertEqual(fetch.call_args.args[0], {9: 1, 10: 1})
+        self.assertFalse(self.filter.might_contain(user_entry(1)))
+        with mock.patch.object(RevocationFilter, "_fetch", return_value=(11, {})):
+            self.assertTrue(self.filter.might_contain(user_entry(2)))
+
+    def test_blob_contains_only_changed_buckets(self):
+        bits = bitmap(user_entry(3))
+        with mock.patch.object(RevocationFilter, "_fetch", return_value=(10, {10: (4, bits)})):
+            blob, changed = RevocationFilter.blob({9: 2})
+
+        self.assertTrue(changed)
+        magic, _, hashes, _, size, width, current, count = struct.unpack_from("!4sBBHIIQH", blob)
+        self.assertEqual((magic, hashes, size, width, current, count), (b"RVKF", HASHES, BITS, 300, 10, 1))
+        offset = struct.calcsize("!4sBBHIIQH")
+        bucket, version = struct.unpack_from("!QQ", blob, offset)
+        self.assertEqual((bucket, version), (10, 4))
+        self.assertEqual(blob[offset + 16:], bits)
+
+
+class RevocationFilterViewTest(SimpleTestCase):
+    url = "/auth/v2/revocations/filter/"
+
+    def setUp(self):
+        settings = self.settings(REVOCATION_FILTER={
+            "BITS": BITS, "HASHES": HASHES, "BUCKET_SECONDS": 300, "REFRESH_INTERVAL": 0,
+            "GATEWAY_TOKENS": ["old-secret", "gateway-secret"]})
+        settings.enable()
+        self.addCleanup(settings.disable)
+        fetch = mock.patch.object(RevocationFilter, "_fetch", return_value=(10, {10: (1, bitmap(user_entry(1)))}))
+        fetch.start()
+        self.addCleanup(fetch.stop)
+
+    def test_only_gateways_receive_the_filter(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.assertEqual(self.client.get(self.url, HTTP_X_GATEWAY_TOKEN="guess").status_code, 403)
+
+        response = self.client.get(self.url, HTTP_X_GATEWAY_TOKEN="gateway-secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content[:4], b"RVKF")
+        self.assertEqual(self.client.get(self.url, HTTP_X_GATEWAY_TOKEN="old-secret").status_code, 200)
+
+    def test_filter_is_closed_without_configured_gateways(self):
+        with self.settings(REVOCATION_FILTER={
+                "BITS": BITS, "HASHES": HASHES, "BUCKET_SECONDS": 300, "REFRESH_INTERVAL": 0}):
+            self.assertEqual(self.client.get(self.url, HTTP_X_GATEWAY_TOKEN="").status_code, 403)
@@ -0,0 +1,80 @@
+import io
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from ..services.token_prune_service import TokenPruneService
+
+
+class LegacyTokenTablesTest(TestCase):
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE token_blacklist_outstandingtoken "
+                "(id integer PRIMARY KEY, jti varchar(255), expires_at datetime)")
+            cursor.execute(
+                "CREATE TABLE token_blacklist_blacklistedtoken (id integer PRIMARY KEY, token_id integer)")
+            now = timezone.now()
+            for token_id, jti, expires_at, blacklisted in (
+                (1, "live", now + timedelta(hours=1), True),
+                (2, "expired", now - timedelta(hours=1), True),
+                (3, "outstanding", now + timedelta(hours=1), False),
+                (4, "live-2", now + timedelta(hours=2), True),
+            ):
+                cursor.execute(
+                    "INSERT INTO token_blacklist_outstandingtoken VALUES (%s, %s, %s)",
+                    [token_id, jti, connection.ops.adapt_datetimefield_value(expires_at)])
+                if blacklisted:
+                    cursor.execute(
+                        "INSERT INTO token_blacklist_blacklistedtoken (token_id) VALUES (%s)", [token_id])
+
+    @mock.patch("authentication.management.commands.migrate_token_blacklist.TokenBlacklist")
+    def test_only_live_blacklisted_tokens_are_migrated(self, blacklist):
+        blacklist.add_many.side_effect = len
+        out = io.StringIO()
+        call_command("migrate_token_blacklist", batch_size=1, stdout=out)
+
+        migrated = [entry for call in blacklist.add_many.call_args_list for entry in call.args[0]]
+        self.assertEqual([jti for jti, _ in migrated], ["live", "live-2"])
+        self.assertAlmostEqual(migrated[0][1], timezone.now().timestamp() + 3600, delta=5)
+        self.assertIn("migrated=2", out.getvalue())
+
+    def test_prune_deletes_only_expired_rows_in_chunks(self):
+        progress = []
+        self.assertEqual(TokenPruneService.prune_legacy_tables(
+            chunk_size=1, sleep=0, progress=progress.append), 1)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT jti FROM token_blacklist_outstandingtoken ORDER BY id")
+            self.assertEqual([row[0] for row in cursor.fetchall()], ["live", "outstanding", "live-2"])
+            cursor.execute("SELECT token_id FROM token_blacklist_blacklistedtoken ORDER BY token_id")
+            self.assertEqual([row[0] for row in cursor.fetchall()], [1, 4])
+        self.assertTrue(progress)
+
+    def test_prune_pages_through_expired_rows_by_id(self):
+        with connection.cursor() as cursor:
+            expired = connection.ops.adapt_datetimefield_value(timezone.now() - timedelta(minutes=5))
+            for token_id in range(10, 14):
+                cursor.execute("INSERT INTO token_blacklist_outstandingtoken VALUES (%s, %s, %s)",
+                               [token_id, f"old-{token_id}", expired])
+        progress = []
+
+        with mock.patch("authentication.services.token_prune_service.time.sleep") as sleep:
+            self.assertEqual(TokenPruneService.prune_legacy_tables(
+                chunk_size=2, sleep=0.5, progress=progress.append), 5)
+
+        # 만료된 5행을 id 순서로 2개씩 지우고, 덜 찬 마지막 chunk 뒤에는 쉬지 않는다.
+        self.assertEqual(progress, [
+            "outstanding_token deleted=2 last_id=10",
+            "outstanding_token deleted=4 last_id=12",
+            "outstanding_token deleted=5 last_id=13",
+        ])
+        self.assertEqual(sleep.call_count, 2)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM token_blacklist_outstandingtoken")
+            self.assertEqual(cursor.fetchone()[0], 3)
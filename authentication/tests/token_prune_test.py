@@ -0,0 +1,90 @@
+import io
+import time
+import threading
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from ..services.token_prune_service import REDIS_KEY_PREFIXES, TokenPruneService
+from .fake_redis import FakeRedisMixin
+
+User = get_user_model()
+
+
+class OrphanedRefreshKeyTest(FakeRedisMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username="alive")
+        self.deleted_id = self.user.id + 1000
+        for prefix in REDIS_KEY_PREFIXES:
+            for user_id in (self.user.id, self.deleted_id):
+                self.redis.set(cache.make_key(f"{prefix}{user_id}:jti"), 1)
+        self.redis.set(cache.make_key("refresh_token:not-a-user"), 1)
+
+    def remaining(self):
+        return sorted(key.decode() for key in self.redis.scan_iter(match=cache.make_key("refresh*")))
+
+    def test_only_keys_of_deleted_users_are_removed(self):
+        self.assertEqual(TokenPruneService.sweep_orphaned_keys(scan_count=1, sleep=0), len(REDIS_KEY_PREFIXES))
+        self.assertEqual(self.remaining(), sorted(
+            [cache.make_key(f"{prefix}{self.user.id}:jti") for prefix in REDIS_KEY_PREFIXES]
+            + [cache.make_key("refresh_token:not-a-user")]))
+
+    def test_command_sweeps_in_scan_batches(self):
+        out = io.StringIO()
+        call_command("prune_token_state", "--skip-tables", "--scan-count", "2", "--sleep", "0", stdout=out)
+
+        self.assertIn(f"redis_key={len(REDIS_KEY_PREFIXES)}", out.getvalue())
+        self.assertIn("redis_key prefix=refresh_token:", out.getvalue())
+        self.assertFalse(any(f":{self.deleted_id}:" in key for key in self.remaining()))
+
+
+class ScheduledPruneLockTest(FakeRedisMixin, SimpleTestCase):
+
+    def test_lock_lets_only_one_concurrent_run_through(self):
+        barrier = threading.Barrier(4)
+        results = []
+
+        def slow_run():
+            time.sleep(0.1)
+            return {"redis_key": 0}
+
+        def worker():
+            barrier.wait()
+            results.append(TokenPruneService.run_scheduled())
+
+        with mock.patch.object(TokenPruneService, "run", side_effect=slow_run) as run:
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(run.call_count, 1)
+        self.assertEqual(results.count(None), 3)
+        # 잠금은 다음 주기 전에 풀린다.
+        self.assertLess(self.redis.ttl(cache.make_key("token_prune:lock")),
+                        TokenPruneService.options()["SCHEDULE_INTERVAL"])
+
+
+class TokenPruneSchedulerStartupTest(SimpleTestCase):
+
+    def ready_with_argv(self, argv):
+        with mock.patch("authentication.apps.sys.argv", argv), \
+                mock.patch("authentication.apps._start_token_pruning") as start:
+            apps.get_app_config("authentication").ready()
+        return start.called
+
+    def test_scheduler_starts_once_at_startup_outside_management_commands(self):
+        self.assertTrue(self.ready_with_argv(["uwsgi", "--ini", "uwsgi.ini"]))
+        self.assertTrue(self.ready_with_argv(["manage.py", "runserver"]))
+        self.assertFalse(self.ready_with_argv(["manage.py", "migrate"]))
+        self.assertFalse(self.ready_with_argv(["/usr/bin/django-admin", "relay_outbox_events"]))
+
+        with self.settings(TOKEN_PRUNING={**TokenPruneService.options(), "SCHEDULE_INTERVAL": 0}):
+            self.assertFalse(self.ready_with_argv(["uwsgi"]))
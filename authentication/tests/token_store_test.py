@@ -0,0 +1,234 @@
+import io
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..services.access_token_service import SocialAuthService
+from ..utils.revocation_filter import RevocationFilter, family_entry
+from ..utils.token_blacklist import TokenBlacklist
+from ..utils.token_store import RefreshTokenStore
+from ..utils.tokens import RefreshToken
+from .fake_redis import FakeRedisMixin
+
+User = get_user_model()
+TTL = 3600
+
+
+class RefreshTokenRotationTest(FakeRedisMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username="rotation", email="rotation@example.com")
+        RefreshTokenStore.save(self.user.id, "jti-1", "fam", "token-1", TTL)
+
+    def rotate(self, old_jti, new_jti, old_token, new_token):
+        return RefreshTokenStore.rotate(
+            self.user.id, old_jti, new_jti, "fam", new_token, TTL,
+            old_digest=RefreshTokenStore.token_digest(old_token))
+
+    def test_concurrent_reuse_within_grace_keeps_family(self):
+        self.assertEqual(self.rotate("jti-1", "jti-2", "token-1", "token-2"), RefreshTokenStore.ROTATED)
+        # 다른 탭이 같은 쿠키로 곧바로 갱신
+        self.assertEqual(self.rotate("jti-1", "jti-3", "token-1", "token-3"), RefreshTokenStore.RACED)
+        self.assertEqual(RefreshTokenStore.revoke_family_if_rotated(self.user.id, "jti-1", "fam"),
+                         RefreshTokenStore.RACED)
+
+        self.assertEqual(self.rotate("jti-2", "jti-4", "token-2", "token-4"), RefreshTokenStore.ROTATED)
+        self.assertEqual(self.redis.zrange(RefreshTokenStore.index_key(self.user.id), 0, -1), [b"jti-4"])
+
+    def test_reuse_after_grace_revokes_family(self):
+        self.assertEqual(self.rotate("jti-1", "jti-2", "token-1", "token-2"), RefreshTokenStore.ROTATED)
+        with self.settings(REFRESH_TOKEN_ROTATION={"REUSE_GRACE_SECONDS": -1}):
+            self.assertEqual(self.rotate("jti-1", "jti-3", "token-1", "token-3"), RefreshTokenStore.REUSED)
+
+        self.assertFalse(self.redis.exists(RefreshTokenStore.token_key(self.user.id, "jti-2")))
+        self.assertEqual(self.redis.zcard(RefreshTokenStore.index_key(self.user.id)), 0)
+        self.assertEqual(self.rotate("jti-2", "jti-5", "token-2", "token-5"), RefreshTokenStore.MISSING)
+
+
+class RefreshViewRaceTest(FakeRedisMixin, TestCase):
+    url = "/auth/v2/access-token/refresh/"
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username="tabs", email="tabs@example.com")
+        _, cookie = SocialAuthService.obtain_jwt_for_social_user(self.user)
+        self.refresh_token = cookie["value"]
+
+    def refresh(self, token):
+        self.client.cookies["refresh_token"] = token
+        return self.client.post(self.url)
+
+    def test_second_tab_gets_conflict_and_first_tab_token_survives(self):
+        first = self.refresh(self.refresh_token)
+        self.assertEqual(first.status_code, 200)
+        new_token = first.cookies["refresh_token"].value
+
+        second = self.refresh(self.refresh_token)
+        self.assertEqual(second.status_code, 409)
+        self.assertNotIn("refresh_token", second.cookies)
+
+        self.assertFalse(TokenBlacklist.contains(RefreshToken(new_token)["jti"]))
+        self.assertEqual(self.refresh(new_token).status_code, 200)
+
+    def test_blacklist_is_written_only_after_rotation(self):
+        with mock.patch.object(RefreshTokenStore, "rotate", return_value=RefreshTokenStore.RACED):
+            self.assertEqual(self.refresh(self.refresh_token).status_code, 409)
+        self.assertFalse(TokenBlacklist.contains(RefreshToken(self.refresh_token)["jti"]))
+
+        self.assertEqual(self.refresh(self.refresh_token).status_code, 200)
+        self.assertTrue(TokenBlacklist.contains(RefreshToken(self.refresh_token, verify=False)["jti"]))
+
+
+    def family_revoked(self):
+        family = RefreshToken(self.refresh_token, verify=False)["fam"]
+        return RevocationFilter.revoked_at([family_entry(family)])[0] is not None
+
+    def test_reuse_after_grace_revokes_family_access_tokens(self):
+        self.assertEqual(self.refresh(self.refresh_token).status_code, 200)
+        self.assertFalse(self.family_revoked())
+
+        with self.settings(REFRESH_TOKEN_ROTATION={"REUSE_GRACE_SECONDS": -1}):
+            self.assertEqual(self.refresh(self.refresh_token).status_code, 401)
+        self.assertTrue(self.family_revoked())
+
+    def test_reuse_detected_during_rotation_revokes_family_access_tokens(self):
+        with mock.patch.object(RefreshTokenStore, "rotate", return_value=RefreshTokenStore.REUSED):
+            self.assertEqual(self.refresh(self.refresh_token).status_code, 401)
+        self.assertTrue(self.family_revoked())
+
+    def test_refresh_for_deleted_user_is_unauthorized(self):
+        self.user.delete()
+        response = self.refresh(self.refresh_token)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["detail"], "주어진 토큰에 해당하는 활성 계정이 없습니다.")
+
+
+class RefreshSessionIndexTest(FakeRedisMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username="sessions", email="sessions@example.com")
+        self.index_key = RefreshTokenStore.index_key(self.user.id)
+
+    def issue(self, device):
+        response_data, cookie = SocialAuthService.obtain_jwt_for_social_user(self.user, device=device)
+        return response_data["access"], cookie["value"]
+
+    def indexed(self):
+        return [jti.decode() for jti in self.redis.zrange(self.index_key, 0, -1)]
+
+    def test_index_follows_issue_rotate_and_revoke(self):
+        _, laptop = self.issue("laptop")
+        _, phone = self.issue("phone")
+        laptop_jti, phone_jti = RefreshToken(laptop)["jti"], RefreshToken(phone)["jti"]
+        self.assertCountEqual(self.indexed(), [laptop_jti, phone_jti])
+        self.assertEqual(self.redis.zscore(self.index_key, laptop_jti), RefreshToken(laptop)["exp"])
+
+        RefreshTokenStore.rotate(self.user.id, laptop_jti, "laptop-2", RefreshToken(laptop)["fam"],
+                                 "laptop-token-2", TTL, old_digest=RefreshTokenStore.token_digest(laptop))
+        self.assertCountEqual(self.indexed(), ["laptop-2", phone_jti])
+        # 회전된 레코드는 기존 기기 정보를 이어받는다.
+        self.assertEqual(self.redis.hget(RefreshTokenStore.token_key(self.user.id, "laptop-2"), "d"), b"laptop")
+
+        self.assertEqual(RefreshTokenStore.revoke(self.user.id, phone_jti), 1)
+        self.assertEqual(self.indexed(), ["laptop-2"])
+
+    def test_expired_entries_are_pruned(self):
+        self.redis.zadd(self.index_key, {"expired": 1})
+        self.issue("laptop")
+        self.assertNotIn("expired", self.indexed())
+
+        self.redis.zadd(self.index_key, {"expired": 1})
+        sessions = RefreshTokenStore.list_sessions(self.user.id)
+        self.assertEqual([session["device"] for session in sessions], ["laptop"])
+        self.assertNotIn("expired", self.indexed())
+
+    def test_revoke_all_deletes_only_live_tokens(self):
+        self.issue("laptop")
+        self.issue("phone")
+        self.redis.zadd(self.index_key, {"expired": 1})
+        self.redis.hset(RefreshTokenStore.token_key(self.user.id, "expired"), "h", "x")
+
+        self.assertEqual(RefreshTokenStore.revoke_all(self.user.id), 2)
+        self.assertFalse(self.redis.exists(self.index_key))
+        self.assertEqual(list(self.redis.scan_iter(RefreshTokenStore.token_key(self.user.id, "*"))),
+                         [RefreshTokenStore.token_key(self.user.id, "expired").encode()])
+
+    def test_session_list_and_revoke_all_endpoints(self):
+        self.issue("laptop")
+        access, phone = self.issue("phone")
+        self.client.cookies["refresh_token"] = phone
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {access}"}
+
+        response = self.client.get("/auth/v2/refresh-token/sessions/", **auth)
+        self.assertEqual(response.status_code, 200)
+        sessions = {session["device"]: session for session in response.json()["sessions"]}
+        self.assertEqual(set(sessions), {"laptop", "phone"})
+        self.assertTrue(sessions["phone"]["current"])
+        self.assertFalse(sessions["laptop"]["current"])
+
+        response = self.client.delete("/auth/v2/refresh-token/revoke-all/", **auth)
+        self.assertEqual(response.json()["revoked"], 2)
+        self.assertEqual(RefreshTokenStore.list_sessions(self.user.id), [])
+        self.client.cookies["refresh_token"] = phone
+        self.assertEqual(self.client.post("/auth/v2/access-token/refresh/").status_code, 401)
+
+
+class LegacyRefreshTokenRecordTest(FakeRedisMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username="legacy", email="legacy@example.com")
+
+    def legacy_token(self, pickled: bool) -> RefreshToken:
+        token = RefreshToken.for_user(self.user)
+        name = f"refresh_token:{self.user.id}:{token['jti']}"
+        if pickled:
+            cache.set(name, str(token), TTL)
+        else:
+            self.redis.set(cache.make_key(name), str(token), ex=TTL)
+        return token
+
+    def test_converted_legacy_keys_rotate_and_reject_digest_mismatch(self):
+        pickled, raw = self.legacy_token(pickled=True), self.legacy_token(pickled=False)
+        out = io.StringIO()
+        call_command("migrate_refresh_token_records", stdout=out)
+        self.assertIn("converted=2", out.getvalue())
+
+        for token in (pickled, raw):
+            key = RefreshTokenStore.token_key(self.user.id, token["jti"])
+            record = self.redis.hgetall(key)
+            self.assertEqual(record[b"h"], RefreshTokenStore.token_digest(str(token)))
+            self.assertEqual(int(record[b"e"]), token["exp"])
+            self.assertGreater(self.redis.ttl(key), 0)
+            self.assertEqual(self.redis.zscore(RefreshTokenStore.index_key(self.user.id), token["jti"]),
+                             token["exp"])
+
+        # 다른 토큰 원문으로는 회전할 수 없다.
+        self.assertEqual(RefreshTokenStore.rotate(
+            self.user.id, raw["jti"], "raw-2", raw["jti"], "raw-token-2", TTL,
+            old_digest=RefreshTokenStore.token_digest(str(pickled))), RefreshTokenStore.MISSING)
+        self.assertTrue(self.redis.exists(RefreshTokenStore.token_key(self.user.id, raw["jti"])))
+
+        self.assertEqual(RefreshTokenStore.rotate(
+            self.user.id, pickled["jti"], "pickled-2", pickled["jti"], "pickled-token-2", TTL,
+            old_digest=RefreshTokenStore.token_digest(str(pickled))), RefreshTokenStore.ROTATED)
+
+        # 이미 변환된 키는 다시 실행해도 건너뛴다.
+        out = io.StringIO()
+        call_command("migrate_refresh_token_records", stdout=out)
+        self.assertIn("converted=0", out.getvalue())
+
+    def test_unconverted_legacy_key_rotates_without_digest(self):
+        token = self.legacy_token(pickled=False)
+        self.assertEqual(RefreshTokenStore.rotate(
+            self.user.id, token["jti"], "next", token["jti"], "next-token", TTL,
+            old_digest=b"unknown", device="phone"), RefreshTokenStore.ROTATED)
+
+        record = self.redis.hgetall(RefreshTokenStore.token_key(self.user.id, "next"))
+        self.assertEqual(record[b"h"], RefreshTokenStore.token_digest("next-token"))
+        self.assertEqual(record[b"d"], b"phone")
@@ -1,3 +1,125 @@
-from django.test import TestCase
+from allauth.socialaccount.models import SocialAccount
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from ..models import UserProfile
+from ..services.access_token_service import SocialAuthService
+from ..services.user_profile_service import UserProfileService
+from ..utils.cache import CacheAside
+from ..utils.cache_keys import USER_PROFILE
+from .fake_redis import FakeRedisMixin
+
+User = get_user_model()
+
+
+@override_settings(KAFKA_DEFAULT_TOPIC="user-profile")
+class UserProfileMeTest(FakeRedisMixin, TestCase):
+    url = "/auth/v2/profile/me/"
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username="me", email="me@example.com")
+        self.profile = UserProfile.objects.create(user=self.user, name="Me")
+        response_data, _ = SocialAuthService.obtain_jwt_for_social_user(self.user)
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {response_data['access']}"}
+
+    def test_cached_read_runs_no_queries(self):
+        self.assertEqual(self.client.get(self.url, **self.auth).status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, **self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["name"], "Me")
+
+    def test_if_none_match_returns_not_modified(self):
+        etag = self.client.get(self.url, **self.auth)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, **self.auth)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+        response = self.client.put(self.url, {"name": "Renamed"}, content_type="application/json", **self.auth)
+        self.assertNotEqual(response["ETag"], etag)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, **self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["name"], "Renamed")
+
+    def test_unknown_frame_is_a_miss(self):
+        self.redis.set(CacheAside._redis_key(USER_PROFILE.key(self.user.id)), b"\x01garbage")
+        self.assertEqual(self.client.get(self.url, **self.auth).json()["name"], "Me")
+
+    def test_social_uid_change_invalidates_cached_profile(self):
+        response = self.client.get(self.url, **self.auth)
+        self.assertIsNone(response.json()["uid"])
+        etag = response["ETag"]
+
+        account = SocialAccount.objects.create(user=self.user, provider="google", uid="google-1")
+        with self.captureOnCommitCallbacks(execute=True):
+            UserProfileService.sync_social_uid(self.user)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, **self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["uid"], "google-1")
+
+        account.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            UserProfileService.sync_social_uid(self.user)
+        self.assertIsNone(self.client.get(self.url, **self.auth).json()["uid"])
+
+    def test_unchanged_uid_keeps_cached_profile(self):
+        SocialAccount.objects.create(user=self.user, provider="google", uid="google-1")
+        with self.captureOnCommitCallbacks(execute=True):
+            UserProfileService.sync_social_uid(self.user)
+        etag = self.client.get(self.url, **self.auth)["ETag"]
+
+        # 같은 uid 로 다시 로그인하면 프로필을 쓰지 않고 캐시도 그대로 둔다.
+        with self.captureOnCommitCallbacks() as callbacks, self.assertNumQueries(2):
+            UserProfileService.sync_social_uid(self.user)
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, **self.auth).status_code, 304)
+
+
+class UserProfileBatchTest(FakeRedisMixin, TestCase):
+    url = "/auth/v2/profiles/"
+
+    def setUp(self):
+        super().setUp()
+        self.caller = User.objects.create(username="caller", email="caller@example.com")
+        response_data, _ = SocialAuthService.obtain_jwt_for_social_user(self.caller)
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {response_data['access']}"}
+
+    def lookup(self, *user_ids, host="auth.example.com"):
+        response = self.client.get(self.url, {"ids": ",".join(map(str, user_ids))},
+                                   HTTP_HOST=host, **self.auth)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"]
+
+    def test_new_profile_replaces_negative_entry(self):
+        user = User.objects.create(username="new", email="new@example.com")
+        self.assertEqual(self.lookup(user.id), [None])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserProfile.objects.create(user=user, name="New")
+        self.assertEqual(self.lookup(user.id)[0]["name"], "New")
+
+    def test_cached_urls_do_not_depend_on_host(self):
+        user = User.objects.create(username="pictured", email="pictured@example.com")
+        UserProfile.objects.create(
+            user=user, profile_picture="profile_pictures/ab/abcd.png",
+            picture_variants={"64": {"webp": "profile_pictures/ab/abcd_64.webp"}})
+
+        first = self.lookup(user.id, host="internal.local")[0]
+        self.assertEqual(first["profile_picture"], "/media/auth/profile_pictures/ab/abcd.png")
+        self.assertEqual(first["profile_picture_variants"]["64"]["webp"],
+                         "/media/auth/profile_pictures/ab/abcd_64.webp")
+        self.assertEqual(self.lookup(user.id, host="public.example.com")[0], first)
+
+    def test_public_base_url(self):
+        user = User.objects.create(username="based", email="based@example.com")
+        UserProfile.objects.create(user=user, profile_picture="profile_pictures/ab/abcd.png")
+        media_serving = dict(settings.MEDIA_SERVING, PUBLIC_BASE_URL="https://cdn.example.com")
+        with self.settings(MEDIA_SERVING=media_serving):
+            self.assertEqual(self.lookup(user.id)[0]["profile_picture"],
+                             "https://cdn.example.com/media/auth/profile_pictures/ab/abcd.png")
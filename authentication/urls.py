@@ -3,6 +3,8 @@ from .routers import (
     access_token_router,
     refresh_token_router,
     user_profile_router,
+    user_profile_batch_router,
+    revocation_router,
 )
 
 
@@ -11,4 +13,6 @@ urlpatterns = [
          include(access_token_router)),
     path('refresh-token/', include(refresh_token_router)),
     path('profile/', include(user_profile_router)),
+    path('profiles/', include(user_profile_batch_router)),
+    path('revocations/', include(revocation_router)),
 ]
@@ -0,0 +1,28 @@
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .revocation_filter import get_revocation_filter
+from .token_store import FAMILY_CLAIM
+
+
+class RevocationCheckMixin:
+    """
+    서명/만료 검증을 통과한 액세스 토큰이 무효화된 패밀리나 유저의 것인지 프로세스 안의 Bloom filter 로 확인합니다.
+    필터에 걸린 경우에만 Redis 에서 정확히 확인합니다.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if get_revocation_filter().is_revoked(
+                token.get(api_settings.USER_ID_CLAIM), token.get(FAMILY_CLAIM), token.get('iat')):
+            raise InvalidToken("무효화된 토큰입니다.")
+        return token
+
+
+class JWTAuthentication(RevocationCheckMixin, authentication.JWTAuthentication):
+    pass
+
+
+class JWTStatelessUserAuthentication(RevocationCheckMixin, authentication.JWTStatelessUserAuthentication):
+    pass
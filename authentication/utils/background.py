@@ -0,0 +1,74 @@
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger("prod")
+
+_executor: ThreadPoolExecutor | None = None
+_executor_pid: int | None = None
+_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    요청 밖에서 돌릴 작업용 프로세스별 스레드 풀. (uWSGI fork 이후에는 새로 만든다)
+    """
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "BACKGROUND_WORKERS", 2),
+                    thread_name_prefix="background")
+                _executor_pid = pid
+    return _executor
+
+
+def _run(func, args) -> None:
+    try:
+        func(*args)
+    except Exception as e:
+        logger.error(f"백그라운드 작업 실패 ({func.__qualname__}): {e}", exc_info=True)
+    finally:
+        # 풀 스레드가 잡고 있던 DB 커넥션을 돌려준다.
+        connections.close_all()
+
+
+def run_after_commit(func, *args) -> None:
+    """
+    현재 트랜잭션이 커밋되면 func(*args) 를 백그라운드 스레드에서 실행합니다.
+    """
+    transaction.on_commit(lambda: get_executor().submit(_run, func, args))
+
+
+_periodic: dict[str, tuple[int, threading.Thread]] = {}
+
+
+def _loop(interval: float, func) -> None:
+    while True:
+        time.sleep(interval)
+        _run(func, ())
+
+
+def ensure_periodic(name: str, interval: float, func) -> None:
+    """
+    이 프로세스에서 func() 를 interval 초마다 실행하는 데몬 스레드가 돌고 있게 합니다.
+    (uWSGI fork 이후 워커마다 처음 호출될 때 시작되며, 첫 실행은 interval 뒤)
+    """
+    pid = os.getpid()
+    running = _periodic.get(name)
+    if running is not None and running[0] == pid:
+        return
+    with _lock:
+        running = _periodic.get(name)
+        if running is not None and running[0] == pid:
+            return
+        thread = threading.Thread(
+            target=_loop, args=(interval, func), name=f"periodic-{name}", daemon=True)
+        thread.start()
+        _periodic[name] = (pid, thread)
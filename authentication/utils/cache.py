@@ -1,32 +1,551 @@
-import json
+import os
+import math
+import time
+import uuid
+import random
+import struct
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from django.conf import settings
 from django.core.cache import cache
+from django_redis import get_redis_connection
+from prometheus_client import Counter as PrometheusCounter
+from .codecs import get_codec, get_codec_for_format, JsonCodec
+from .cache_keys import CacheNamespace
 import logging
 
 logger = logging.getLogger("prod")
 
+cache_aside_lookups = PrometheusCounter(
+    "cache_aside_lookups_total",
+    "CacheAside 조회 결과 (tier: l1/l2, result: hit/miss)",
+    ["tier", "result"],
+)
+
+
+class LocalCache:
+    """
+    프로세스 내부의 LRU + TTL 캐시 (L1).
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[bool, object]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheInvalidationSubscriber:
+    """
+    Redis pub/sub 채널을 구독하며 다른 워커/노드에서 변경된 키를 L1 에서 제거합니다.
+    메시지 형식: "{origin}:{key}" (origin 이 자기 자신이면 무시)
+    """
+
+    def __init__(self, local: LocalCache, channel: str, origin: str):
+        self.local = local
+        self.channel = channel
+        self.origin = origin
+        self._thread = threading.Thread(
+            target=self._run, name="cache-aside-invalidation", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                pubsub = get_redis_connection("default").pubsub(
+                    ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # 구독이 끊긴 동안 놓친 무효화가 있을 수 있으므로 재연결 시 비운다.
+                self.local.clear()
+                for message in pubsub.listen():
+                    self._handle(message.get("data"))
+            except Exception as e:
+                logger.error(f"캐시 무효화 구독 오류, 재연결 시도: {e}")
+                self.local.clear()
+                time.sleep(1)
+
+    def _handle(self, data) -> None:
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        if not isinstance(data, str):
+            return
+        origin, _, key = data.partition(":")
+        if key.startswith("ns:"):
+            namespace = CacheNamespace.registry.get(key[3:])
+            if namespace is not None:
+                namespace.forget_generation()
+        elif origin != self.origin:
+            self.local.delete(key)
+
+
+# KEYS[1]: 락 키, ARGV[1]: 락 소유 토큰
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# 프레임 버전(1B) + 포맷 ID(1B) + 재계산 소요 시간(8B) + 만료 시각(8B) + 값 해시(8B) + 인코딩된 값
+# 포맷 ID 0 은 "값 없음" 을 기억하는 네거티브 캐시 항목이다.
+_FRAME_HEADER = struct.Struct("!BBdd8s")
+_FRAME_VERSION = 2
+_NEGATIVE_FORMAT_ID = 0
+
+
+class CachedValue:
+    """
+    인코딩된 값(body)과 포맷을 함께 들고 다니며, 필요할 때만 디코딩합니다.
+    content_type 이 JSON 이면 body 를 그대로 HTTP 응답에 쓸 수 있습니다.
+    digest 는 body 의 해시로, 프레임에 함께 저장되어 ETag 로 쓰입니다.
+    """
+    __slots__ = ("body", "codec", "digest")
+
+    def __init__(self, body: bytes, codec, digest: bytes | None = None):
+        self.body = body
+        self.codec = codec
+        self.digest = digest or hashlib.blake2b(body, digest_size=8).digest()
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest.hex()}"'
+
+    @property
+    def is_negative(self) -> bool:
+        return self.codec is None
+
+    @property
+    def content_type(self) -> str:
+        return self.codec.content_type
+
+    def decode(self):
+        if self.is_negative:
+            return None
+        return self.codec.loads(self.body)
+
+    def as_json_bytes(self) -> bytes:
+        if self.codec.content_type == JsonCodec.content_type:
+            return self.body
+        return get_codec_for_format(JsonCodec.format_id).dumps(self.decode())
+
+
+NEGATIVE = CachedValue(b"", None)
+
 
 class CacheAside:
+    """
+    L2(Redis) 에는 pickle 없이 raw client 로 [헤더 + 코덱 인코딩 값] 프레임을 저장합니다.
+    헤더의 재계산 소요 시간/만료 시각은 get_or_compute 의 조기 갱신(XFetch) 판단에 사용됩니다.
+    """
+    EARLY_REFRESH_BETA = 1.0
+    TTL_JITTER = 0.1
+    LOCK_TIMEOUT = 10
+    LOCK_WAIT_TIMEOUT = 3.0
+    LOCK_POLL_INTERVAL = 0.05
+
+    _release_lock_script = None
+    _local: LocalCache | None = None
+    _local_pid: int | None = None
+    _origin = uuid.uuid4().hex
+    _lock = threading.Lock()
+    _stats: Counter = Counter()
+
+    @staticmethod
+    def _client():
+        return get_redis_connection("default")
+
+    @staticmethod
+    def _redis_key(key) -> str:
+        return cache.make_key(key)
+
+    @staticmethod
+    def _l1_settings() -> dict:
+        return {
+            "ENABLED": False,
+            "MAX_ENTRIES": 1024,
+            "TTL": 30,
+            "CHANNEL": "cache-aside:invalidate",
+            **getattr(settings, "CACHE_ASIDE_L1", {}),
+        }
+
+    @classmethod
+    def get_local(cls) -> LocalCache | None:
+        conf = cls._l1_settings()
+        if not conf["ENABLED"]:
+            return None
+
+        # uWSGI 는 fork 이후 스레드를 물려받지 않으므로 프로세스별로 L1 과 구독 스레드를 만든다.
+        pid = os.getpid()
+        if cls._local is None or cls._local_pid != pid:
+            with cls._lock:
+                if cls._local is None or cls._local_pid != pid:
+                    local = LocalCache(conf["MAX_ENTRIES"], conf["TTL"])
+                    cls._origin = uuid.uuid4().hex
+                    CacheInvalidationSubscriber(
+                        local, conf["CHANNEL"], cls._origin).start()
+                    cls._local, cls._local_pid = local, pid
+        return cls._local
+
+    @classmethod
+    def _publish_invalidation(cls, key) -> None:
+        if cls.get_local() is None:
+            return
+        try:
+            cls._client().publish(
+                cls._l1_settings()["CHANNEL"], f"{cls._origin}:{key}")
+        except Exception as e:
+            logger.error(f"캐시 무효화 발행 실패 ({key}): {e}")
+
+    @classmethod
+    def _record(cls, tier: str, result: str) -> None:
+        cls._stats[f"{tier}_{result}"] += 1
+        cache_aside_lookups.labels(tier=tier, result=result).inc()
+
+    @classmethod
+    def stats(cls) -> dict:
+        local = cls.get_local()
+        return {
+            "l1_hits": cls._stats["l1_hits"],
+            "l1_misses": cls._stats["l1_misses"],
+            "l2_hits": cls._stats["l2_hits"],
+            "l2_misses": cls._stats["l2_misses"],
+            "l1_entries": len(local) if local is not None else 0,
+        }
+
+    @staticmethod
+    def _pack(cached: CachedValue, delta: float, expires_at: float) -> bytes:
+        format_id = _NEGATIVE_FORMAT_ID if cached.is_negative else cached.codec.format_id
+        return _FRAME_HEADER.pack(
+            _FRAME_VERSION, format_id, delta, expires_at, cached.digest) + cached.body
+
     @staticmethod
-    def get(key: str):
+    def _unpack(raw: bytes) -> tuple[CachedValue | None, float, float]:
+        """
+        (값, 재계산 소요 시간, 만료 시각) 을 반환합니다. 알 수 없는 프레임이면 값은 None (미스) 입니다.
+        """
+        if raw[:1] != bytes([_FRAME_VERSION]) or len(raw) < _FRAME_HEADER.size:
+            return None, 0.0, 0.0
+        _, format_id, delta, expires_at, digest = _FRAME_HEADER.unpack_from(raw)
+        body = raw[_FRAME_HEADER.size:]
+        # 잘린/손상된 값을 그대로 응답(과 ETag)에 쓰지 않도록 해시를 확인한다.
+        if hashlib.blake2b(body, digest_size=8).digest() != digest:
+            logger.warning("캐시 프레임 해시 불일치, 미스로 처리")
+            return None, 0.0, 0.0
+        if format_id == _NEGATIVE_FORMAT_ID:
+            return NEGATIVE, delta, expires_at
+        return CachedValue(body, get_codec_for_format(format_id), digest), delta, expires_at
+
+    @classmethod
+    def _get_entry(cls, key) -> tuple[CachedValue | None, float, float]:
+        raw = cls._client().get(cls._redis_key(key))
+        if not raw:
+            return None, 0.0, 0.0
+        return cls._unpack(raw)
+
+    @classmethod
+    def _get_local(cls, key) -> CachedValue | None:
+        local = cls.get_local()
+        if local is None:
+            return None
+        hit, cached = local.get(str(key))
+        cls._record("l1", "hits" if hit else "misses")
+        return cached if hit else None
+
+    @classmethod
+    def _set_local(cls, key, cached: CachedValue | None) -> None:
+        local = cls.get_local()
+        if local is None:
+            return
+        if cached is None:
+            local.delete(str(key))
+        else:
+            local.set(str(key), cached)
+
+    @classmethod
+    def get_cached(cls, key) -> CachedValue | None:
+        if (cached := cls._get_local(key)) is not None:
+            return cached
+
         try:
-            raw = cache.get(key)
-            return json.loads(raw) if raw else None
+            cached, _, _ = cls._get_entry(key)
         except Exception as e:
             logger.error(f"캐시 조회 실패 ({key}): {e}")
             return None
 
-    @staticmethod
-    def set(key: str, value: dict | list, timeout: int = 3600):
+        if cached is None:
+            cls._record("l2", "misses")
+            return None
+
+        cls._record("l2", "hits")
+        cls._set_local(key, cached)
+        return cached
+
+    @classmethod
+    def get_many_cached(cls, keys: list) -> dict:
+        """
+        L1 을 먼저 보고, 나머지는 MGET 한 번으로 가져옵니다.
+        캐시에 있는 키만 {key: CachedValue} 로 반환합니다. (네거티브 항목 포함)
+        """
+        found = {}
+        remaining = []
+        for key in keys:
+            if (cached := cls._get_local(key)) is not None:
+                found[key] = cached
+            else:
+                remaining.append(key)
+        if not remaining:
+            return found
+
+        try:
+            raws = cls._client().mget([cls._redis_key(key) for key in remaining])
+        except Exception as e:
+            logger.error(f"캐시 일괄 조회 실패 ({len(remaining)}건): {e}")
+            return found
+
+        for key, raw in zip(remaining, raws):
+            cached = cls._unpack(raw)[0] if raw else None
+            if cached is None:
+                cls._record("l2", "misses")
+                continue
+            cls._record("l2", "hits")
+            cls._set_local(key, cached)
+            found[key] = cached
+        return found
+
+    @classmethod
+    def set_many(cls, values: dict, timeout: int = 3600,
+                 negative_timeout: int | None = None) -> dict:
+        """
+        {key: 값} 을 파이프라인 한 번으로 저장하고 {key: CachedValue} 를 반환합니다.
+        값이 None 인 키는 negative_timeout 이 있으면 네거티브 항목으로 저장하고, 없으면 건너뜁니다.
+        """
+        entries = {}
+        for key, value in values.items():
+            if value is not None:
+                entries[key] = (cls._encode(value), timeout)
+            elif negative_timeout:
+                entries[key] = (NEGATIVE, negative_timeout)
+        if not entries:
+            return {}
+
+        stored = False
+        try:
+            now = time.time()
+            pipe = cls._client().pipeline(transaction=False)
+            for key, (cached, ttl) in entries.items():
+                ttl = int(ttl * (1 + random.uniform(0, cls.TTL_JITTER)))
+                pipe.set(cls._redis_key(key), cls._pack(
+                    cached, 0.0, now + ttl), ex=ttl)
+            pipe.execute()
+            stored = True
+            logger.info(f"캐시 일괄 저장 완료 ({len(entries)}건)")
+        except Exception as e:
+            logger.error(f"캐시 일괄 저장 실패 ({len(entries)}건): {e}")
+
+        for key, (cached, _) in entries.items():
+            cls._set_local(key, cached if stored else None)
+            cls._publish_invalidation(key)
+        return {key: cached for key, (cached, _) in entries.items()}
+
+    @classmethod
+    def get(cls, key: str):
+        cached = cls.get_cached(key)
+        return cached.decode() if cached is not None else None
+
+    @classmethod
+    def set(cls, key: str, value: dict | list, timeout: int = 3600, delta: float = 0.0) -> CachedValue:
+        codec = get_codec()
+        cached = CachedValue(codec.dumps(value), codec)
+        cls._store(key, cached, timeout, delta)
+        return cached
+
+    @classmethod
+    def _store(cls, key, cached: CachedValue, timeout: int, delta: float) -> None:
+        # 같은 시각에 채워진 키들이 한꺼번에 만료되지 않도록 TTL 에 지터를 준다.
+        timeout = int(timeout * (1 + random.uniform(0, cls.TTL_JITTER)))
+        stored = False
         try:
-            cache.set(key, json.dumps(value), timeout=timeout)
+            frame = cls._pack(cached, delta, time.time() + timeout)
+            cls._client().set(cls._redis_key(key), frame, ex=timeout)
+            stored = True
             logger.info(f"캐시 저장 완료 ({key})")
         except Exception as e:
             logger.error(f"캐시 저장 실패 ({key}): {e}")
 
+        cls._set_local(key, cached if stored else None)
+        cls._publish_invalidation(key)
+
+    @classmethod
+    def get_or_compute(cls, key, loader, ttl: int = 3600, negative_ttl: int | None = None):
+        cached = cls.get_or_compute_cached(key, loader, ttl, negative_ttl)
+        return cached.decode() if cached is not None else None
+
+    @classmethod
+    def get_or_compute_cached(cls, key, loader, ttl: int = 3600,
+                              negative_ttl: int | None = None) -> CachedValue | None:
+        """
+        캐시 값을 반환하고, 없으면 loader() 로 계산해 저장합니다.
+        - 동시에 여러 요청이 미스를 보면 Redis 락을 잡은 하나만 loader 를 실행하고 나머지는 대기합니다.
+        - 만료 직전에는 확률적으로(XFetch) 한 요청이 미리 갱신하고, 나머지는 기존 값을 그대로 씁니다.
+        loader 가 None 을 반환하면 negative_ttl 동안 "값 없음" 을 기억하고(지정 시), None 을 반환합니다.
+        """
+        cached = cls._get_or_compute_cached(key, loader, ttl, negative_ttl)
+        return None if cached is None or cached.is_negative else cached
+
+    @classmethod
+    def _get_or_compute_cached(cls, key, loader, ttl: int,
+                               negative_ttl: int | None) -> CachedValue | None:
+        if (cached := cls._get_local(key)) is not None:
+            return cached
+
+        try:
+            cached, delta, expires_at = cls._get_entry(key)
+        except Exception as e:
+            logger.error(f"캐시 조회 실패 ({key}): {e}")
+            return cls._encode(loader())
+
+        if cached is not None:
+            cls._record("l2", "hits")
+            if not cls._should_refresh_early(delta, expires_at):
+                cls._set_local(key, cached)
+                return cached
+            # 조기 갱신: 락을 못 잡으면 다른 요청이 갱신 중이므로 기존 값을 반환한다.
+            token = cls._acquire_lock(key)
+            if token is None:
+                return cached
+            logger.info(f"캐시 조기 갱신 ({key})")
+            try:
+                return cls._compute_and_set(key, loader, ttl, negative_ttl)
+            finally:
+                cls._release_lock(key, token)
+
+        cls._record("l2", "misses")
+        token = cls._acquire_lock(key)
+        if token is None:
+            cached = cls._wait_for_value(key)
+            if cached is not None:
+                return cached
+            logger.warning(f"캐시 재계산 대기 시간 초과, 직접 계산 ({key})")
+            return cls._compute_and_set(key, loader, ttl, negative_ttl)
+        try:
+            return cls._compute_and_set(key, loader, ttl, negative_ttl)
+        finally:
+            cls._release_lock(key, token)
+
     @staticmethod
-    def delete(key: str):
+    def _encode(value) -> CachedValue | None:
+        if value is None:
+            return None
+        codec = get_codec()
+        return CachedValue(codec.dumps(value), codec)
+
+    @classmethod
+    def _should_refresh_early(cls, delta: float, expires_at: float) -> bool:
+        if not delta or math.isinf(expires_at):
+            return False
+        return time.time() - delta * cls.EARLY_REFRESH_BETA * math.log(1.0 - random.random()) >= expires_at
+
+    @classmethod
+    def _compute_and_set(cls, key, loader, ttl: int, negative_ttl: int | None = None) -> CachedValue | None:
+        started = time.monotonic()
+        cached = cls._encode(loader())
+        if cached is not None:
+            cls._store(key, cached, ttl, time.monotonic() - started)
+        elif negative_ttl:
+            cls._store(key, NEGATIVE, negative_ttl, 0.0)
+            return NEGATIVE
+        return cached
+
+    @classmethod
+    def _lock_key(cls, key) -> str:
+        return cls._redis_key(f"lock:{key}")
+
+    @classmethod
+    def _acquire_lock(cls, key) -> str | None:
+        token = uuid.uuid4().hex
+        try:
+            if cls._client().set(cls._lock_key(key), token, nx=True, ex=cls.LOCK_TIMEOUT):
+                return token
+        except Exception as e:
+            logger.error(f"캐시 락 획득 실패 ({key}): {e}")
+            return token
+        return None
+
+    @classmethod
+    def _release_lock(cls, key, token: str) -> None:
         try:
-            cache.delete(key)
+            if cls._release_lock_script is None:
+                cls._release_lock_script = cls._client().register_script(
+                    _RELEASE_LOCK_SCRIPT)
+            cls._release_lock_script(keys=[cls._lock_key(key)], args=[token])
+        except Exception as e:
+            logger.error(f"캐시 락 해제 실패 ({key}): {e}")
+
+    @classmethod
+    def _wait_for_value(cls, key) -> CachedValue | None:
+        deadline = time.monotonic() + cls.LOCK_WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(cls.LOCK_POLL_INTERVAL)
+            try:
+                cached, _, _ = cls._get_entry(key)
+                if cached is not None:
+                    return cached
+                if not cls._client().exists(cls._lock_key(key)):
+                    cached, _, _ = cls._get_entry(key)
+                    return cached
+            except Exception:
+                return None
+        return None
+
+    @classmethod
+    def invalidate_namespace(cls, namespace: CacheNamespace) -> int:
+        """
+        네임스페이스 세대를 올려 해당 네임스페이스의 모든 캐시를 무효화합니다.
+        """
+        generation = namespace.invalidate_all()
+        cls._publish_invalidation(f"ns:{namespace.name}")
+        return generation
+
+    @classmethod
+    def delete(cls, key: str):
+        try:
+            cls._client().delete(cls._redis_key(key))
             logger.info(f"캐시 삭제 완료 ({key})")
         except Exception as e:
             logger.error(f"캐시 삭제 실패 ({key}): {e}")
+
+        cls._set_local(key, None)
+        cls._publish_invalidation(key)
@@ -0,0 +1,67 @@
+import time
+import threading
+from django.core.cache import cache
+from django_redis import get_redis_connection
+import logging
+
+logger = logging.getLogger("prod")
+
+
+class CacheNamespace:
+    """
+    `{namespace}:v{schema version}:g{generation}:{entity id}` 형태의 캐시 키를 만듭니다.
+
+    - version: 저장되는 값의 형태가 바뀌면 코드에서 올립니다. (배포와 함께 이전 키는 자연스럽게 버려짐)
+    - generation: Redis 에 저장된 카운터. invalidate_all() 로 1 증가시키면
+      해당 네임스페이스의 모든 키가 O(1) 로 무효화됩니다. (이전 키는 TTL 로 만료)
+    """
+    GENERATION_CACHE_SECONDS = 5
+
+    registry: dict[str, "CacheNamespace"] = {}
+
+    def __init__(self, name: str, version: int):
+        self.name = name
+        self.version = version
+        self._generation: int | None = None
+        self._generation_expires_at = 0.0
+        self._lock = threading.Lock()
+        CacheNamespace.registry[name] = self
+
+    @property
+    def generation_key(self) -> str:
+        return cache.make_key(f"cache_ns:{self.name}:generation")
+
+    def generation(self) -> int:
+        # 매 요청마다 Redis 를 보지 않도록 짧게 프로세스 안에 들고 있는다.
+        now = time.monotonic()
+        if self._generation is not None and now < self._generation_expires_at:
+            return self._generation
+
+        with self._lock:
+            if self._generation is None or now >= self._generation_expires_at:
+                try:
+                    raw = get_redis_connection("default").get(self.generation_key)
+                    self._generation = int(raw) if raw else 0
+                except Exception as e:
+                    logger.error(f"캐시 네임스페이스 세대 조회 실패 ({self.name}): {e}")
+                    self._generation = self._generation or 0
+                self._generation_expires_at = now + self.GENERATION_CACHE_SECONDS
+        return self._generation
+
+    def forget_generation(self) -> None:
+        self._generation_expires_at = 0.0
+
+    def key(self, entity_id) -> str:
+        return f"{self.name}:v{self.version}:g{self.generation()}:{entity_id}"
+
+    def invalidate_all(self) -> int:
+        generation = get_redis_connection("default").incr(self.generation_key)
+        self.forget_generation()
+        logger.info(f"캐시 네임스페이스 전체 무효화: {self.name} -> g{generation}")
+        return generation
+
+
+# UserProfileSerializer 의 필드 구성이 바뀌면 version 을 올린다.
+USER_PROFILE = CacheNamespace("user_profile", version=2)
+# UserProfileSummarySerializer (일괄 조회용) 의 필드 구성이 바뀌면 version 을 올린다.
+USER_PROFILE_SUMMARY = CacheNamespace("user_profile_summary", version=2)
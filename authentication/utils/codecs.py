@@ -0,0 +1,83 @@
+import json
+from django.conf import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class JsonCodec:
+    name = "json"
+    format_id = 1
+    content_type = "application/json"
+
+    @staticmethod
+    def dumps(value) -> bytes:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def loads(data: bytes):
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    name = "orjson"
+    format_id = 1
+    content_type = "application/json"
+
+    @staticmethod
+    def dumps(value) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    @staticmethod
+    def loads(data: bytes):
+        return orjson.loads(data)
+
+
+class MsgpackCodec:
+    name = "msgpack"
+    format_id = 2
+    content_type = "application/msgpack"
+
+    @staticmethod
+    def dumps(value) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    @staticmethod
+    def loads(data: bytes):
+        return msgpack.unpackb(data, raw=False)
+
+
+CODECS = {
+    JsonCodec.name: JsonCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    MsgpackCodec.name: MsgpackCodec,
+}
+
+
+def get_codec_for_format(format_id: int):
+    """
+    저장된 값의 포맷 ID 로 디코딩할 코덱을 고릅니다. (json/orjson 은 같은 포맷)
+    """
+    if format_id == MsgpackCodec.format_id:
+        return MsgpackCodec
+    return OrjsonCodec if orjson is not None else JsonCodec
+
+
+def get_codec(name: str | None = None):
+    """
+    CACHE_ASIDE_CODEC 설정(json / orjson / msgpack)에 맞는 코덱을 반환합니다.
+    선택한 라이브러리가 설치되어 있지 않으면 json 으로 대체합니다.
+    """
+    name = name or getattr(settings, "CACHE_ASIDE_CODEC", "orjson")
+    if name == OrjsonCodec.name and orjson is None:
+        return JsonCodec
+    if name == MsgpackCodec.name and msgpack is None:
+        return JsonCodec
+    return CODECS.get(name, JsonCodec)
@@ -0,0 +1,70 @@
+import io
+from PIL import Image, ImageOps
+
+# 앞부분 바이트로 판별한 이미지 형식 -> 확장자
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+
+# 정사각형 변형 크기(px). 목록 화면 아바타(32/64)부터 프로필 화면(256)까지.
+VARIANT_SIZES = (32, 64, 128, 256)
+
+# 형식 -> (확장자, Pillow 저장 옵션). WebP 를 우선 쓰고, 지원하지 않는 클라이언트는 JPEG 를 쓴다.
+VARIANT_FORMATS = {
+    "webp": ("webp", {"format": "WEBP", "quality": 80, "method": 4}),
+    "jpeg": ("jpg", {"format": "JPEG", "quality": 85, "optimize": True, "progressive": True}),
+}
+
+
+def sniff_image_type(head: bytes) -> str | None:
+    for signature, ext in _SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def variant_name(variant_dir: str, picture_name: str, size: int, ext: str) -> str:
+    """
+    원본 이름에서 정해지는 변형 경로. 원본이 내용 주소라면 변형도 같은 원본끼리 공유된다.
+    """
+    stem = picture_name.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+    return f"{variant_dir}/{stem}_{size}.{ext}"
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    # 투명 배경은 흰색으로 채운다. (JPEG 는 알파 채널이 없음)
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def generate_variants(source) -> dict[int, dict[str, tuple[str, bytes]]]:
+    """
+    원본 이미지(파일 객체)로 크기별/형식별 변형을 만듭니다.
+    {크기: {형식: (확장자, 내용)}} 을 반환하며, 원본보다 큰 크기는 만들지 않습니다.
+    EXIF 회전은 픽셀에 반영하고, EXIF/ICC 등 메타데이터는 저장하지 않습니다.
+    """
+    with Image.open(source) as original:
+        original.seek(0)
+        image = _flatten(ImageOps.exif_transpose(original))
+
+    largest = min(image.size)
+    sizes = [size for size in VARIANT_SIZES if size <= largest] or [largest]
+
+    variants = {}
+    for size in sizes:
+        resized = ImageOps.fit(image, (size, size), method=Image.Resampling.LANCZOS)
+        variants[size] = {}
+        for name, (ext, options) in VARIANT_FORMATS.items():
+            buffer = io.BytesIO()
+            resized.save(buffer, **options)
+            variants[size][name] = (ext, buffer.getvalue())
+    return variants
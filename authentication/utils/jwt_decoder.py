@@ -1,5 +1,141 @@
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
 import jwt
-import os
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .jwt_keys import get_keyring
+
+
+class UnknownSigningKeyError(jwt.InvalidTokenError):
+    """
+    kid 에 맞는 검증 키가 없거나(폐기된 키 등) 검증 키가 설정되지 않은 토큰.
+    jwt.InvalidKeyError 는 InvalidTokenError 가 아니어서, 잘못된 토큰과 똑같이 다루도록 따로 둔다.
+    """
+
+
+class JWTVerifier:
+    """
+    서명 키/알고리즘을 한 번만 준비해 두고 토큰을 검증합니다. keyring 이 있으면 kid 로 공개 키를 고릅니다.
+    검증에 성공한 토큰은 (토큰 다이제스트 -> 클레임) 으로 exp 까지 LRU 에 보관해, 같은 토큰은 다시 디코딩하지 않습니다.
+    """
+
+    def __init__(self, key, algorithm: str = 'HS256', audience=None, issuer=None,
+                 leeway: float = 0, max_entries: int = 10000, keyring=None, accept_unkeyed: bool = True):
+        self.algorithm = algorithm
+        self.key = jwt.get_algorithm_by_name(algorithm).prepare_key(key) if key else None
+        self.keyring = keyring
+        self.accept_unkeyed = accept_unkeyed
+        self.audience = audience
+        self.issuer = issuer
+        self.leeway = leeway
+        self.max_entries = max_entries
+        self._jwt = jwt.PyJWT()
+        self._cache: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "JWTVerifier":
+        from rest_framework_simplejwt.settings import api_settings
+
+        leeway = api_settings.LEEWAY
+        if hasattr(leeway, 'total_seconds'):
+            leeway = leeway.total_seconds()
+        return cls(
+            api_settings.VERIFYING_KEY or api_settings.SIGNING_KEY,
+            algorithm=api_settings.ALGORITHM,
+            audience=api_settings.AUDIENCE,
+            issuer=api_settings.ISSUER,
+            leeway=leeway,
+            max_entries=settings.JWT_VERIFIER_CACHE["MAX_ENTRIES"],
+            keyring=get_keyring,
+            accept_unkeyed=settings.JWT_KEYRING["ACCEPT_UNKEYED"],
+        )
+
+    def _resolve_key(self, token: str):
+        """
+        keyring(get_keyring 같은 함수)이 keyring 을 돌려주면 헤더의 kid 로 공개 키를 고릅니다.
+        kid 가 없는 토큰은 accept_unkeyed 일 때만 key 로 검증합니다.
+        """
+        keyring = self.keyring() if self.keyring is not None else None
+        if keyring is not None:
+            kid = jwt.get_unverified_header(token).get('kid')
+            if kid is not None or not self.accept_unkeyed:
+                signing_key = keyring.verifying_key(kid)
+                if signing_key is None:
+                    raise UnknownSigningKeyError(f"알 수 없는 kid: {kid}")
+                return signing_key.public_key, signing_key.algorithm
+        if self.key is None:
+            raise UnknownSigningKeyError("검증 키가 없습니다.")
+        return self.key, self.algorithm
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def verify(self, token: str) -> dict:
+        """
+        토큰의 클레임을 반환합니다. 유효하지 않으면 jwt.InvalidTokenError 를 던집니다.
+        """
+        digest = self._digest(token) if self.max_entries > 0 else None
+        if digest is not None:
+            with self._lock:
+                cached = self._cache.get(digest)
+                if cached is not None:
+                    claims, expires_at = cached
+                    if time.time() < expires_at:
+                        self._cache.move_to_end(digest)
+                        return dict(claims)
+                    del self._cache[digest]
+
+        key, algorithm = self._resolve_key(token)
+        claims = self._jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience=self.audience,
+            issuer=self.issuer,
+            leeway=self.leeway,
+            options={"verify_aud": self.audience is not None},
+        )
+
+        # exp 가 없는 토큰은 언제까지 유효한지 알 수 없으므로 보관하지 않는다.
+        exp = claims.get('exp')
+        if digest is not None and isinstance(exp, (int, float)):
+            with self._lock:
+                self._cache[digest] = (claims, exp + self.leeway)
+                self._cache.move_to_end(digest)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return dict(claims)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+_verifier: JWTVerifier | None = None
+_verifier_lock = threading.Lock()
+
+
+def get_verifier() -> JWTVerifier:
+    global _verifier
+    if _verifier is None:
+        with _verifier_lock:
+            if _verifier is None:
+                _verifier = JWTVerifier.from_settings()
+    return _verifier
+
+
+@receiver(setting_changed)
+def _reset_verifier(*, setting, **kwargs):
+    global _verifier
+    if setting in ('SIMPLE_JWT', 'JWT_VERIFIER_CACHE', 'JWT_KEYRING'):
+        _verifier = None
 
 
 def extract_uid_from_token(request):
@@ -9,11 +145,6 @@ def extract_uid_from_token(request):
 
     token = auth_header.split(' ')[1]
     try:
-        decoded = jwt.decode(token,  os.environ.get(
-            'SECRET_KEY'), algorithms=[os.environ.get('JWT_ALGORITHM', 'HS256')])
-
-        return decoded.get("uid")
-    except jwt.ExpiredSignatureError:
-        return None
-    except jwt.DecodeError:
+        return get_verifier().verify(token).get("uid")
+    except jwt.InvalidTokenError:
         return None
@@ -0,0 +1,203 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+
+import jwt
+import orjson
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+logger = logging.getLogger('prod')
+
+SUPPORTED_ALGORITHMS = ("RS256", "EdDSA")
+
+
+@dataclass(frozen=True)
+class JWTKey:
+    """
+    keyring 의 키 하나.
+    - active_from: 이 시각부터 서명에 쓴다. (그 전에는 JWKS 에만 미리 공개)
+    - verify_until: 이 시각 이후에는 검증/공개하지 않는다. (None 이면 계속)
+    """
+    kid: str
+    algorithm: str
+    public_key: object
+    private_key: object | None
+    active_from: int
+    verify_until: int | None = None
+
+    def is_published(self, now: float) -> bool:
+        return self.verify_until is None or now < self.verify_until
+
+    def can_sign(self, now: float) -> bool:
+        return self.private_key is not None and self.active_from <= now and self.is_published(now)
+
+    def to_jwk(self) -> dict:
+        algorithm = jwt.get_algorithm_by_name(self.algorithm)
+        jwk = algorithm.to_jwk(self.public_key, as_dict=True)
+        jwk.update({"kid": self.kid, "alg": self.algorithm, "use": "sig"})
+        return jwk
+
+
+class Keyring:
+    """
+    JWT_KEYRING["FILE"] (JSON) 에 적힌 키 목록. 키 파일 경로는 keyring 파일 기준 상대 경로입니다.
+
+        {"keys": [{"kid": "2026-10-a", "alg": "RS256", "private_key": "2026-10-a.pem",
+                   "active_from": 1760000000, "verify_until": null}]}
+
+    private_key 대신 public_key 만 적으면 검증 전용 키가 됩니다.
+    """
+
+    def __init__(self, keys: list[JWTKey]):
+        self.keys = sorted(keys, key=lambda key: key.active_from)
+        self.by_kid = {key.kid: key for key in self.keys}
+        self._jwks_cache: tuple[tuple[str, ...], bytes, str] | None = None
+
+    @staticmethod
+    def _load_pem(path: str, private: bool):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if private:
+            return serialization.load_pem_private_key(data, password=None)
+        return serialization.load_pem_public_key(data)
+
+    @classmethod
+    def load(cls, path: str) -> "Keyring":
+        base_dir = os.path.dirname(os.path.abspath(path))
+        with open(path, 'rb') as f:
+            entries = orjson.loads(f.read()).get("keys", [])
+
+        keys = []
+        for entry in entries:
+            algorithm = entry.get("alg", "RS256")
+            if algorithm not in SUPPORTED_ALGORITHMS:
+                raise ValueError(f"지원하지 않는 JWT 서명 알고리즘: {algorithm} ({entry.get('kid')})")
+            private_key = None
+            if entry.get("private_key"):
+                private_key = cls._load_pem(os.path.join(base_dir, entry["private_key"]), private=True)
+                public_key = private_key.public_key()
+            else:
+                public_key = cls._load_pem(os.path.join(base_dir, entry["public_key"]), private=False)
+            keys.append(JWTKey(
+                kid=entry["kid"],
+                algorithm=algorithm,
+                public_key=public_key,
+                private_key=private_key,
+                active_from=int(entry.get("active_from", 0)),
+                verify_until=entry.get("verify_until"),
+            ))
+        return cls(keys)
+
+    def signing_key(self, now: float | None = None) -> JWTKey:
+        """
+        활성화된 키 중 가장 최근에 활성화된 키로 서명합니다.
+        """
+        now = time.time() if now is None else now
+        for key in reversed(self.keys):
+            if key.can_sign(now):
+                return key
+        raise LookupError("서명에 사용할 수 있는 JWT 키가 없습니다.")
+
+    def verifying_key(self, kid: str | None, now: float | None = None) -> JWTKey | None:
+        key = self.by_kid.get(kid) if kid else None
+        if key is None or not key.is_published(time.time() if now is None else now):
+            return None
+        return key
+
+    def published(self, now: float | None = None) -> list[JWTKey]:
+        now = time.time() if now is None else now
+        return [key for key in self.keys if key.is_published(now)]
+
+    def jwks(self, now: float | None = None) -> tuple[bytes, str]:
+        """
+        공개 중인 키의 JWKS 문서와 ETag 를 반환합니다. (공개 키 구성이 같으면 다시 만들지 않음)
+        """
+        keys = self.published(now)
+        kids = tuple(key.kid for key in keys)
+        cached = self._jwks_cache
+        if cached is None or cached[0] != kids:
+            body = orjson.dumps({"keys": [key.to_jwk() for key in keys]})
+            etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+            cached = self._jwks_cache = (kids, body, etag)
+        return cached[1], cached[2]
+
+
+def generate_private_key(algorithm: str):
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    raise ValueError(f"지원하지 않는 JWT 서명 알고리즘: {algorithm}")
+
+
+def private_key_pem(private_key) -> bytes:
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+class _KeyringHolder:
+    """
+    프로세스 안에 keyring 을 들고 있다가, RELOAD_INTERVAL 마다 파일이 바뀌었는지(mtime)만 확인해 다시 읽습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.keyring: Keyring | None = None
+        self.mtime = None
+        self.checked_at = 0.0
+
+    def get(self) -> Keyring | None:
+        options = settings.JWT_KEYRING
+        path = options.get("FILE")
+        if not path:
+            return None
+
+        now = time.monotonic()
+        if self.keyring is not None and now - self.checked_at < options["RELOAD_INTERVAL"]:
+            return self.keyring
+
+        with self._lock:
+            if self.keyring is not None and now - self.checked_at < options["RELOAD_INTERVAL"]:
+                return self.keyring
+            self.checked_at = now
+            try:
+                mtime = os.stat(path).st_mtime_ns
+                if self.keyring is None or mtime != self.mtime:
+                    self.keyring = Keyring.load(path)
+                    self.mtime = mtime
+                    logger.info(f"JWT keyring 로드: {[key.kid for key in self.keyring.keys]}")
+            except Exception as e:
+                if self.keyring is None:
+                    raise
+                # 다시 읽지 못하면 이전 keyring 을 계속 쓴다.
+                logger.error(f"JWT keyring 다시 읽기 실패 ({path}): {e}")
+        return self.keyring
+
+
+_holder = _KeyringHolder()
+
+
+def get_keyring() -> Keyring | None:
+    """
+    JWT_KEYRING["FILE"] 이 없으면 None (SIMPLE_JWT 의 SIGNING_KEY 로 서명/검증).
+    """
+    return _holder.get()
+
+
+@receiver(setting_changed)
+def _reset_keyring(*, setting, **kwargs):
+    if setting == 'JWT_KEYRING':
+        _holder.reset()
@@ -0,0 +1,208 @@
+import time
+import struct
+import hashlib
+import logging
+import threading
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+logger = logging.getLogger("prod")
+
+# 블롭 형식 (big-endian)
+#   헤더: magic(4s) 형식 버전(B) 해시 수 k(B) 예약(H) 비트 수 m(I) 버킷 길이(초, I) 현재 버킷(Q) 버킷 수(H)
+#   버킷: 버킷 번호(Q) 버킷 버전(Q) 비트열(m / 8 바이트, 비트 i 는 byte[i >> 3] 의 (7 - i & 7) 번째 비트)
+# 항목의 비트 위치: d = blake2b(항목, 16바이트), h1 = d[:8], h2 = d[8:] | 1 (big-endian),
+#   i 번째 위치 = (h1 + i * h2) mod m  (i = 0..k-1)
+BLOB_MAGIC = b"RVKF"
+BLOB_VERSION = 1
+_BLOB_HEADER = struct.Struct("!4sBBHIIQH")
+_BUCKET_HEADER = struct.Struct("!QQ")
+
+
+def family_entry(family: str) -> str:
+    return f"f:{family}"
+
+
+def user_entry(user_id) -> str:
+    return f"u:{user_id}"
+
+
+class RevocationFilter:
+    """
+    무효화된 토큰 패밀리(fam)/유저의 시간 버킷 Bloom filter.
+
+    - 항목은 현재 버킷(BUCKET_SECONDS, 기본 액세스 토큰 수명)에 추가되고, 현재/직전 버킷 두 개만 확인하므로
+      최소 액세스 토큰 수명 동안 남아 있다가 자연히 빠진다.
+    - 비트열은 Redis 에 `revocation_bloom:{버킷}` 비트맵으로, 정확한 무효화 시각은 `revoked:{항목}` 에 둔다.
+    - 프로세스는 REFRESH_INTERVAL 마다 버킷 버전만 확인하고, 바뀐 버킷의 비트열만 다시 받는다.
+      Bloom filter 에 걸린 토큰만 Redis 에서 정확히 확인한다. (대부분의 요청은 Redis 를 타지 않음)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: dict[int, tuple[int, bytes]] = {}
+        self._checked_at = 0.0
+
+    # 설정/키
+
+    @staticmethod
+    def options() -> dict:
+        return settings.REVOCATION_FILTER
+
+    @classmethod
+    def bucket_seconds(cls) -> int:
+        return int(cls.options()["BUCKET_SECONDS"])
+
+    @classmethod
+    def current_bucket(cls, now: float | None = None) -> int:
+        return int((time.time() if now is None else now) // cls.bucket_seconds())
+
+    @staticmethod
+    def bits_key(bucket: int) -> str:
+        return cache.make_key(f"revocation_bloom:{bucket}")
+
+    @staticmethod
+    def version_key(bucket: int) -> str:
+        return cache.make_key(f"revocation_bloom:{bucket}:v")
+
+    @staticmethod
+    def exact_key(entry: str) -> str:
+        return cache.make_key(f"revoked:{entry}")
+
+    @staticmethod
+    def _client():
+        return get_redis_connection("default")
+
+    @staticmethod
+    def positions(entry: str, bits: int, hashes: int) -> list[int]:
+        digest = hashlib.blake2b(entry.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % bits for i in range(hashes)]
+
+    @staticmethod
+    def _has_bits(data: bytes, positions: list[int]) -> bool:
+        for position in positions:
+            index = position >> 3
+            if index >= len(data) or not (data[index] >> (7 - (position & 7))) & 1:
+                return False
+        return True
+
+    # 쓰기
+
+    @classmethod
+    def revoke(cls, *entries: str, revoked_at: float | None = None) -> None:
+        """
+        항목을 현재 버킷에 추가하고 정확한 무효화 시각을 기록합니다.
+        이 시각(초) 이전에 발급(iat)된 액세스 토큰이 거부됩니다. (같은 초에 발급된 토큰은 통과)
+        """
+        options = cls.options()
+        now = time.time() if revoked_at is None else revoked_at
+        bucket = cls.current_bucket(now)
+        ttl = cls.bucket_seconds() * 2 + 60
+
+        pipe = cls._client().pipeline(transaction=True)
+        for entry in entries:
+            for position in cls.positions(entry, options["BITS"], options["HASHES"]):
+                pipe.setbit(cls.bits_key(bucket), position, 1)
+            pipe.set(cls.exact_key(entry), int(now), ex=ttl)
+        pipe.expire(cls.bits_key(bucket), ttl)
+        pipe.incr(cls.version_key(bucket))
+        pipe.expire(cls.version_key(bucket), ttl)
+        pipe.execute()
+        logger.info(f"토큰 무효화 필터 추가: {entries} (버킷 {bucket})")
+
+    # 읽기 (프로세스 내)
+
+    @classmethod
+    def _fetch(cls, known: dict[int, int], now: float | None = None) -> tuple[int, dict[int, tuple[int, bytes]]]:
+        """
+        현재/직전 버킷 중 known({버킷: 버전})과 버전이 다른 버킷의 (버전, 비트열)을 Redis 에서 읽습니다.
+        """
+        current = cls.current_bucket(now)
+        buckets = [current - 1, current]
+        client = cls._client()
+        versions = client.mget([cls.version_key(bucket) for bucket in buckets])
+
+        changed = [(bucket, int(version)) for bucket, version in zip(buckets, versions)
+                   if version is not None and known.get(bucket) != int(version)]
+        if not changed:
+            return current, {}
+        data = client.mget([cls.bits_key(bucket) for bucket, _ in changed])
+        return current, {bucket: (version, bits or b"")
+                         for (bucket, version), bits in zip(changed, data)}
+
+    def refresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.options()["REFRESH_INTERVAL"]:
+            return
+        with self._lock:
+            if not force and now - self._checked_at < self.options()["REFRESH_INTERVAL"]:
+                return
+            self._checked_at = now
+            try:
+                known = {bucket: version for bucket, (version, _) in self._buckets.items()}
+                current, changed = self._fetch(known)
+            except Exception as e:
+                # Redis 장애 시에는 마지막으로 받은 필터로 계속 확인한다.
+                logger.error(f"토큰 무효화 필터 갱신 실패: {e}")
+                return
+            buckets = {bucket: value for bucket, value in self._buckets.items()
+                       if bucket >= current - 1}
+            buckets.update(changed)
+            self._buckets = buckets
+
+    def might_contain(self, entry: str) -> bool:
+        self.refresh()
+        options = self.options()
+        positions = self.positions(entry, options["BITS"], options["HASHES"])
+        return any(self._has_bits(bits, positions) for _, bits in self._buckets.values())
+
+    @classmethod
+    def revoked_at(cls, entries: list[str]) -> list[int | None]:
+        values = cls._client().mget([cls.exact_key(entry) for entry in entries])
+        return [int(value) if value is not None else None for value in values]
+
+    def is_revoked(self, user_id, family: str | None, issued_at: int | None) -> bool:
+        """
+        Bloom filter 에 걸린 경우에만 Redis 에서 무효화 시각을 확인해, 토큰이 그 전에 발급되었으면 True.
+        """
+        entries = [user_entry(user_id)] if user_id is not None else []
+        if family:
+            entries.append(family_entry(family))
+        hits = [entry for entry in entries if self.might_contain(entry)]
+        if not hits:
+            return False
+        try:
+            revoked = self.revoked_at(hits)
+        except Exception as e:
+            logger.error(f"토큰 무효화 확인 실패: {e}")
+            return False
+        # iat 와 무효화 시각은 초 단위다. 무효화와 같은 초에 발급된 토큰(다른 세션 로그아웃 직후 받은 새 토큰 등)은 통과시킨다.
+        return any(at is not None and (issued_at is None or issued_at < at) for at in revoked)
+
+    # 블롭 (다운스트림 배포용)
+
+    @classmethod
+    def blob(cls, known: dict[int, int] | None = None) -> tuple[bytes, bool]:
+        """
+        known({버킷: 버전}) 이후 바뀐 버킷만 담은 블롭과, 바뀐 버킷이 있는지를 반환합니다.
+        """
+        options = cls.options()
+        current, changed = cls._fetch(known or {})
+        parts = [_BLOB_HEADER.pack(
+            BLOB_MAGIC, BLOB_VERSION, options["HASHES"], 0, options["BITS"],
+            cls.bucket_seconds(), current, len(changed))]
+        size = options["BITS"] // 8
+        for bucket, (version, bits) in sorted(changed.items()):
+            parts.append(_BUCKET_HEADER.pack(bucket, version))
+            parts.append(bits[:size].ljust(size, b"\0"))
+        return b"".join(parts), bool(changed)
+
+
+_filter = RevocationFilter()
+
+
+def get_revocation_filter() -> RevocationFilter:
+    return _filter
@@ -0,0 +1,58 @@
+import time
+import logging
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+logger = logging.getLogger("prod")
+
+
+class TokenBlacklist:
+    """
+    무효화된 토큰 JTI 를 Redis 에 `token_blacklist:{jti}` 로 보관합니다.
+    TTL 은 토큰의 남은 수명이므로, 토큰이 만료되면 항목도 함께 사라집니다.
+    (simplejwt 의 OutstandingToken/BlacklistedToken 테이블을 대신함)
+    """
+
+    @staticmethod
+    def _client():
+        return get_redis_connection("default")
+
+    @staticmethod
+    def key(jti: str) -> str:
+        return cache.make_key(f"token_blacklist:{jti}")
+
+    @staticmethod
+    def _ttl(expires_at: int, now: int) -> int:
+        return int(expires_at) - now
+
+    @classmethod
+    def add(cls, jti: str, expires_at: int) -> bool:
+        """
+        이미 만료된 토큰은 기록하지 않고 False 를 반환합니다.
+        """
+        ttl = cls._ttl(expires_at, int(time.time()))
+        if ttl <= 0:
+            return False
+        cls._client().set(cls.key(jti), 1, ex=ttl)
+        return True
+
+    @classmethod
+    def add_many(cls, entries) -> int:
+        """
+        (jti, 만료 시각) 목록을 한 번의 파이프라인으로 기록하고, 기록한 개수를 반환합니다.
+        """
+        now = int(time.time())
+        pipe = cls._client().pipeline(transaction=False)
+        added = 0
+        for jti, expires_at in entries:
+            ttl = cls._ttl(expires_at, now)
+            if ttl > 0:
+                pipe.set(cls.key(jti), 1, ex=ttl)
+                added += 1
+        if added:
+            pipe.execute()
+        return added
+
+    @classmethod
+    def contains(cls, jti: str) -> bool:
+        return bool(cls._client().exists(cls.key(jti)))
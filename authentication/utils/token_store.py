@@ -0,0 +1,313 @@
+import time
+import hashlib
+import logging
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+logger = logging.getLogger("prod")
+
+FAMILY_CLAIM = "fam"
+DEVICE_MAX_LENGTH = 64
+
+# KEYS[1]: 이전 리프레시 토큰 키, KEYS[2]: 새 리프레시 토큰 키
+# KEYS[3]: 이전 JTI 의 회전 기록 키, KEYS[4]: 토큰 패밀리 키, KEYS[5]: 유저 세션 인덱스
+# ARGV[1]: 새 토큰 해시, ARGV[2]: TTL(초), ARGV[3]: 새 JTI, ARGV[4]: 리프레시 토큰 키 prefix
+# ARGV[5]: 이전 JTI, ARGV[6]: 현재 시각(epoch), ARGV[7]: 이전 토큰 해시, ARGV[8]: 요청 기기 정보
+# ARGV[9]: 재사용 유예 시간(초)
+# 이전 키는 압축 레코드(hash) 또는 마이그레이션 전의 문자열 값일 수 있다.
+# 회전 기록 키에는 회전 시각을 저장하고, 유예 시간 안의 재사용(동시 갱신)은 패밀리를 무효화하지 않는다.
+_ROTATE_SCRIPT = """
+local old_type = redis.call('TYPE', KEYS[1]).ok
+if old_type ~= 'none' then
+    local device = ARGV[8]
+    if old_type == 'hash' then
+        local old = redis.call('HMGET', KEYS[1], 'h', 'd')
+        if old[1] ~= ARGV[7] then
+            return 0
+        end
+        if old[2] and old[2] ~= '' then
+            device = old[2]
+        end
+    end
+    local expires_at = ARGV[6] + ARGV[2]
+    redis.call('DEL', KEYS[1])
+    redis.call('HSET', KEYS[2], 'h', ARGV[1], 'i', ARGV[6], 'e', expires_at, 'd', device)
+    redis.call('EXPIRE', KEYS[2], ARGV[2])
+    redis.call('SET', KEYS[3], ARGV[6], 'EX', ARGV[2])
+    redis.call('SET', KEYS[4], ARGV[3], 'EX', ARGV[2])
+    redis.call('ZREM', KEYS[5], ARGV[5])
+    redis.call('ZADD', KEYS[5], expires_at, ARGV[3])
+    redis.call('EXPIRE', KEYS[5], ARGV[2])
+    return 1
+end
+local rotated_at = redis.call('GET', KEYS[3])
+if rotated_at then
+    rotated_at = tonumber(rotated_at)
+    if rotated_at and tonumber(ARGV[6]) - rotated_at <= tonumber(ARGV[9]) then
+        return 2
+    end
+    local current = redis.call('GET', KEYS[4])
+    if current then
+        redis.call('DEL', ARGV[4] .. current)
+        redis.call('ZREM', KEYS[5], current)
+    end
+    redis.call('DEL', KEYS[4])
+    return -1
+end
+return 0
+"""
+
+# KEYS[1]: 회전 기록 키, KEYS[2]: 토큰 패밀리 키, KEYS[3]: 유저 세션 인덱스
+# ARGV[1]: 리프레시 토큰 키 prefix, ARGV[2]: 현재 시각(epoch), ARGV[3]: 재사용 유예 시간(초)
+_REVOKE_IF_ROTATED_SCRIPT = """
+local rotated_at = redis.call('GET', KEYS[1])
+if not rotated_at then
+    return 0
+end
+rotated_at = tonumber(rotated_at)
+if rotated_at and tonumber(ARGV[2]) - rotated_at <= tonumber(ARGV[3]) then
+    return 2
+end
+local current = redis.call('GET', KEYS[2])
+if current then
+    redis.call('DEL', ARGV[1] .. current)
+    redis.call('ZREM', KEYS[3], current)
+end
+redis.call('DEL', KEYS[2])
+return -1
+"""
+
+# KEYS[1]: 유저 세션 인덱스, ARGV[1]: 리프레시 토큰 키 prefix, ARGV[2]: 현재 시각(epoch)
+_REVOKE_ALL_SCRIPT = """
+local jtis = redis.call('ZRANGEBYSCORE', KEYS[1], ARGV[2], '+inf')
+local revoked = 0
+for _, jti in ipairs(jtis) do
+    revoked = revoked + redis.call('DEL', ARGV[1] .. jti)
+end
+redis.call('DEL', KEYS[1])
+return revoked
+"""
+
+# KEYS[1]: 기존(문자열) 리프레시 토큰 키, KEYS[2]: 유저 세션 인덱스
+# ARGV[1]: 기존 값, ARGV[2]: 토큰 해시, ARGV[3]: 발급 시각, ARGV[4]: 만료 시각, ARGV[5]: JTI
+_CONVERT_LEGACY_SCRIPT = """
+if redis.call('TYPE', KEYS[1]).ok ~= 'string' or redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+local pttl = redis.call('PTTL', KEYS[1])
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], 'h', ARGV[2], 'i', ARGV[3], 'e', ARGV[4], 'd', '')
+if pttl > 0 then
+    redis.call('PEXPIRE', KEYS[1], pttl)
+end
+redis.call('ZADD', KEYS[2], ARGV[4], ARGV[5])
+if redis.call('TTL', KEYS[2]) < math.floor(pttl / 1000) then
+    redis.call('PEXPIRE', KEYS[2], pttl)
+end
+return 1
+"""
+
+
+class RefreshTokenStore:
+    """
+    리프레시 토큰의 Redis 상태를 관리합니다.
+    키 형식은 기존 cache.set 으로 저장하던 `refresh_token:{user_id}:{jti}` 와 동일하며,
+    유저별 세션 인덱스(만료 시각을 score 로 하는 sorted set)를 함께 갱신합니다.
+
+    토큰 원문 대신 압축 레코드(hash)를 저장합니다.
+        h: 토큰 SHA-256 앞 16바이트, i: 발급 시각, e: 만료 시각, d: 기기 정보
+    """
+    ROTATED = 1
+    MISSING = 0
+    REUSED = -1
+    # 유예 시간 안에 이미 회전된 토큰이 다시 온 경우 (여러 탭의 동시 갱신). 패밀리는 그대로 둔다.
+    RACED = 2
+
+    _rotate_script = None
+    _revoke_if_rotated_script = None
+    _revoke_all_script = None
+    _convert_legacy_script = None
+
+    @staticmethod
+    def token_digest(refresh_token: str) -> bytes:
+        return hashlib.sha256(refresh_token.encode("utf-8")).digest()[:16]
+
+    @staticmethod
+    def normalize_device(device: str | None) -> str:
+        return (device or "")[:DEVICE_MAX_LENGTH]
+
+    @staticmethod
+    def _client():
+        return get_redis_connection("default")
+
+    @staticmethod
+    def reuse_grace_seconds() -> int:
+        return int(settings.REFRESH_TOKEN_ROTATION["REUSE_GRACE_SECONDS"])
+
+    @staticmethod
+    def token_key(user_id, jti: str) -> str:
+        return cache.make_key(f"refresh_token:{user_id}:{jti}")
+
+    @staticmethod
+    def rotated_key(user_id, jti: str) -> str:
+        return cache.make_key(f"refresh_token_rotated:{user_id}:{jti}")
+
+    @staticmethod
+    def family_key(user_id, family: str) -> str:
+        return cache.make_key(f"refresh_token_family:{user_id}:{family}")
+
+    @staticmethod
+    def index_key(user_id) -> str:
+        return cache.make_key(f"refresh_sessions:{user_id}")
+
+    @classmethod
+    def _script(cls, attr: str, source: str):
+        script = getattr(cls, attr)
+        if script is None:
+            script = cls._client().register_script(source)
+            setattr(cls, attr, script)
+        return script
+
+    @classmethod
+    def save(cls, user_id, jti: str, family: str, refresh_token: str,
+             ttl_seconds: int, device: str | None = None) -> None:
+        now = int(time.time())
+        token_key = cls.token_key(user_id, jti)
+        index_key = cls.index_key(user_id)
+
+        pipe = cls._client().pipeline(transaction=True)
+        pipe.hset(token_key, mapping={
+            'h': cls.token_digest(refresh_token),
+            'i': now,
+            'e': now + ttl_seconds,
+            'd': cls.normalize_device(device),
+        })
+        pipe.expire(token_key, ttl_seconds)
+        pipe.set(cls.family_key(user_id, family), jti, ex=ttl_seconds)
+        pipe.zremrangebyscore(index_key, "-inf", now)
+        pipe.zadd(index_key, {jti: now + ttl_seconds})
+        pipe.expire(index_key, ttl_seconds)
+        pipe.execute()
+
+    @classmethod
+    def rotate(cls, user_id, old_jti: str, new_jti: str, family: str,
+               new_refresh_token: str, ttl_seconds: int,
+               old_digest: bytes, device: str | None = None) -> int:
+        """
+        이전 JTI 확인/삭제와 새 JTI 저장을 Redis 안에서 한 번에 처리합니다.
+        이미 회전된 JTI 가 다시 사용되면 패밀리의 현재 토큰까지 삭제하고 REUSED 를 반환합니다.
+        회전 후 유예 시간 안의 재사용이면 아무것도 바꾸지 않고 RACED 를 반환합니다.
+        """
+        script = cls._script("_rotate_script", _ROTATE_SCRIPT)
+        return int(script(
+            keys=[
+                cls.token_key(user_id, old_jti),
+                cls.token_key(user_id, new_jti),
+                cls.rotated_key(user_id, old_jti),
+                cls.family_key(user_id, family),
+                cls.index_key(user_id),
+            ],
+            args=[
+                cls.token_digest(new_refresh_token),
+                ttl_seconds,
+                new_jti,
+                cls.token_key(user_id, ""),
+                old_jti,
+                int(time.time()),
+                old_digest,
+                cls.normalize_device(device),
+                cls.reuse_grace_seconds(),
+            ],
+        ))
+
+    @classmethod
+    def revoke_family_if_rotated(cls, user_id, jti: str, family: str) -> int:
+        """
+        이미 회전된 JTI 라면 패밀리의 현재 토큰을 삭제하고 REUSED 를 반환합니다.
+        회전 후 유예 시간 안이면 RACED, 회전된 적 없는 JTI 면 MISSING 을 반환합니다.
+        """
+        script = cls._script(
+            "_revoke_if_rotated_script", _REVOKE_IF_ROTATED_SCRIPT)
+        return int(script(
+            keys=[
+                cls.rotated_key(user_id, jti),
+                cls.family_key(user_id, family),
+                cls.index_key(user_id),
+            ],
+            args=[cls.token_key(user_id, ""), int(time.time()), cls.reuse_grace_seconds()],
+        ))
+
+    @classmethod
+    def revoke(cls, user_id, jti: str) -> int:
+        pipe = cls._client().pipeline(transaction=True)
+        pipe.delete(cls.token_key(user_id, jti))
+        pipe.zrem(cls.index_key(user_id), jti)
+        deleted_count, _ = pipe.execute()
+        return deleted_count
+
+    @classmethod
+    def active_jtis(cls, user_id) -> list[tuple[str, int]]:
+        """
+        세션 인덱스에서 아직 만료되지 않은 (JTI, 만료 시각) 목록을 반환합니다.
+        """
+        entries = cls._client().zrangebyscore(
+            cls.index_key(user_id), int(time.time()), "+inf", withscores=True)
+        return [(jti.decode() if isinstance(jti, bytes) else jti, int(expires_at))
+                for jti, expires_at in entries]
+
+    @classmethod
+    def revoke_all(cls, user_id) -> int:
+        script = cls._script("_revoke_all_script", _REVOKE_ALL_SCRIPT)
+        return int(script(
+            keys=[cls.index_key(user_id)],
+            args=[cls.token_key(user_id, ""), int(time.time())],
+        ))
+
+    @classmethod
+    def convert_legacy(cls, user_id, jti: str, raw_value: bytes, refresh_token: str,
+                       issued_at: int, expires_at: int) -> bool:
+        """
+        JWT 원문을 값으로 가진 기존 키를 압축 레코드로 바꾸고 세션 인덱스에 등록합니다.
+        변환 사이에 값이 바뀌었거나 삭제된 키는 건드리지 않습니다.
+        """
+        script = cls._script("_convert_legacy_script", _CONVERT_LEGACY_SCRIPT)
+        return bool(script(
+            keys=[cls.token_key(user_id, jti), cls.index_key(user_id)],
+            args=[raw_value, cls.token_digest(refresh_token),
+                  issued_at, expires_at, jti],
+        ))
+
+    @classmethod
+    def list_sessions(cls, user_id) -> list[dict]:
+        """
+        만료된 인덱스 항목은 조회 시점에 정리하고, 남은 세션을 만료 시각 순으로 반환합니다.
+        """
+        client = cls._client()
+        index_key = cls.index_key(user_id)
+
+        pipe = client.pipeline(transaction=True)
+        pipe.zremrangebyscore(index_key, "-inf", int(time.time()))
+        pipe.zrange(index_key, 0, -1, withscores=True)
+        _, entries = pipe.execute()
+        if not entries:
+            return []
+
+        jtis = [jti.decode() if isinstance(jti, bytes) else jti
+                for jti, _ in entries]
+        pipe = client.pipeline(transaction=False)
+        for jti in jtis:
+            pipe.hmget(cls.token_key(user_id, jti), 'i', 'd')
+        records = pipe.execute(raise_on_error=False)
+
+        sessions = []
+        for jti, (_, expires_at), record in zip(jtis, entries, records):
+            issued_at, device = (None, None) if isinstance(
+                record, Exception) else record
+            sessions.append({
+                'jti': jti,
+                'issued_at': int(issued_at) if issued_at else None,
+                'expires_at': int(expires_at),
+                'device': device.decode() if device else None,
+            })
+        return sessions
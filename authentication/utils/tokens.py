@@ -0,0 +1,110 @@
+import jwt
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError, TokenBackendExpiredToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from .jwt_keys import get_keyring
+from .token_blacklist import TokenBlacklist
+
+
+class KeyringTokenBackend(TokenBackend):
+    """
+    JWT_KEYRING 이 설정되어 있으면 현재 서명 키(RS256/EdDSA)로 서명하고 헤더에 kid 를 넣습니다.
+    검증은 토큰의 kid 로 keyring 에서 공개 키를 고릅니다.
+    keyring 이 없으면 SIMPLE_JWT 설정(HS256 + SIGNING_KEY) 그대로 동작합니다.
+    """
+
+    def encode(self, payload: dict) -> str:
+        keyring = get_keyring()
+        if keyring is None:
+            return super().encode(payload)
+
+        key = keyring.signing_key()
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload["aud"] = self.audience
+        if self.issuer is not None:
+            jwt_payload["iss"] = self.issuer
+        return jwt.encode(
+            jwt_payload,
+            key.private_key,
+            algorithm=key.algorithm,
+            headers={"kid": key.kid},
+            json_encoder=self.json_encoder,
+        )
+
+    def decode(self, token, verify: bool = True) -> dict:
+        keyring = get_keyring()
+        if keyring is None:
+            return super().decode(token, verify)
+
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except jwt.InvalidTokenError as e:
+            raise TokenBackendError(_("Token is invalid")) from e
+        if kid is None and settings.JWT_KEYRING["ACCEPT_UNKEYED"]:
+            # keyring 도입 전에 SIGNING_KEY 로 서명된 토큰
+            return super().decode(token, verify)
+
+        key = keyring.verifying_key(kid)
+        if key is None:
+            raise TokenBackendError(_("Token is invalid"))
+        try:
+            return jwt.decode(
+                token,
+                key.public_key,
+                algorithms=[key.algorithm],
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.get_leeway(),
+                options={
+                    "verify_aud": self.audience is not None,
+                    "verify_signature": verify,
+                },
+            )
+        except jwt.ExpiredSignatureError as e:
+            raise TokenBackendExpiredToken(_("Token is expired")) from e
+        except jwt.InvalidTokenError as e:
+            raise TokenBackendError(_("Token is invalid")) from e
+
+
+token_backend = KeyringTokenBackend(
+    api_settings.ALGORITHM,
+    api_settings.SIGNING_KEY,
+    api_settings.VERIFYING_KEY,
+    api_settings.AUDIENCE,
+    api_settings.ISSUER,
+    None,
+    api_settings.LEEWAY,
+    api_settings.JSON_ENCODER,
+)
+
+
+class AccessToken(tokens.AccessToken):
+    _token_backend = token_backend
+
+
+class RefreshToken(tokens.RefreshToken):
+    """
+    블랙리스트를 DB(token_blacklist 앱) 대신 Redis(TokenBlacklist)에 기록합니다.
+    발급된 토큰 목록은 RefreshTokenStore 가 관리하므로 outstand() 는 아무것도 하지 않습니다.
+    """
+    access_token_class = AccessToken
+    _token_backend = token_backend
+
+    def verify(self, *args, **kwargs) -> None:
+        self.check_blacklist()
+        super().verify(*args, **kwargs)
+
+    def check_blacklist(self) -> None:
+        if TokenBlacklist.contains(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self) -> bool:
+        return TokenBlacklist.add(self.payload[api_settings.JTI_CLAIM], self.payload["exp"])
+
+    def outstand(self) -> None:
+        return None
@@ -1,3 +1,10 @@
 from .access_token_view import AccessTokenObtainView, AccessTokenRefreshView
-from .user_profile_view import UserProfileView
-from .refresh_token_view import RefreshTokenRevokeView
+from .user_profile_view import UserProfileView, UserProfileBatchView
+from .media_view import MediaView
+from .jwks_view import JWKSView
+from .revocation_view import RevocationFilterView
+from .refresh_token_view import (
+    RefreshTokenRevokeView,
+    RefreshTokenRevokeAllView,
+    RefreshTokenSessionListView,
+)
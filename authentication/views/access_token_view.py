@@ -2,10 +2,11 @@ from rest_framework.response import Response
 from rest_framework import status, permissions
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenRefreshView
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 import logging
 from ..serializers.refresh_token_serializer import CookieTokenRefreshSerializer
 from ..services.access_token_service import SocialAuthService
-from ..services.access_token_service import TokenRefreshService
+from ..services.access_token_service import TokenRefreshService, RefreshTokenRaceError
 from django.contrib.auth import logout
 logger = logging.getLogger('prod')
 
@@ -21,7 +22,7 @@ class AccessTokenObtainView(APIView):
             logger.info(
                 f"Starting JWT issuance for social user {user.username} ({user.email})")
             response_data, cookie_settings = SocialAuthService.obtain_jwt_for_social_user(
-                user)
+                user, device=request.META.get('HTTP_USER_AGENT'))
 
             response = Response(response_data, status=status.HTTP_200_OK)
             response.set_cookie(**cookie_settings)
@@ -46,34 +47,52 @@ class AccessTokenRefreshView(TokenRefreshView):
     serializer_class = CookieTokenRefreshSerializer
 
     def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data)
 
-        if response.status_code == status.HTTP_200_OK:
-            new_refresh_token_from_response = response.data.get('refresh')
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            try:
+                TokenRefreshService.detect_refresh_token_reuse(
+                    request.COOKIES.get('refresh_token'))
+            except RefreshTokenRaceError as race:
+                return self._race_response(race)
+            raise InvalidToken(e.args[0]) from e
 
-            if new_refresh_token_from_response:
-                try:
-                    old_refresh_token_from_cookie = request.COOKIES.get(
-                        'refresh_token')
-                    logger.info(
-                        f"🎄🎄🎄🎄🎄🎄🎄🎄🎄🎄🎄🎄🎄🎄🎄🎄🎄🎄🎄🎄🎄쿠키에서 이전 리프레시 토큰을 찾았습니다: {old_refresh_token_from_cookie}")
+        response = Response(serializer.validated_data, status=status.HTTP_200_OK)
+        new_refresh_token_from_response = response.data.get('refresh')
 
-                    cookie_settings = TokenRefreshService.manage_refreshed_tokens_in_cache_and_cookies(
-                        old_refresh_token_from_cookie,
-                        new_refresh_token_from_response
-                    )
+        if new_refresh_token_from_response:
+            try:
+                cookie_settings = TokenRefreshService.manage_refreshed_tokens_in_cache_and_cookies(
+                    serializer.rotation,
+                    new_refresh_token_from_response
+                )
 
-                    response.set_cookie(**cookie_settings)
-                    logger.info("클라이언트 쿠키에 새로운 리프레시 토큰 설정 완료.")
-                except ValueError as e:
-                    logger.error(f"토큰 갱신 후 처리 오류: {e}")
-                    return Response({"detail": f"토큰 처리 중 오류가 발생했습니다: {e}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-                except Exception as e:
-                    logger.critical(
-                        f"토큰 갱신 후 처리 중 예상치 못한 심각한 오류 발생: {e}", exc_info=True)
-                    return Response({"detail": "내부 서버 오류가 발생했습니다."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            else:
-                logger.warning(
-                    "새 리프레시 토큰을 응답에서 찾을 수 없어 Redis/쿠키 업데이트를 건너뜀. Simple JWT의 ROTATE_REFRESH_TOKENS 설정을 확인해주세요.")
+                response.set_cookie(**cookie_settings)
+                logger.info("클라이언트 쿠키에 새로운 리프레시 토큰 설정 완료.")
+            except RefreshTokenRaceError as e:
+                return self._race_response(e)
+            except InvalidToken as e:
+                logger.warning(f"리프레시 토큰 회전 거부: {e}")
+                response = Response(e.detail, status=e.status_code)
+                response.delete_cookie('refresh_token')
+                return response
+            except ValueError as e:
+                logger.error(f"토큰 갱신 후 처리 오류: {e}")
+                return Response({"detail": f"토큰 처리 중 오류가 발생했습니다: {e}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            except Exception as e:
+                logger.critical(
+                    f"토큰 갱신 후 처리 중 예상치 못한 심각한 오류 발생: {e}", exc_info=True)
+                return Response({"detail": "내부 서버 오류가 발생했습니다."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        else:
+            logger.warning(
+                "새 리프레시 토큰을 응답에서 찾을 수 없어 Redis/쿠키 업데이트를 건너뜀. Simple JWT의 ROTATE_REFRESH_TOKENS 설정을 확인해주세요.")
 
         return response
+
+    @staticmethod
+    def _race_response(error: RefreshTokenRaceError) -> Response:
+        # 먼저 회전한 요청이 내려준 새 쿠키를 지우지 않도록 쿠키는 건드리지 않는다.
+        return Response({'detail': str(error), 'code': 'token_rotation_in_progress'},
+                        status=status.HTTP_409_CONFLICT)
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views import View
+
+from ..utils.jwt_keys import get_keyring
+
+
+class JWKSView(View):
+    """
+    다운스트림 서비스가 액세스 토큰을 직접 검증할 수 있도록 공개 키(JWKS)를 내려줍니다.
+    공개 키 구성이 바뀔 때만 본문/ETag 가 바뀌므로 JWT_KEYRING["JWKS_MAX_AGE"] 동안 캐시해도 됩니다.
+    (새 키는 PUBLISH_AHEAD 만큼 먼저 공개되므로 캐시가 만료되기 전에 서명에 쓰이지 않음)
+    """
+    http_method_names = ['get', 'head']
+
+    def get(self, request):
+        keyring = get_keyring()
+        if keyring is None:
+            raise Http404("JWT keyring 이 설정되어 있지 않습니다.")
+
+        body, etag = keyring.jwks()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(body, content_type='application/jwk-set+json')
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=settings.JWT_KEYRING["JWKS_MAX_AGE"])
+        return response
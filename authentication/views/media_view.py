@@ -0,0 +1,147 @@
+import os
+import re
+import mimetypes
+import logging
+from urllib.parse import quote
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views import View
+
+from ..services.media_blob_service import MediaBlobService
+
+logger = logging.getLogger('prod')
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class _RangeFile:
+    """
+    파일의 [start, start + length) 구간만 읽히는 파일 객체. (fileno 가 없어 sendfile 대신 read 로 전송됨)
+    """
+
+    def __init__(self, file, start: int, length: int):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+class MediaView(View):
+    """
+    MEDIA_URL 아래의 프로필 이미지를 전송합니다.
+    경로 확인만 여기서 하고, MEDIA_SERVING["SENDFILE"] 이 설정되어 있으면 전송은 앞단 프록시에 넘깁니다.
+    그렇지 않으면 FileResponse(wsgi.file_wrapper) 로 보내며 조건부 요청(ETag/Last-Modified)과 단일 Range 를 처리합니다.
+    내용 주소 파일은 이름이 곧 내용이므로 1년 immutable 로 캐시합니다.
+    """
+    http_method_names = ['get', 'head']
+    IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+    def get(self, request, path):
+        options = settings.MEDIA_SERVING
+        if not path.startswith(tuple(options["ALLOWED_PREFIXES"])):
+            raise Http404
+        storage = MediaBlobService.storage()
+        try:
+            full_path = storage.path(path)
+            stat = os.stat(full_path)
+        except (SuspiciousFileOperation, OSError):
+            raise Http404
+        if not os.path.isfile(full_path):
+            raise Http404
+
+        immutable = MediaBlobService.is_content_addressed(path)
+        if immutable:
+            etag = f'"{os.path.basename(path).rsplit(".", 1)[0]}"'
+        else:
+            etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        last_modified = http_date(stat.st_mtime)
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=int(stat.st_mtime))
+        if response is None:
+            sendfile = options["SENDFILE"]
+            if sendfile == 'nginx':
+                response = HttpResponse(content_type=content_type)
+                response['X-Accel-Redirect'] = options["INTERNAL_URL"] + quote(path)
+            elif sendfile == 'sendfile':
+                response = HttpResponse(content_type=content_type)
+                response['X-Sendfile'] = full_path
+            else:
+                response = self._file_response(
+                    request, full_path, stat.st_size, (etag, last_modified), content_type)
+
+        response['ETag'] = etag
+        response['Last-Modified'] = last_modified
+        if immutable:
+            patch_cache_control(response, public=True, max_age=self.IMMUTABLE_MAX_AGE, immutable=True)
+        else:
+            patch_cache_control(response, public=True, max_age=options["MAX_AGE"])
+        return response
+
+    @staticmethod
+    def _parse_range(request, size: int, validators: tuple[str, str]):
+        """
+        단일 바이트 범위만 지원합니다. (start, end) / 만족할 수 없으면 False / 전체 전송이면 None.
+        """
+        header = request.META.get('HTTP_RANGE')
+        if not header:
+            return None
+        # If-Range 가 현재 ETag/Last-Modified 와 다르면 파일이 바뀐 것이므로 전체를 보낸다.
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if if_range and if_range not in validators:
+            return None
+
+        match = _RANGE.match(header.strip())
+        if not match or match.groups() == ('', ''):
+            return None
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            if last and int(last) < start:
+                return None
+        else:
+            start, end = max(size - int(last), 0), size - 1
+        if start >= size or size == 0:
+            return False
+        return start, end
+
+    def _file_response(self, request, full_path: str, size: int, validators, content_type: str):
+        if request.method == 'HEAD':
+            response = HttpResponse(content_type=content_type)
+            response['Content-Length'] = size
+            response['Accept-Ranges'] = 'bytes'
+            return response
+
+        byte_range = self._parse_range(request, size, validators)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f"bytes */{size}"
+            return response
+
+        file = open(full_path, 'rb')
+        if byte_range is None:
+            response = FileResponse(file, content_type=content_type)
+        else:
+            start, end = byte_range
+            response = FileResponse(
+                _RangeFile(file, start, end - start + 1), status=206, content_type=content_type)
+            response['Content-Length'] = end - start + 1
+            response['Content-Range'] = f"bytes {start}-{end}/{size}"
+        response['Accept-Ranges'] = 'bytes'
+        return response
@@ -4,7 +4,7 @@ from rest_framework import status, permissions
 from rest_framework.views import APIView
 import logging
 
-from ..services.refresh_token_service import RevokeTokenService
+from ..services.refresh_token_service import RevokeTokenService, RefreshTokenSessionService
 
 
 logger = logging.getLogger('prod')
@@ -52,3 +52,45 @@ class RefreshTokenRevokeView(APIView):
                 {"error": "토큰 무효화 중 오류가 발생했습니다."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class RefreshTokenRevokeAllView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def delete(self, request):
+        try:
+            revoked_count = RevokeTokenService.revoke_all_refresh_tokens(
+                request.user.id)
+
+            response = Response(
+                {"message": "모든 기기에서 로그아웃되었습니다.", "revoked": revoked_count},
+                status=status.HTTP_200_OK
+            )
+            response.delete_cookie('refresh_token')
+            return response
+
+        except Exception as e:
+            logger.critical(
+                f"리프레시 토큰 전체 무효화 중 예상치 못한 심각한 오류 발생 (사용자: {request.user.id}): {e}", exc_info=True)
+            return Response(
+                {"error": "토큰 무효화 중 오류가 발생했습니다."},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class RefreshTokenSessionListView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            sessions = RefreshTokenSessionService.list_sessions(
+                request.user.id, request.COOKIES.get('refresh_token'))
+            return Response({"sessions": sessions}, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.critical(
+                f"활성 세션 조회 중 예상치 못한 심각한 오류 발생 (사용자: {request.user.id}): {e}", exc_info=True)
+            return Response(
+                {"error": "세션 조회 중 오류가 발생했습니다."},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -0,0 +1,45 @@
+import hmac
+import logging
+
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.views import View
+
+from ..utils.revocation_filter import RevocationFilter
+
+logger = logging.getLogger('prod')
+
+
+class RevocationFilterView(View):
+    """
+    무효화된 토큰 패밀리/유저의 Bloom filter 를 바이너리 블롭(utils.revocation_filter 형식)으로 내려줍니다.
+    ?have=버킷.버전,버킷.버전 으로 이미 가진 버킷을 알려주면 바뀐 버킷만 보내고, 바뀐 게 없으면 304 입니다.
+    REVOCATION_FILTER["GATEWAY_TOKENS"] 중 하나를 X-Gateway-Token 헤더로 보낸 게이트웨이만 받을 수 있습니다.
+    """
+    http_method_names = ['get']
+
+    @staticmethod
+    def is_gateway(request) -> bool:
+        presented = request.headers.get('X-Gateway-Token', '').encode()
+        return bool(presented) and any(
+            hmac.compare_digest(presented, token.encode())
+            for token in RevocationFilter.options().get('GATEWAY_TOKENS', []))
+
+    def get(self, request):
+        if not self.is_gateway(request):
+            logger.warning(f"게이트웨이 토큰 없는 무효화 필터 요청 거부: {request.META.get('REMOTE_ADDR')}")
+            return HttpResponseForbidden()
+
+        known = {}
+        for item in request.GET.get('have', '').split(','):
+            bucket, _, version = item.partition('.')
+            if bucket.isdigit() and version.isdigit():
+                known[int(bucket)] = int(version)
+
+        body, changed = RevocationFilter.blob(known)
+        if known and not changed:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type='application/octet-stream')
+        patch_cache_control(response, no_store=True)
+        return response
@@ -1,14 +1,23 @@
-from rest_framework import viewsets, permissions, status
+from rest_framework import viewsets, permissions, status, exceptions
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.authentication import SessionAuthentication
+from django.http import HttpResponse
+from django.contrib.auth import get_user_model
+from django.utils.cache import get_conditional_response, patch_cache_control
 from ..models import UserProfile
-from ..serializers.user_profile_serializer import UserProfileSerializer
+from ..serializers.user_profile_serializer import UserProfileSerializer, UserProfileSummarySerializer
 from ..services.user_profile_service import UserProfileService
+from ..utils.authentication import JWTStatelessUserAuthentication
 from ..utils.cache import CacheAside
+from ..utils.cache_keys import USER_PROFILE, USER_PROFILE_SUMMARY
 from ..services.refresh_token_service import RevokeTokenService
 import logging
 
 logger = logging.getLogger('prod')
 
+User = get_user_model()
+
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
@@ -22,32 +31,52 @@ class UserProfileView(viewsets.ModelViewSet):
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
 
+    def get_authenticators(self):
+        # 조회는 토큰 클레임만으로 유저를 만들어(User 조회 없음) 캐시 히트 시 DB 를 타지 않는다.
+        if self.request.method in permissions.SAFE_METHODS:
+            return [JWTStatelessUserAuthentication(), SessionAuthentication()]
+        return super().get_authenticators()
+
     def get_queryset(self):
         if self.action in ['retrieve', 'update', 'destroy'] and 'pk' not in self.kwargs:
-            return UserProfile.objects.filter(user=self.request.user)
-        return super().get_queryset()
+            return UserProfile.objects.select_related('user').filter(user_id=self.request.user.id)
+        return super().get_queryset().select_related('user')
 
     def get_object(self, is_get=False):
-        logger.info(
-            f"get_object 호출: is_get={is_get}, user={self.get_queryset().first().name}")
         user_id = self.request.user.id
-        cached_data = CacheAside.get(user_id)
-        if cached_data and is_get:
-            logger.info(f"캐시 get_object 히트: user_profile:{user_id}")
-            return cached_data
-        else:
-            if not (obj := self.get_queryset().first()):
-                obj = UserProfile.objects.create(user=self.request.user)
-            self.check_object_permissions(self.request, obj)
+        logger.info(f"get_object 호출: is_get={is_get}, user_id={user_id}")
         if is_get:
-            serializer = self.get_serializer(obj)
-            CacheAside.set(user_id, serializer.data)
-            return serializer.data
+            return CacheAside.get_or_compute_cached(
+                USER_PROFILE.key(user_id), self._load_profile_data)
+
+        return self._get_or_create_profile()
+
+    def _get_or_create_profile(self):
+        if not (obj := self.get_queryset().first()):
+            user_id = self.request.user.id
+            # 토큰만으로 인증된 요청은 탈퇴한 유저의 토큰일 수 있다.
+            if not User.objects.filter(id=user_id, is_active=True).exists():
+                raise exceptions.AuthenticationFailed("유저를 찾을 수 없습니다.")
+            obj = UserProfile.objects.create(user_id=user_id)
+        self.check_object_permissions(self.request, obj)
         return obj
 
+    def _load_profile_data(self):
+        logger.info(f"캐시 미스, 프로필 조회: user_profile:{self.request.user.id}")
+        serializer = self.get_serializer(self._get_or_create_profile())
+        return serializer.data
+
     def retrieve(self, request, *args, **kwargs):
+        # 캐시에 인코딩된 JSON 바이트를 다시 직렬화하지 않고 그대로 응답한다.
+        # ETag 는 캐시 프레임에 함께 저장된 값 해시이므로, If-None-Match 가 맞으면 본문 없이 304 를 준다.
         user_profile = self.get_object(is_get=True)
-        return Response(user_profile)
+        response = get_conditional_response(request, etag=user_profile.etag)
+        if response is None:
+            response = HttpResponse(
+                user_profile.as_json_bytes(), content_type='application/json')
+        response['ETag'] = user_profile.etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
 
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -57,21 +86,95 @@ class UserProfileView(viewsets.ModelViewSet):
         updated = UserProfileService.update_user_profile(
             instance, serializer.validated_data)
         updated_serializer = self.get_serializer(updated)
-        CacheAside.set(request.user.id, updated_serializer.data)
-        return Response(updated_serializer.data)
+        cached = CacheAside.set(
+            USER_PROFILE.key(request.user.id), updated_serializer.data)
+        CacheAside.delete(USER_PROFILE_SUMMARY.key(request.user.id))
+        return Response(updated_serializer.data, headers={'ETag': cached.etag})
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        refresh_token_value = request.COOKIES.get('refresh_token')
-        CacheAside.delete(request.user.id)
-        RevokeTokenService.revoke_refresh_token(
-            refresh_token_value, request.user.id)
-
-        response = Response(
-            {"message": "리프레시 토큰이 성공적으로 무효화되었습니다."},
-            status=status.HTTP_200_OK
-        )
+        CacheAside.delete(USER_PROFILE.key(request.user.id))
+        CacheAside.delete(USER_PROFILE_SUMMARY.key(request.user.id))
+        RevokeTokenService.revoke_all_refresh_tokens(request.user.id)
+
+        response = Response(status=status.HTTP_204_NO_CONTENT)
         response.delete_cookie('refresh_token')
         UserProfileService.delete_user_profile(
             profile_instance=instance, user_id=request.user.id)
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        return response
+
+
+class UserProfileBatchView(APIView):
+    """
+    여러 유저의 프로필 요약을 한 번에 조회합니다.
+    GET ?ids=1,2,3 (또는 ids=1&ids=2) / POST {"ids": [1, 2, 3]}
+    결과는 요청한 순서대로 반환하며, 프로필이 없는 id 자리는 null 입니다.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    MAX_IDS = 300
+    NEGATIVE_TTL = 60
+
+    def get(self, request):
+        raw_ids = []
+        for value in request.query_params.getlist('ids'):
+            raw_ids.extend(part for part in value.split(',') if part)
+        return self._lookup(raw_ids)
+
+    def post(self, request):
+        raw_ids = request.data.get('ids') if hasattr(request.data, 'get') else None
+        if not isinstance(raw_ids, list):
+            return Response(
+                {"error": "ids 는 유저 ID 목록이어야 합니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return self._lookup(raw_ids)
+
+    def _lookup(self, raw_ids: list):
+        try:
+            user_ids = [int(user_id) for user_id in raw_ids]
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "ids 에 정수가 아닌 값이 있습니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not user_ids:
+            return Response(
+                {"error": "ids 가 필요합니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(user_ids) > self.MAX_IDS:
+            return Response(
+                {"error": f"한 번에 최대 {self.MAX_IDS}개까지 조회할 수 있습니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        profiles = self._get_summaries(list(dict.fromkeys(user_ids)))
+        # 캐시의 인코딩된 JSON 바이트를 이어 붙여 응답한다. (다시 직렬화하지 않음)
+        body = b'{"results":[' + b','.join(
+            profiles[user_id].as_json_bytes() if user_id in profiles else b'null'
+            for user_id in user_ids
+        ) + b']}'
+        return HttpResponse(body, content_type='application/json')
+
+    def _get_summaries(self, user_ids: list[int]) -> dict:
+        keys = {user_id: USER_PROFILE_SUMMARY.key(user_id) for user_id in user_ids}
+        cached = CacheAside.get_many_cached(list(keys.values()))
+
+        missing = [user_id for user_id in user_ids if keys[user_id] not in cached]
+        if missing:
+            logger.info(f"프로필 일괄 조회 캐시 미스: {len(missing)}/{len(user_ids)}건")
+            # 캐시 값은 모든 호출자가 공유하므로 요청 없이 직렬화한다. (Host 로 만든 절대 URL 을 넣지 않음)
+            loaded = {
+                profile.user_id: UserProfileSummarySerializer(profile).data
+                for profile in UserProfile.objects.filter(user_id__in=missing)
+            }
+            cached.update(CacheAside.set_many(
+                {keys[user_id]: loaded.get(user_id) for user_id in missing},
+                negative_timeout=self.NEGATIVE_TTL,
+            ))
+
+        return {
+            user_id: cached[keys[user_id]]
+            for user_id in user_ids
+            if keys[user_id] in cached and not cached[keys[user_id]].is_negative
+        }
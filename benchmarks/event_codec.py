@@ -0,0 +1,62 @@
+"""
+프로필 이벤트 인코딩 벤치마크 (이벤트당 바이트 / 인코딩 시간)
+
+    json   : 기존 json.dumps(ensure_ascii=False) 경로
+    msgpack: 스키마 ID + 필드 순서 배열 (MsgpackEventCodec)
+
+    uv run python -m benchmarks.event_codec --count 100000
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from authentication.clients.event_codec import (  # noqa: E402
+    JsonEventCodec,
+    MsgpackEventCodec,
+    SchemaRegistry,
+)
+
+
+def make_profile(user_id: int) -> dict:
+    return {
+        'id': user_id,
+        'username': f'user{user_id}',
+        'email': f'user{user_id}@example.com',
+        'name': f'홍길동{user_id}',
+        'bio': 'https://github.com/text-neck',
+        'location': 'Seoul, Korea',
+        'profile_picture': f'https://cdn.example.com/media/profile_pictures/{user_id}_photo.jpg',
+        'uid': str(100000000000000000000 + user_id),
+    }
+
+
+def measure(name, codec, schema, profiles):
+    started = time.perf_counter()
+    encoded = [codec.encode(schema, profile) for profile in profiles]
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(data) for data in encoded)
+    print(f"{name:<8} events={len(profiles):>8} bytes/event={total / len(profiles):>7.1f} "
+          f"encode={elapsed / len(profiles) * 1e6:>6.2f} us/event")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    schema = SchemaRegistry().latest('user-profile')
+    profiles = [make_profile(i + 1) for i in range(args.count)]
+
+    json_total = measure('json', JsonEventCodec, schema, profiles)
+    msgpack_total = measure('msgpack', MsgpackEventCodec, schema, profiles)
+    print(f"msgpack/json = {msgpack_total / json_total:.2%}")
+
+
+if __name__ == '__main__':
+    main()
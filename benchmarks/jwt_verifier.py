@@ -0,0 +1,64 @@
+"""
+액세스 토큰 검증 벤치마크 (토큰당 검증 시간)
+
+    decode  : 기존 extract_uid_from_token 경로 (매번 os.environ 조회 + jwt.decode)
+    verifier: JWTVerifier (준비된 키 + 검증 결과 LRU)
+
+    uv run python -m benchmarks.jwt_verifier --tokens 1000 --rounds 20
+"""
+import os
+import sys
+import time
+import argparse
+
+import jwt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from authentication.utils.jwt_decoder import JWTVerifier  # noqa: E402
+
+SECRET = 'benchmark-secret-key-benchmark-secret-key'
+
+
+def make_tokens(count: int) -> list[str]:
+    exp = int(time.time()) + 300
+    return [jwt.encode({'user_id': i, 'uid': str(i), 'exp': exp, 'token_type': 'access'},
+                       SECRET, algorithm='HS256') for i in range(count)]
+
+
+def legacy_decode(token: str) -> dict:
+    return jwt.decode(token, os.environ.get('JWT_BENCHMARK_SECRET', SECRET),
+                      algorithms=[os.environ.get('JWT_ALGORITHM', 'HS256')])
+
+
+def measure(name, verify, tokens, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for token in tokens:
+            verify(token)
+    elapsed = time.perf_counter() - started
+    calls = len(tokens) * rounds
+    print(f"{name:<16} calls={calls:>8} verify={elapsed / calls * 1e6:>7.2f} us/token")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tokens', type=int, default=1000,
+                        help="서로 다른 토큰 수 (동시에 활동하는 유저 수)")
+    parser.add_argument('--rounds', type=int, default=20,
+                        help="토큰마다 반복 검증 횟수 (유저당 요청 수)")
+    args = parser.parse_args()
+
+    tokens = make_tokens(args.tokens)
+    legacy = measure('decode', legacy_decode, tokens, args.rounds)
+    uncached = measure('verifier(no lru)', JWTVerifier(SECRET, max_entries=0).verify,
+                       tokens, args.rounds)
+    cached = measure('verifier', JWTVerifier(SECRET, max_entries=args.tokens).verify,
+                     tokens, args.rounds)
+    print(f"verifier/decode = {cached / legacy:.2%} (no lru: {uncached / legacy:.2%})")
+
+
+if __name__ == '__main__':
+    main()
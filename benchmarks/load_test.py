@@ -0,0 +1,387 @@
+"""
+인증 엔드포인트 부하 테스트 (엔드포인트별 처리량 / p50 / p95 / p99 지연)
+
+가상 유저 하나가 다음 순서로 요청합니다.
+    access_token.issue -> (profile.get, profile.put, refresh.rotate) x --rounds
+    -> refresh.revoke -> access_token.issue -> profile.delete
+
+WSGI(config.wsgi) / ASGI(config.asgi) 애플리케이션을 프로세스 안에서 직접 호출하므로 네트워크/서버 설정과 무관하게
+애플리케이션 자체의 지연을 잽니다. DB 는 임시 SQLite 파일, Redis 는 LOADTEST_REDIS_URL 이 없으면 fakeredis 입니다.
+(benchmarks.loadtest_settings)
+
+    uv run python -m benchmarks.load_test --app wsgi --users 200 --concurrency 4
+    uv run python -m benchmarks.load_test --app asgi --users 200 --concurrency 16 --output asgi.json
+
+기준선 비교: --baseline 파일의 같은 앱 기록보다 p95 가 --threshold 비율 이상 느려졌거나
+오류가 생긴 엔드포인트가 있거나, 중단된 가상 유저가 늘면 종료 코드 1 입니다. --write-baseline 은 현재 결과를 기준선으로 저장합니다.
+"""
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+import statistics
+from http.cookies import SimpleCookie
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['DJANGO_SETTINGS_MODULE'] = os.environ.get(
+    'LOADTEST_SETTINGS_MODULE', 'benchmarks.loadtest_settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import (  # noqa: E402
+    BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model)
+from django.contrib.sessions.backends.db import SessionStore  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connections  # noqa: E402
+
+ENDPOINTS = (
+    'access_token.issue',
+    'profile.get',
+    'profile.put',
+    'refresh.rotate',
+    'refresh.revoke',
+    'profile.delete',
+)
+EXPECTED_STATUS = {'profile.delete': 204}
+
+User = get_user_model()
+
+
+class Response:
+    def __init__(self, status: int, headers: list[tuple[str, str]], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def cookie(self, name: str) -> str | None:
+        for header, value in self.headers:
+            if header.lower() == 'set-cookie':
+                cookie = SimpleCookie()
+                cookie.load(value)
+                if name in cookie and cookie[name].value:
+                    return cookie[name].value
+        return None
+
+    def json(self) -> dict:
+        return json.loads(self.body or b'{}')
+
+
+class ScenarioError(Exception):
+    pass
+
+
+def login_session(user) -> str:
+    """
+    소셜 로그인 직후와 같은 세션을 만들고 세션 키를 반환합니다. (측정하지 않는 준비 단계)
+    """
+    session = SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.create()
+    return session.session_key
+
+
+def virtual_user(index: int, rounds: int):
+    """
+    (엔드포인트, 메서드, 경로, 헤더, 본문) 을 yield 하고 Response 를 돌려받는 시나리오.
+    """
+    user = User.objects.create(username=f'load-{index}-{time.monotonic_ns()}', email=f'load{index}@example.com')
+
+    def issue():
+        cookie = f'{settings.SESSION_COOKIE_NAME}={login_session(user)}'
+        response = yield ('access_token.issue', 'GET', '/auth/v2/access-token/', {'cookie': cookie}, b'')
+        access, refresh = response.json().get('access'), response.cookie('refresh_token')
+        if not (access and refresh):
+            raise ScenarioError('토큰 발급 실패')
+        return access, refresh
+
+    access, refresh = yield from issue()
+    for round_ in range(rounds):
+        bearer = {'authorization': f'Bearer {access}'}
+        yield ('profile.get', 'GET', '/auth/v2/profile/me/', bearer, b'')
+        body = json.dumps({'name': f'load {index}', 'bio': f'https://example.com/load/{index}/{round_}'}).encode()
+        yield ('profile.put', 'PUT', '/auth/v2/profile/me/',
+               {**bearer, 'content-type': 'application/json'}, body)
+        response = yield ('refresh.rotate', 'POST', '/auth/v2/access-token/refresh/',
+                          {'cookie': f'refresh_token={refresh}'}, b'')
+        access, refresh = response.json().get('access'), response.cookie('refresh_token')
+        if not (access and refresh):
+            raise ScenarioError('토큰 갱신 실패')
+
+    yield ('refresh.revoke', 'DELETE', '/auth/v2/refresh-token/revoke/',
+           {'authorization': f'Bearer {access}', 'cookie': f'refresh_token={refresh}'}, b'')
+    access, _ = yield from issue()
+    yield ('profile.delete', 'DELETE', '/auth/v2/profile/me/', {'authorization': f'Bearer {access}'}, b'')
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {endpoint: [] for endpoint in ENDPOINTS}
+        self.errors = {endpoint: 0 for endpoint in ENDPOINTS}
+        self.aborted = 0
+
+    def record(self, endpoint: str, seconds: float, response: Response) -> None:
+        with self.lock:
+            self.latencies[endpoint].append(seconds * 1000)
+            if response.status != EXPECTED_STATUS.get(endpoint, 200):
+                self.errors[endpoint] += 1
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        for endpoint, values in self.latencies.items():
+            if not values:
+                continue
+            cuts = statistics.quantiles(values, n=100, method='inclusive') if len(values) > 1 else values * 99
+            endpoints[endpoint] = {
+                'count': len(values),
+                'errors': self.errors[endpoint],
+                'rps': round(len(values) / elapsed, 1),
+                'mean_ms': round(statistics.fmean(values), 3),
+                'p50_ms': round(cuts[49], 3),
+                'p95_ms': round(cuts[94], 3),
+                'p99_ms': round(cuts[98], 3),
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        return {'requests': total, 'elapsed_s': round(elapsed, 3),
+                'rps': round(total / elapsed, 1), 'aborted_users': self.aborted,
+                'endpoints': endpoints}
+
+
+def _wsgi_environ(method: str, path: str, headers: dict, body: bytes) -> dict:
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'SCRIPT_NAME': '',
+        'SERVER_NAME': 'testserver',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+        'CONTENT_LENGTH': str(len(body)),
+        'HTTP_USER_AGENT': 'auth-load-test',
+    }
+    for header, value in headers.items():
+        if header == 'content-type':
+            environ['CONTENT_TYPE'] = value
+        else:
+            environ['HTTP_' + header.upper().replace('-', '_')] = value
+    return environ
+
+
+def call_wsgi(application, method, path, headers, body) -> Response:
+    captured = {}
+
+    def start_response(status, response_headers, exc_info=None):
+        captured['status'] = int(status.split(' ', 1)[0])
+        captured['headers'] = response_headers
+
+    result = application(_wsgi_environ(method, path, headers, body), start_response)
+    try:
+        content = b''.join(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return Response(captured['status'], captured['headers'], content)
+
+
+async def call_asgi(application, method, path, headers, body) -> Response:
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'user-agent', b'auth-load-test')]
+                   + [(name.encode(), value.encode()) for name, value in headers.items()],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    }
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    captured = {'body': []}
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        # 요청이 끝날 때까지 연결을 유지한다. (응답 후 핸들러가 취소함)
+        await asyncio.Future()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            captured['status'] = message['status']
+            captured['headers'] = [(name.decode(), value.decode()) for name, value in message['headers']]
+        elif message['type'] == 'http.response.body':
+            captured['body'].append(message.get('body', b''))
+
+    await application(scope, receive, send)
+    return Response(captured['status'], captured['headers'], b''.join(captured['body']))
+
+
+def run_wsgi(users: int, concurrency: int, rounds: int, recorder: Recorder) -> None:
+    from config.wsgi import application
+
+    def run_user(index: int) -> None:
+        scenario = virtual_user(index, rounds)
+        try:
+            request = next(scenario)
+            while True:
+                endpoint, method, path, headers, body = request
+                started = time.perf_counter()
+                response = call_wsgi(application, method, path, headers, body)
+                recorder.record(endpoint, time.perf_counter() - started, response)
+                request = scenario.send(response)
+        except StopIteration:
+            pass
+        except ScenarioError:
+            with recorder.lock:
+                recorder.aborted += 1
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(run_user, range(users)))
+
+
+def _advance(scenario, response=None):
+    # StopIteration 은 Future 로 넘길 수 없으므로 None 으로 바꿔 돌려준다.
+    try:
+        return scenario.send(response)
+    except StopIteration:
+        return None
+
+
+def run_asgi(users: int, concurrency: int, rounds: int, recorder: Recorder) -> None:
+    from config.asgi import application
+
+    async def run_user(index: int, semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            # 시나리오의 준비 단계(유저/세션 생성)는 ORM 을 쓰므로 이벤트 루프 밖에서 진행한다.
+            scenario = await asyncio.to_thread(virtual_user, index, rounds)
+            try:
+                request = await asyncio.to_thread(_advance, scenario)
+                while request is not None:
+                    endpoint, method, path, headers, body = request
+                    started = time.perf_counter()
+                    response = await call_asgi(application, method, path, headers, body)
+                    recorder.record(endpoint, time.perf_counter() - started, response)
+                    request = await asyncio.to_thread(_advance, scenario, response)
+            except ScenarioError:
+                recorder.aborted += 1
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+        await asyncio.gather(*(run_user(index, semaphore) for index in range(users)))
+
+    asyncio.run(main())
+
+
+def check_regressions(report: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for endpoint, expected in baseline.get('endpoints', {}).items():
+        current = report['endpoints'].get(endpoint)
+        if current is None:
+            regressions.append(f"{endpoint}: 측정되지 않음")
+            continue
+        limit = expected['p95_ms'] * (1 + threshold)
+        if current['p95_ms'] > limit:
+            regressions.append(
+                f"{endpoint}: p95 {current['p95_ms']:.2f}ms > 기준 {expected['p95_ms']:.2f}ms x {1 + threshold:.2f}")
+        if current['errors'] > expected.get('errors', 0):
+            regressions.append(f"{endpoint}: 오류 {current['errors']}건")
+    # 중간에 멈춘 가상 유저가 늘면 뒤 단계 요청이 빠져 p95 가 좋아 보일 수 있다.
+    if report['aborted_users'] > baseline.get('aborted_users', 0):
+        regressions.append(
+            f"중단된 가상 유저 {report['aborted_users']}명 > 기준 {baseline.get('aborted_users', 0)}명")
+    return regressions
+
+
+def print_report(app: str, report: dict) -> None:
+    print(f"{app}: requests={report['requests']} elapsed={report['elapsed_s']}s "
+          f"rps={report['rps']} aborted_users={report['aborted_users']}")
+    print(f"{'endpoint':<20}{'count':>7}{'errors':>7}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for endpoint, row in report['endpoints'].items():
+        print(f"{endpoint:<20}{row['count']:>7}{row['errors']:>7}{row['rps']:>9}"
+              f"{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--app', choices=('wsgi', 'asgi'), default='wsgi')
+    parser.add_argument('--users', type=int, default=100, help="가상 유저 수")
+    parser.add_argument('--concurrency', type=int, default=4, help="동시에 요청하는 가상 유저 수")
+    parser.add_argument('--rounds', type=int, default=5,
+                        help="가상 유저당 (조회, 수정, 갱신) 반복 횟수")
+    parser.add_argument('--warmup', type=int, default=10, help="측정에서 뺄 준비 가상 유저 수")
+    parser.add_argument('--output', help="결과 JSON 파일")
+    parser.add_argument('--baseline', help="기준선 JSON 파일 ({앱: 결과})")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="기준선 대비 허용하는 p95 증가 비율")
+    parser.add_argument('--write-baseline', action='store_true',
+                        help="현재 결과를 --baseline 파일의 이 앱 기준선으로 저장합니다.")
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    run = run_wsgi if args.app == 'wsgi' else run_asgi
+    if args.warmup:
+        run(args.warmup, args.concurrency, 1, Recorder())
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    run(args.users, args.concurrency, args.rounds, recorder)
+    report = recorder.report(time.perf_counter() - started)
+    report.update({'app': args.app, 'users': args.users,
+                   'concurrency': args.concurrency, 'rounds': args.rounds})
+    print_report(args.app, report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if not args.baseline:
+        return
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+
+    if args.write_baseline:
+        baselines[args.app] = report
+        with open(args.baseline, 'w') as f:
+            json.dump(baselines, f, indent=2, ensure_ascii=False)
+        print(f"기준선 저장: {args.baseline} ({args.app})")
+        return
+
+    if args.app not in baselines:
+        print(f"기준선 없음: {args.baseline} ({args.app}), 비교를 건너뜁니다.")
+        return
+    regressions = check_regressions(report, baselines[args.app], args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+    print(f"기준선 대비 회귀 없음 (threshold={args.threshold:.0%})")
+
+
+if __name__ == '__main__':
+    main()
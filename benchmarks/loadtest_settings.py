@@ -0,0 +1,55 @@
+"""
+load_test 용 설정: 임시 SQLite 파일 + Redis(LOADTEST_REDIS_URL, 없으면 fakeredis) + Kafka 비활성화.
+"""
+import os
+import tempfile
+
+os.environ.setdefault('SECRET_KEY', 'load-test-secret-key-load-test-secret-key')
+
+from config.settings.local import *  # noqa: E402,F401,F403
+from config.settings.kafka import *  # noqa: E402,F401,F403
+
+LOADTEST_DIR = os.environ.get('LOADTEST_DIR') or tempfile.mkdtemp(prefix='auth-loadtest-')
+
+SIMPLE_JWT = dict(SIMPLE_JWT, SIGNING_KEY=SECRET_KEY)  # noqa: F405
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(LOADTEST_DIR, 'db.sqlite3'),
+        'OPTIONS': {
+            'timeout': 30,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+        },
+    }
+}
+
+_redis_url = os.environ.get('LOADTEST_REDIS_URL')
+if _redis_url:
+    _pool_kwargs = {}
+else:
+    import fakeredis
+
+    _redis_url = 'redis://fakeredis:6379/0'
+    _pool_kwargs = {
+        'connection_class': fakeredis.FakeConnection,
+        'server': fakeredis.FakeServer(),
+    }
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': _redis_url,
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'CONNECTION_POOL_KWARGS': _pool_kwargs,
+        },
+    }
+}
+
+KAFKA_ENABLED = False
+MEDIA_ROOT = os.path.join(LOADTEST_DIR, 'media')
+TOKEN_PRUNING = dict(TOKEN_PRUNING, SCHEDULE_INTERVAL=0)  # noqa: F405
+DEBUG = False
+ALLOWED_HOSTS = ['*']
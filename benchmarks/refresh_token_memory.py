@@ -0,0 +1,120 @@
+"""
+리프레시 토큰 Redis 저장 형식 메모리 비교 벤치마크
+
+    기존: django-redis pickle 로 감싼 JWT 원문 문자열
+    신규: RefreshTokenStore 압축 레코드(hash: h/i/e/d)
+
+실제 Redis 가 필요합니다. (MEMORY USAGE / INFO memory 사용)
+    REDIS_URL=redis://localhost:6379/15 uv run python -m benchmarks.refresh_token_memory --count 20000
+"""
+import os
+import sys
+import time
+import uuid
+import pickle
+import argparse
+
+import jwt
+import redis
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.local')
+
+from authentication.utils.token_store import RefreshTokenStore  # noqa: E402
+
+TTL_SECONDS = 24 * 60 * 60
+DEVICE = ("Mozilla/5.0 (iPhone; CPU iPhone OS 17_5 like Mac OS X) "
+          "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 Mobile/15E148 Safari/604.1")
+
+
+def make_refresh_token(user_id: int) -> tuple[str, dict]:
+    now = int(time.time())
+    jti = uuid.uuid4().hex
+    claims = {
+        'token_type': 'refresh',
+        'exp': now + TTL_SECONDS,
+        'iat': now,
+        'jti': jti,
+        'user_id': str(user_id),
+        'email': f'user{user_id}@example.com',
+        'fam': jti,
+    }
+    return jwt.encode(claims, 'benchmark-secret-key-0123456789abcdef', algorithm='HS256'), claims
+
+
+def used_memory(client) -> int:
+    return int(client.info('memory')['used_memory'])
+
+
+def write_legacy(client, tokens):
+    pipe = client.pipeline(transaction=False)
+    for user_id, token, claims in tokens:
+        pipe.set(f":1:refresh_token:{user_id}:{claims['jti']}",
+                 pickle.dumps(token, pickle.HIGHEST_PROTOCOL), ex=TTL_SECONDS)
+    pipe.execute()
+
+
+def write_compact(client, tokens):
+    device = RefreshTokenStore.normalize_device(DEVICE)
+    pipe = client.pipeline(transaction=False)
+    for user_id, token, claims in tokens:
+        key = f":1:refresh_token:{user_id}:{claims['jti']}"
+        pipe.hset(key, mapping={
+            'h': RefreshTokenStore.token_digest(token),
+            'i': claims['iat'],
+            'e': claims['exp'],
+            'd': device,
+        })
+        pipe.expire(key, TTL_SECONDS)
+    pipe.execute()
+
+
+def measure(client, name, writer, tokens, sample):
+    client.flushdb()
+    before = used_memory(client)
+    writer(client, tokens)
+    after = used_memory(client)
+
+    sample_keys = [f":1:refresh_token:{user_id}:{claims['jti']}"
+                   for user_id, _, claims in tokens[:sample]]
+    pipe = client.pipeline(transaction=False)
+    for key in sample_keys:
+        pipe.memory_usage(key, samples=0)
+    per_key = [usage for usage in pipe.execute() if usage]
+
+    avg_key = sum(per_key) / len(per_key) if per_key else 0
+    total = after - before
+    print(f"{name:<8} keys={len(tokens):>8} used_memory_delta={total:>12,} B "
+          f"per_key(delta)={total / len(tokens):>8.1f} B per_key(MEMORY USAGE)={avg_key:>8.1f} B")
+    client.flushdb()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--sample', type=int, default=1000)
+    parser.add_argument('--redis-url', default=os.environ.get('REDIS_URL', 'redis://localhost:6379/15'))
+    args = parser.parse_args()
+
+    client = redis.Redis.from_url(args.redis_url)
+    if client.dbsize():
+        parser.error(f"{args.redis_url} 가 비어 있지 않습니다. 벤치마크 전용 DB 를 지정하세요.")
+
+    tokens = []
+    for i in range(args.count):
+        user_id = i % args.users + 1
+        token, claims = make_refresh_token(user_id)
+        tokens.append((user_id, token, claims))
+
+    sample = min(args.sample, args.count)
+    legacy = measure(client, 'legacy', write_legacy, tokens, sample)
+    compact = measure(client, 'compact', write_compact, tokens, sample)
+    if legacy:
+        print(f"compact/legacy = {compact / legacy:.2%}")
+
+
+if __name__ == '__main__':
+    main()
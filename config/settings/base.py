@@ -31,7 +31,6 @@ THIRD_PARTY_APPS = [
     'allauth.socialaccount.providers.google',
     'channels',
     'rest_framework_simplejwt',
-    'rest_framework_simplejwt.token_blacklist'
 ]
 
 LOCAL_APPS = ['authentication']
@@ -94,12 +93,21 @@ AUTHENTICATION_BACKENDS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.utils.authentication.JWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
-    )
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'authentication.utils.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'authentication.utils.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SOCIALACCOUNT_PROVIDERS = {
@@ -134,6 +142,20 @@ STATIC_ROOT = '/data/static/'
 MEDIA_URL = '/media/auth/'
 MEDIA_ROOT = '/data/media/'
 
+# 미디어 전송 방식
+# SENDFILE: "" (FileResponse, wsgi.file_wrapper 로 전송) / "nginx" (X-Accel-Redirect) / "sendfile" (X-Sendfile: uWSGI, Apache)
+# INTERNAL_URL: nginx 의 internal location (MEDIA_ROOT 를 alias 로 가리킴)
+MEDIA_SERVING = {
+    "SENDFILE": os.environ.get('MEDIA_SENDFILE', ''),
+    "INTERNAL_URL": os.environ.get('MEDIA_INTERNAL_URL', '/internal/media/auth/'),
+    "ALLOWED_PREFIXES": ("profile_pictures/",),
+    # 내용 주소가 아닌(이전 방식) 파일의 캐시 시간(초)
+    "MAX_AGE": int(os.environ.get('MEDIA_MAX_AGE', 300)),
+    # 캐시에 넣는 응답(프로필 일괄 조회)의 미디어 URL 기준 주소. 비우면 상대 경로(MEDIA_URL)로 내려준다.
+    # (요청마다 Host 가 다를 수 있으므로 캐시에는 요청에서 만든 절대 URL 을 넣지 않는다)
+    "PUBLIC_BASE_URL": os.environ.get('MEDIA_PUBLIC_BASE_URL', ''),
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
@@ -147,3 +169,24 @@ CACHES = {
     }
 
 }
+
+CACHE_ASIDE_CODEC = os.environ.get('CACHE_ASIDE_CODEC', 'orjson')
+
+CACHE_ASIDE_L1 = {
+    "ENABLED": os.environ.get('CACHE_ASIDE_L1_ENABLED', 'False').lower() == 'true',
+    "MAX_ENTRIES": int(os.environ.get('CACHE_ASIDE_L1_MAX_ENTRIES', 1024)),
+    "TTL": int(os.environ.get('CACHE_ASIDE_L1_TTL_SECONDS', 30)),
+    "CHANNEL": "cache-aside:invalidate",
+}
+
+# 소셜 프로필 이미지 백그라운드 수집
+AVATAR_INGESTION = {
+    "CONNECT_TIMEOUT": float(os.environ.get('AVATAR_CONNECT_TIMEOUT', 3)),
+    "READ_TIMEOUT": float(os.environ.get('AVATAR_READ_TIMEOUT', 5)),
+    "MAX_BYTES": int(os.environ.get('AVATAR_MAX_BYTES', 5 * 1024 * 1024)),
+    "RETRIES": int(os.environ.get('AVATAR_RETRIES', 3)),
+    "BACKOFF": float(os.environ.get('AVATAR_BACKOFF', 0.5)),
+}
+
+# 요청 밖에서 실행하는 작업(이미지 수집/썸네일 생성)의 프로세스별 스레드 수
+BACKGROUND_WORKERS = int(os.environ.get('BACKGROUND_WORKERS', 2))
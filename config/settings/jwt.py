@@ -4,7 +4,7 @@ from datetime import timedelta
 SECRET_KEY = os.environ.get('SECRET_KEY')
 
 SIMPLE_JWT = {
-    'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
+    'AUTH_TOKEN_CLASSES': ('authentication.utils.tokens.AccessToken',),
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.environ.get('JWT_ACCESS_TOKEN_LIFETIME_MINUTES', 5))),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=int(os.environ.get('JWT_REFRESH_TOKEN_LIFETIME_DAYS', 1))),
     'ROTATE_REFRESH_TOKENS': os.environ.get('JWT_ROTATE_REFRESH_TOKENS', 'True').lower() == 'true',
@@ -29,3 +29,53 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=int(os.environ.get('JWT_SLIDING_TOKEN_LIFETIME_MINUTES', 5))),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=int(os.environ.get('JWT_SLIDING_TOKEN_REFRESH_LIFETIME_DAYS', 1))),
 }
+
+# 리프레시 토큰 회전 (utils.token_store.RefreshTokenStore)
+# - REUSE_GRACE_SECONDS: 회전 후 이 시간 안에 이전 토큰이 다시 오면 (여러 탭의 동시 갱신) 재사용으로 보지 않고
+#   패밀리를 유지한 채 409 로 거절한다. 클라이언트는 새 쿠키로 다시 요청하면 된다.
+REFRESH_TOKEN_ROTATION = {
+    'REUSE_GRACE_SECONDS': int(os.environ.get('JWT_REFRESH_REUSE_GRACE_SECONDS', 5)),
+}
+
+# utils.jwt_decoder.JWTVerifier: 검증한 토큰을 exp 까지 보관하는 LRU 크기 (0 이면 보관하지 않음)
+JWT_VERIFIER_CACHE = {
+    'MAX_ENTRIES': int(os.environ.get('JWT_VERIFIER_CACHE_MAX_ENTRIES', 10000)),
+}
+
+# 비대칭 서명 키(RS256/EdDSA) keyring. FILE 이 없으면 SIMPLE_JWT 의 SIGNING_KEY(HS256)로 서명한다.
+# - RELOAD_INTERVAL: keyring 파일 변경(mtime)을 확인하는 주기(초)
+# - PUBLISH_AHEAD: rotate_jwt_keys 로 만든 새 키를 서명에 쓰기 전 JWKS 에 미리 공개하는 시간
+#   (다운스트림의 JWKS 캐시 시간보다 길어야 한다)
+# - ACCEPT_UNKEYED: kid 가 없는(keyring 도입 전 SIGNING_KEY 로 서명된) 토큰도 검증한다.
+#   도입 후 REFRESH_TOKEN_LIFETIME 이 지나면 끈다.
+JWT_KEYRING = {
+    'FILE': os.environ.get('JWT_KEYRING_FILE'),
+    'RELOAD_INTERVAL': int(os.environ.get('JWT_KEYRING_RELOAD_INTERVAL_SECONDS', 60)),
+    'PUBLISH_AHEAD': timedelta(hours=int(os.environ.get('JWT_KEYRING_PUBLISH_AHEAD_HOURS', 24))),
+    'ACCEPT_UNKEYED': os.environ.get('JWT_KEYRING_ACCEPT_UNKEYED', 'True').lower() == 'true',
+    'JWKS_MAX_AGE': int(os.environ.get('JWT_JWKS_MAX_AGE_SECONDS', 3600)),
+}
+
+# 무효화된 토큰 패밀리/유저의 Bloom filter (utils.revocation_filter)
+# - BITS/HASHES: 버킷당 비트 수(8 의 배수)와 해시 수. 65536비트/5해시면 버킷당 약 4천 건까지 오탐률 1% 미만
+# - BUCKET_SECONDS: 항목이 필터에 남는 최소 시간. 액세스 토큰 수명보다 짧으면 안 된다.
+# - REFRESH_INTERVAL: 프로세스가 Redis 에서 필터 변경을 확인하는 주기(초)
+# - GATEWAY_TOKENS: /auth/v2/revocations/filter/ 를 받을 수 있는 게이트웨이의 X-Gateway-Token 값들 (쉼표 구분, 비면 거부)
+REVOCATION_FILTER = {
+    'BITS': int(os.environ.get('REVOCATION_FILTER_BITS', 65536)),
+    'HASHES': int(os.environ.get('REVOCATION_FILTER_HASHES', 5)),
+    'BUCKET_SECONDS': int(SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds()),
+    'REFRESH_INTERVAL': float(os.environ.get('REVOCATION_FILTER_REFRESH_SECONDS', 1)),
+    'GATEWAY_TOKENS': [token for token in os.environ.get('REVOCATION_FILTER_GATEWAY_TOKENS', '').split(',') if token],
+}
+
+# 만료된 token_blacklist 행/삭제된 유저의 리프레시 토큰 키 정리 (prune_token_state, 프로세스 내 스케줄러)
+# - CHUNK_SIZE/CHUNK_SLEEP: 한 번에 지울 행 수와 chunk 사이 대기(초)
+# - SCAN_COUNT: Redis SCAN 한 번에 확인할 키 수 (파이프라인 삭제 단위)
+# - SCHEDULE_INTERVAL: 프로세스 내 스케줄러 주기(초). 0 이면 끈다. (여러 워커 중 한 곳만 실행)
+TOKEN_PRUNING = {
+    'CHUNK_SIZE': int(os.environ.get('TOKEN_PRUNING_CHUNK_SIZE', 1000)),
+    'CHUNK_SLEEP': float(os.environ.get('TOKEN_PRUNING_CHUNK_SLEEP_SECONDS', 0.05)),
+    'SCAN_COUNT': int(os.environ.get('TOKEN_PRUNING_SCAN_COUNT', 500)),
+    'SCHEDULE_INTERVAL': int(os.environ.get('TOKEN_PRUNING_INTERVAL_SECONDS', 3600)),
+}
@@ -3,6 +3,13 @@ KAFKA_BOOTSTRAP_SERVERS = os.getenv(
     "KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
 KAFKA_DEFAULT_TOPIC = os.getenv("KAFKA_DEFAULT_TOPIC", "user-profile")
 
+# 이벤트 payload 인코딩 (msgpack: 스키마 ID + 필드 순서 배열 / json)
+KAFKA_EVENT_CODEC = os.getenv("KAFKA_EVENT_CODEC", "msgpack")
+
+# 같은 유저의 연속된 프로필 수정을 하나의 변경 이벤트로 합치는 시간(초)
+PROFILE_EVENT_DEBOUNCE_SECONDS = float(
+    os.getenv("PROFILE_EVENT_DEBOUNCE_SECONDS", "5"))
+
 KAFKA_PRODUCER_CONFIG = {
     "linger.ms": 10,
     "batch.size": 131072,
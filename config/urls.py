@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from authentication.views import JWKSView, MediaView
 
 
 urlpatterns = [
@@ -9,11 +10,12 @@ urlpatterns = [
     path('auth/v2/', include('authentication.urls')),
     path('auth/accounts/', include('allauth.urls')),
     path('auth/prometheus/', include('django_prometheus.urls')),
+    path(f"{settings.MEDIA_URL.lstrip('/')}<path:path>", MediaView.as_view(), name='media'),
+    path('.well-known/jwks.json', JWKSView.as_view(), name='jwks'),
+    path('auth/.well-known/jwks.json', JWKSView.as_view()),
 
 ]
 
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL,
                           document_root=settings.STATIC_ROOT)
-    urlpatterns += static(settings.MEDIA_URL,
-                          document_root=settings.MEDIA_ROOT)